@@ -1,19 +1,190 @@
+import json
 import requests
-from config.config import TABLE_NAME, SERVER_URL
+import threading
+import time
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config.config import (
+    TABLE_NAME, SERVER_URL, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_RETRIES, HTTP_BACKOFF_FACTOR,
+    HTTP_BACKOFF_JITTER, HTTP_GZIP
+)
+
+# Transient proxy/server states worth retrying; 500 usually isn't
+RETRY_STATUSES = (502, 503, 504)
+# POST creates rows, so it is never retried
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def retry_policy(retries=HTTP_RETRIES):
+    """Retry connection errors and RETRY_STATUSES on idempotent methods with jittered backoff."""
+    options = dict(
+        total=retries,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=IDEMPOTENT_METHODS,
+        # Hand the last response back so raise_for_status reports it
+        raise_on_status=False
+    )
+    try:
+        return Retry(backoff_jitter=HTTP_BACKOFF_JITTER, **options)
+    except TypeError:
+        # urllib3 < 2 has no jitter
+        return Retry(**options)
+
+
+def build_session():
+    """A keep-alive session with a bounded connection pool and the retry policy."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry_policy()
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not HTTP_GZIP:
+        # Loopback is faster uncompressed
+        session.headers["Accept-Encoding"] = "identity"
+    return session
+
 
 class APIClient:
     BASE_URL = SERVER_URL
+    # (connect, read) seconds; pass timeout= to override per call
+    TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+    # Shared by every call (GUI worker threads included) so connections are reused
+    _session = None
+    _session_lock = threading.Lock()
+
+    # Raw image bytes keyed by URL -> (etag, bytes), revalidated with If-None-Match
+    IMAGE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    # get_image runs on the GUI's worker pool, so the cache and its byte
+    # count are only touched under _image_cache_lock
+    _image_cache = OrderedDict()
+    _image_cache_bytes = 0
+    _image_cache_lock = threading.Lock()
+
+    # JSON list bodies keyed by (url, params) -> (etag, body bytes, next cursor),
+    # revalidated with If-None-Match so an unchanged list costs a 304
+    LIST_CACHE_MAX_ENTRIES = 64
+    _list_cache = OrderedDict()
+    _list_cache_lock = threading.Lock()
+
+    @staticmethod
+    def session():
+        if APIClient._session is None:
+            with APIClient._session_lock:
+                if APIClient._session is None:
+                    APIClient._session = build_session()
+        return APIClient._session
+
+    @staticmethod
+    def close_session():
+        with APIClient._session_lock:
+            if APIClient._session is not None:
+                APIClient._session.close()
+                APIClient._session = None
+
+    @staticmethod
+    def _send(method, url, **kwargs):
+        kwargs.setdefault("timeout", APIClient.TIMEOUT)
+        return getattr(APIClient.session(), method)(url, **kwargs)
+
+    @staticmethod
+    def wait_until_ready(timeout=15.0, initial_delay=0.05, max_delay=0.5):
+        """
+        Poll /health/ready with exponential backoff until the server reports
+        ready (DB reachable, migrations applied). Returns True when ready,
+        False if `timeout` seconds pass first.
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+        while True:
+            try:
+                # Outside the session: this loop has its own backoff and must not stack retries on it
+                response = requests.get(f"{APIClient.BASE_URL}/health/ready", timeout=max_delay)
+                if response.status_code == 200:
+                    return True
+            except requests.exceptions.RequestException:
+                pass # Not listening yet
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+
+    @staticmethod
+    def _get_list(url, params=None):
+        """
+        GET a JSON list through the ETag cache.
+        Returns (data, next_cursor); raises RequestException like _send.
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        with APIClient._list_cache_lock:
+            cached = APIClient._list_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+
+        response = APIClient._send("get", url, params=params or None, headers=headers)
+        if response.status_code == 304 and cached:
+            with APIClient._list_cache_lock:
+                if key in APIClient._list_cache:
+                    APIClient._list_cache.move_to_end(key)
+            # Parse a fresh copy; callers are free to mutate what they get
+            return json.loads(cached[1]), cached[2]
+
+        response.raise_for_status()
+        next_cursor = response.headers.get("X-Next-Cursor")
+        etag = response.headers.get("ETag")
+        with APIClient._list_cache_lock:
+            APIClient._list_cache.pop(key, None)
+            if etag:
+                APIClient._list_cache[key] = (etag, response.content, next_cursor)
+                while len(APIClient._list_cache) > APIClient.LIST_CACHE_MAX_ENTRIES:
+                    APIClient._list_cache.popitem(last=False)
+        return response.json(), next_cursor
+
+    @staticmethod
+    def clear_list_cache():
+        """Forget cached lists, e.g. after writing to the database without the API."""
+        with APIClient._list_cache_lock:
+            APIClient._list_cache.clear()
 
     @staticmethod
     def get_all_transactions():
         try:
-            response = requests.get(f"{APIClient.BASE_URL}/transactions")
-            response.raise_for_status()
-            return response.json()
+            return APIClient._get_list(f"{APIClient.BASE_URL}/transactions")[0]
         except requests.exceptions.RequestException as e:
             print(f"API Error: {e}")
             return []
 
+    @staticmethod
+    def get_transactions_page(limit=100, after=None, q=None, t_type=None, supplier=None,
+                              date_from=None, date_to=None, sort=None):
+        """
+        Fetch one keyset page of transactions.
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        """
+        params = {
+            "limit": limit,
+            "after": after,
+            "q": q,
+            "type": t_type,
+            "supplier": supplier,
+            "date_from": date_from,
+            "date_to": date_to,
+            "sort": sort
+        }
+        params = {k: v for k, v in params.items() if v not in (None, "")}
+        try:
+            return APIClient._get_list(f"{APIClient.BASE_URL}/transactions", params)
+        except requests.exceptions.RequestException as e:
+            print(f"API Error: {e}")
+            return [], None
+
     @staticmethod
     def add_transaction(date, desc, qty, price, t_type, supplier=None, product_id=None):
         payload = {
@@ -26,13 +197,28 @@ class APIClient:
             "product_id": product_id
         }
         try:
-            response = requests.post(f"{APIClient.BASE_URL}/transactions", json=payload)
+            response = APIClient._send("post", f"{APIClient.BASE_URL}/transactions", json=payload)
             response.raise_for_status()
             return response.json().get("id")
         except requests.exceptions.RequestException as e:
             print(f"API Error: {e}")
             raise e
 
+    @staticmethod
+    def add_transactions_bulk(items):
+        """
+        Add many transactions in one request.
+        `items` are dicts with date, description, quantity, price, type and
+        optional supplier/product_id. Returns the number inserted.
+        """
+        try:
+            response = APIClient._send("post", f"{APIClient.BASE_URL}/transactions/bulk", json=list(items))
+            response.raise_for_status()
+            return response.json().get("count", 0)
+        except requests.exceptions.RequestException as e:
+            print(f"API Error: {e}")
+            raise e
+
     @staticmethod
     def update_transaction(t_id, date, desc, qty, price, t_type, supplier=None, product_id=None):
         payload = {
@@ -45,7 +231,7 @@ class APIClient:
             "product_id": product_id
         }
         try:
-            response = requests.put(f"{APIClient.BASE_URL}/transactions/{t_id}", json=payload)
+            response = APIClient._send("put", f"{APIClient.BASE_URL}/transactions/{t_id}", json=payload)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             print(f"API Error: {e}")
@@ -54,19 +240,57 @@ class APIClient:
     @staticmethod
     def delete_transaction(t_id):
         try:
-            response = requests.delete(f"{APIClient.BASE_URL}/transactions/{t_id}")
+            response = APIClient._send("delete", f"{APIClient.BASE_URL}/transactions/{t_id}")
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             print(f"API Error: {e}")
             raise e
 
-    # --- Product Methods ---
     @staticmethod
-    def get_products():
+    def get_summary(**filters):
+        """
+        Fetch SQL-aggregated totals. Accepts date_from, date_to, year, month, quarter.
+        """
+        params = {k: v for k, v in filters.items() if v is not None}
         try:
-            response = requests.get(f"{APIClient.BASE_URL}/products")
+            response = APIClient._send("get", f"{APIClient.BASE_URL}/summary", params=params)
             response.raise_for_status()
             return response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"API Error: {e}")
+            return {}
+
+    @staticmethod
+    def get_changes(since=None, tables=None):
+        """
+        Delta since a sync token (see GET /changes). Returns the response
+        dict, or None if the server can't be reached.
+        """
+        params = {}
+        if since:
+            params["since"] = since
+        if tables:
+            params["tables"] = tables if isinstance(tables, str) else ",".join(tables)
+        try:
+            response = APIClient._send("get", f"{APIClient.BASE_URL}/changes", params=params or None)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"API Error: {e}")
+            return None
+
+    # --- Product Methods ---
+    @staticmethod
+    def get_products(fields=None):
+        """
+        List products. Pass fields="summary" (or a list of column names) for a
+        lightweight listing without image data.
+        """
+        params = {}
+        if fields:
+            params["fields"] = fields if isinstance(fields, str) else ",".join(fields)
+        try:
+            return APIClient._get_list(f"{APIClient.BASE_URL}/products", params)[0]
         except requests.exceptions.RequestException as e:
             print(f"API Error: {e}")
             return []
@@ -74,7 +298,7 @@ class APIClient:
     @staticmethod
     def get_product(p_id):
         try:
-            response = requests.get(f"{APIClient.BASE_URL}/products/{p_id}")
+            response = APIClient._send("get", f"{APIClient.BASE_URL}/products/{p_id}")
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -96,7 +320,7 @@ class APIClient:
             product_data['image'] = base64.b64encode(product_data['image']).decode('utf-8')
             
         try:
-            response = requests.post(f"{APIClient.BASE_URL}/products", json=product_data)
+            response = APIClient._send("post", f"{APIClient.BASE_URL}/products", json=product_data)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -111,7 +335,7 @@ class APIClient:
             product_data['image'] = base64.b64encode(product_data['image']).decode('utf-8')
 
         try:
-            response = requests.put(f"{APIClient.BASE_URL}/products/{p_id}", json=product_data)
+            response = APIClient._send("put", f"{APIClient.BASE_URL}/products/{p_id}", json=product_data)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -121,7 +345,7 @@ class APIClient:
     @staticmethod
     def delete_product(p_id):
         try:
-            response = requests.delete(f"{APIClient.BASE_URL}/products/{p_id}")
+            response = APIClient._send("delete", f"{APIClient.BASE_URL}/products/{p_id}")
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             print(f"API Error: {e}")
@@ -131,9 +355,7 @@ class APIClient:
     @staticmethod
     def get_materials():
         try:
-            response = requests.get(f"{APIClient.BASE_URL}/materials")
-            response.raise_for_status()
-            return response.json()
+            return APIClient._get_list(f"{APIClient.BASE_URL}/materials")[0]
         except requests.exceptions.RequestException as e:
             print(f"API Error: {e}")
             return []
@@ -141,7 +363,7 @@ class APIClient:
     @staticmethod
     def add_material(data):
         try:
-            response = requests.post(f"{APIClient.BASE_URL}/materials", json=data)
+            response = APIClient._send("post", f"{APIClient.BASE_URL}/materials", json=data)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -151,7 +373,7 @@ class APIClient:
     @staticmethod
     def update_material(m_id, data):
         try:
-            response = requests.put(f"{APIClient.BASE_URL}/materials/{m_id}", json=data)
+            response = APIClient._send("put", f"{APIClient.BASE_URL}/materials/{m_id}", json=data)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             print(f"API Error: {e}")
@@ -160,18 +382,17 @@ class APIClient:
     @staticmethod
     def delete_material(m_id):
         try:
-            response = requests.delete(f"{APIClient.BASE_URL}/materials/{m_id}")
+            response = APIClient._send("delete", f"{APIClient.BASE_URL}/materials/{m_id}")
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             print(f"API Error: {e}")
             raise e
-            raise e
 
     # --- Image Methods ---
     @staticmethod
     def get_product_images(p_id):
         try:
-            response = requests.get(f"{APIClient.BASE_URL}/products/{p_id}/images")
+            response = APIClient._send("get", f"{APIClient.BASE_URL}/products/{p_id}/images")
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -193,17 +414,100 @@ class APIClient:
             "display_order": 0
         }
         try:
-            response = requests.post(f"{APIClient.BASE_URL}/products/{p_id}/images", json=payload)
+            response = APIClient._send("post", f"{APIClient.BASE_URL}/products/{p_id}/images", json=payload)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"API Error: {e}")
             raise e
 
+    @staticmethod
+    def list_product_images(p_id):
+        """Gallery metadata (id, display_order...) without image bytes."""
+        try:
+            response = APIClient._send("get", f"{APIClient.BASE_URL}/products/{p_id}/images", params={"include_data": "false"})
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"API Error: {e}")
+            return []
+
+    @staticmethod
+    def get_image(img_id, size=None):
+        """
+        Raw bytes of a gallery image (or a server-side thumbnail when size is
+        given), served from cache when the ETag still matches.
+        """
+        url = f"{APIClient.BASE_URL}/images/{img_id}"
+        if size:
+            url += f"?size={int(size)}"
+        return APIClient._get_image_bytes(url)
+
+    @staticmethod
+    def get_product_main_image(p_id, size=None):
+        """Raw bytes of a product's main image, or None if it has none."""
+        url = f"{APIClient.BASE_URL}/products/{p_id}/image"
+        if size:
+            url += f"?size={int(size)}"
+        return APIClient._get_image_bytes(url)
+
+    @staticmethod
+    def _get_image_bytes(url):
+        with APIClient._image_cache_lock:
+            cached = APIClient._image_cache.get(url)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        try:
+            response = APIClient._send("get", url, headers=headers)
+            if response.status_code == 304 and cached:
+                with APIClient._image_cache_lock:
+                    if url in APIClient._image_cache:
+                        APIClient._image_cache.move_to_end(url)
+                return cached[1]
+            if response.status_code == 404:
+                APIClient._evict_image(url)
+                return None
+            response.raise_for_status()
+            etag = response.headers.get("ETag")
+            if etag:
+                APIClient._store_image(url, etag, response.content)
+            return response.content
+        except requests.exceptions.RequestException as e:
+            print(f"API Error: {e}")
+            # Offline: a stale image beats no image
+            return cached[1] if cached else None
+
+    @staticmethod
+    def _store_image(url, etag, data):
+        with APIClient._image_cache_lock:
+            APIClient._drop_image(url)
+            if len(data) > APIClient.IMAGE_CACHE_MAX_BYTES:
+                return
+            APIClient._image_cache[url] = (etag, data)
+            APIClient._image_cache_bytes += len(data)
+            while APIClient._image_cache_bytes > APIClient.IMAGE_CACHE_MAX_BYTES:
+                _, (_, old) = APIClient._image_cache.popitem(last=False)
+                APIClient._image_cache_bytes -= len(old)
+
+    @staticmethod
+    def _evict_image(url):
+        with APIClient._image_cache_lock:
+            APIClient._drop_image(url)
+
+    @staticmethod
+    def _drop_image(url):
+        """Remove one cached image; the caller holds _image_cache_lock."""
+        entry = APIClient._image_cache.pop(url, None)
+        if entry:
+            APIClient._image_cache_bytes -= len(entry[1])
+
     @staticmethod
     def delete_product_image(img_id):
+        prefix = f"{APIClient.BASE_URL}/images/{img_id}"
+        with APIClient._image_cache_lock:
+            for url in [u for u in APIClient._image_cache if u == prefix or u.startswith(prefix + "?")]:
+                APIClient._drop_image(url)
         try:
-            response = requests.delete(f"{APIClient.BASE_URL}/products/images/{img_id}")
+            response = APIClient._send("delete", f"{APIClient.BASE_URL}/products/images/{img_id}")
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             print(f"API Error: {e}")
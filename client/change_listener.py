@@ -0,0 +1,100 @@
+"""
+Client side of /ws/changes.
+
+ChangeListener keeps a WebSocket to the server open on a daemon thread and
+queues the event batches it pushes; the GUI drains them from its own
+thread with drain(). After a reconnect a {"op": "resync"} event is queued,
+since anything written while disconnected was not pushed.
+
+Needs the optional `websockets` package (its sync client). Without it
+available() is False and the GUI keeps relying on Refresh.
+"""
+
+import json
+import queue
+import threading
+
+from config.config import SERVER_URL
+
+try:
+    from websockets.sync.client import connect as ws_connect
+except ImportError:
+    ws_connect = None
+
+RECONNECT_MIN_S = 0.5
+RECONNECT_MAX_S = 10.0
+OPEN_TIMEOUT_S = 5.0
+RESYNC = {"op": "resync"}
+
+
+def changes_url(base_url=SERVER_URL):
+    """ws:// URL of the change feed for an http:// server URL."""
+    return "ws" + base_url[len("http"):] + "/ws/changes"
+
+
+class ChangeListener:
+
+    def __init__(self, url=None, connect=None):
+        self.url = url or changes_url()
+        self._connect = connect or ws_connect
+        self._events = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self._conn = None
+
+    @staticmethod
+    def available():
+        return ws_connect is not None
+
+    @property
+    def connected(self):
+        return self._conn is not None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="change-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        conn = self._conn
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def drain(self):
+        """Every event received since the last call, oldest first. Never blocks."""
+        events = []
+        while True:
+            try:
+                events.extend(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    # --- Listener thread ---
+
+    def _run(self):
+        delay = RECONNECT_MIN_S
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                with self._connect(self.url, open_timeout=OPEN_TIMEOUT_S) as conn:
+                    self._conn = conn
+                    delay = RECONNECT_MIN_S
+                    if connected_before:
+                        self._events.put([RESYNC])
+                    connected_before = True
+                    for message in conn:
+                        self._events.put(json.loads(message))
+            except Exception as e:
+                if not self._stop.is_set() and connected_before and self._conn is not None:
+                    print(f"Change feed disconnected: {e}")
+            finally:
+                self._conn = None
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, RECONNECT_MAX_S)
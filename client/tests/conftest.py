@@ -0,0 +1,11 @@
+import pytest
+
+from client.api_client import APIClient
+
+
+@pytest.fixture(autouse=True)
+def empty_list_cache():
+    """Cached list bodies would leak between tests that mock the session."""
+    APIClient.clear_list_cache()
+    yield
+    APIClient.clear_list_cache()
@@ -1,3 +1,4 @@
+import threading
 import pytest
 import requests
 from unittest.mock import MagicMock, patch
@@ -12,8 +13,107 @@ class TestAPIClientExtended:
     # APIClient is static, no instance needed.
     # We will patch requests.
     
-    # --- get_products (5 Tests) ---
+    @patch("client.api_client.time.sleep")
+    @patch("requests.get")
+    def test_wait_until_ready_backs_off_until_200(self, mock_get, mock_sleep):
+        not_ready = MagicMock(status_code=503)
+        ready = MagicMock(status_code=200)
+        mock_get.side_effect = [requests.exceptions.ConnectionError("refused"), not_ready, ready]
+
+        assert APIClient.wait_until_ready(timeout=5, initial_delay=0.05, max_delay=0.5) is True
+        assert mock_get.call_args[0][0].endswith("/health/ready")
+        # Delays double between attempts
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [0.05, 0.1]
+
     @patch("requests.get")
+    def test_wait_until_ready_times_out(self, mock_get):
+        mock_get.side_effect = requests.exceptions.ConnectionError("refused")
+        assert APIClient.wait_until_ready(timeout=0.05, initial_delay=0.01, max_delay=0.02) is False
+
+    @patch("requests.Session.get")
+    def test_get_summary_passes_filters(self, mock_get):
+        """Summary filters are sent as query params, None values dropped"""
+        mock_get.return_value.json.return_value = {"total_income": 5}
+        result = APIClient.get_summary(year=2025, month=None, quarter=1)
+        assert result["total_income"] == 5
+        assert mock_get.call_args.kwargs["params"] == {"year": 2025, "quarter": 1}
+
+    @patch("requests.Session.get")
+    def test_get_transactions_page(self, mock_get):
+        """Page helper returns rows plus the next cursor header"""
+        mock_get.return_value.json.return_value = [{"id": 3}]
+        mock_get.return_value.headers = {"X-Next-Cursor": "2025-01-01:3"}
+        rows, cursor = APIClient.get_transactions_page(limit=1, t_type="income", q="")
+        assert rows == [{"id": 3}]
+        assert cursor == "2025-01-01:3"
+        assert mock_get.call_args.kwargs["params"] == {"limit": 1, "type": "income"}
+
+    @patch("requests.Session.get")
+    def test_get_transactions_page_error(self, mock_get):
+        mock_get.side_effect = requests.exceptions.ConnectionError("Refused")
+        assert APIClient.get_transactions_page() == ([], None)
+
+    @patch("requests.Session.get")
+    def test_get_image_uses_etag_cache(self, mock_get):
+        """Second fetch revalidates with If-None-Match and reuses cached bytes on 304"""
+        APIClient._image_cache.clear()
+        APIClient._image_cache_bytes = 0
+        first = MagicMock(status_code=200, content=b"imgbytes", headers={"ETag": '"abc"'})
+        second = MagicMock(status_code=304, content=b"", headers={"ETag": '"abc"'})
+        mock_get.side_effect = [first, second]
+
+        assert APIClient.get_image(7) == b"imgbytes"
+        assert APIClient.get_image(7) == b"imgbytes"
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+    @patch("requests.Session.get")
+    def test_get_image_thumbnail_size(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=200, content=b"t", headers={})
+        APIClient.get_image(7, size=100)
+        assert mock_get.call_args[0][0].endswith("/images/7?size=100")
+
+    @patch("requests.Session.get")
+    def test_get_image_not_found(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=404)
+        assert APIClient.get_product_main_image(99) is None
+
+    def test_image_cache_is_bounded(self):
+        APIClient._image_cache.clear()
+        APIClient._image_cache_bytes = 0
+        with patch.object(APIClient, "IMAGE_CACHE_MAX_BYTES", 10):
+            APIClient._store_image("a", '"1"', b"123456")
+            APIClient._store_image("b", '"2"', b"123456")
+        assert list(APIClient._image_cache) == ["b"]
+        assert APIClient._image_cache_bytes == 6
+        APIClient._image_cache.clear()
+        APIClient._image_cache_bytes = 0
+
+    def test_image_cache_byte_count_survives_concurrent_writers(self):
+        """Worker threads storing and evicting at once keep the byte count exact"""
+        APIClient._image_cache.clear()
+        APIClient._image_cache_bytes = 0
+
+        def churn(n):
+            for i in range(300):
+                url = f"img-{(n + i) % 20}"
+                APIClient._store_image(url, '"e"', b"x" * (i % 7 + 1))
+                if i % 3 == 0:
+                    APIClient._evict_image(url)
+
+        with patch.object(APIClient, "IMAGE_CACHE_MAX_BYTES", 40):
+            threads = [threading.Thread(target=churn, args=(n,)) for n in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert APIClient._image_cache_bytes == sum(len(d) for _, d in APIClient._image_cache.values())
+        assert APIClient._image_cache_bytes <= 40
+        APIClient._image_cache.clear()
+        APIClient._image_cache_bytes = 0
+
+    # --- get_products (5 Tests) ---
+    @patch("requests.Session.get")
     def test_get_products_success(self, mock_get):
         """1. Test successful product list retrieval (200 OK)"""
         mock_get.return_value.status_code = 200
@@ -22,7 +122,14 @@ class TestAPIClientExtended:
         assert len(results) == 1
         assert results[0]["title"] == "Candle"
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
+    def test_get_products_with_fields(self, mock_get):
+        """Field projections are sent as a comma-separated query param"""
+        mock_get.return_value.json.return_value = []
+        APIClient.get_products(fields=["id", "title"])
+        assert mock_get.call_args.kwargs["params"] == {"fields": "id,title"}
+
+    @patch("requests.Session.get")
     def test_get_products_empty(self, mock_get):
         """2. Test empty product list (200 OK)"""
         mock_get.return_value.status_code = 200
@@ -30,21 +137,21 @@ class TestAPIClientExtended:
         results = APIClient.get_products()
         assert results == []
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_products_connection_error(self, mock_get):
         """3. Test connection error handling"""
         mock_get.side_effect = requests.exceptions.ConnectionError("Refused")
         results = APIClient.get_products()
         assert results == []
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_products_timeout(self, mock_get):
         """4. Test timeout handling"""
         mock_get.side_effect = requests.exceptions.Timeout("Timed out")
         results = APIClient.get_products()
         assert results == []
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_products_server_error(self, mock_get):
         """5. Test 500 Server Error"""
         mock_get.return_value.status_code = 500
@@ -53,7 +160,7 @@ class TestAPIClientExtended:
         assert results == []
 
     # --- get_product (5 Tests) ---
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_product_success(self, mock_get):
         """6. Test single product retrieval"""
         mock_get.return_value.status_code = 200
@@ -61,7 +168,7 @@ class TestAPIClientExtended:
         result = APIClient.get_product(1)
         assert result["id"] == 1
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_product_404(self, mock_get):
         """7. Test product not found"""
         mock_get.return_value.status_code = 404
@@ -69,7 +176,7 @@ class TestAPIClientExtended:
         result = APIClient.get_product(999)
         assert result is None
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_product_invalid_id(self, mock_get):
         """8. Test handling of invalid ID type (400 Bad Request)"""
         mock_get.return_value.status_code = 400
@@ -77,7 +184,7 @@ class TestAPIClientExtended:
         result = APIClient.get_product("invalid")
         assert result is None
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_product_malformed_json(self, mock_get):
         """9. Test non-JSON response from server"""
         mock_get.return_value.status_code = 200
@@ -87,15 +194,24 @@ class TestAPIClientExtended:
         except ValueError:
              pass 
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_product_network_fail(self, mock_get):
         """10. Test network failure on single fetch"""
         mock_get.side_effect = requests.exceptions.RequestException
         result = APIClient.get_product(1)
         assert result is None
 
+    @patch("requests.Session.post")
+    def test_add_transactions_bulk(self, mock_post):
+        mock_post.return_value.json.return_value = {"count": 2}
+        items = [{"date": "2025-01-01", "description": "A", "quantity": 1, "price": 1.0, "type": "income"}] * 2
+        assert APIClient.add_transactions_bulk(items) == 2
+        args, kwargs = mock_post.call_args
+        assert args[0].endswith("/transactions/bulk")
+        assert kwargs["json"] == items
+
     # --- add_product (10 Tests) ---
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_add_product_success(self, mock_post):
         """11. Test adding valid product"""
         mock_post.return_value.status_code = 201
@@ -103,7 +219,7 @@ class TestAPIClientExtended:
         result = APIClient.add_product(NEW_PRODUCT)
         assert result["id"] == 2
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_add_product_validation_error(self, mock_post):
         """12. Test server validation error (400)"""
         mock_post.return_value.status_code = 400
@@ -111,7 +227,7 @@ class TestAPIClientExtended:
         with pytest.raises(requests.exceptions.RequestException):
             APIClient.add_product({})
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_add_product_conflict(self, mock_post):
         """13. Test duplicate product"""
         mock_post.return_value.status_code = 409 
@@ -119,7 +235,7 @@ class TestAPIClientExtended:
         with pytest.raises(requests.exceptions.RequestException):
             APIClient.add_product(NEW_PRODUCT)
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_add_product_large_payload(self, mock_post):
         """14. Test large description payload"""
         large_prod = NEW_PRODUCT.copy()
@@ -129,7 +245,7 @@ class TestAPIClientExtended:
         result = APIClient.add_product(large_prod)
         assert len(result["desc"]) == 10000
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_add_product_unicode(self, mock_post):
         """15. Test unicode characters"""
         uni_prod = {"title": "Candelā 🕯️", "price": 5}
@@ -138,14 +254,14 @@ class TestAPIClientExtended:
         result = APIClient.add_product(uni_prod)
         assert result["title"] == "Candelā 🕯️"
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_add_product_timeout(self, mock_post):
         """16. Test timeout on add"""
         mock_post.side_effect = requests.exceptions.Timeout
         with pytest.raises(requests.exceptions.Timeout):
             APIClient.add_product(NEW_PRODUCT)
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_add_product_image_handling(self, mock_post):
         """17. Test that image data is passed if present"""
         prod_with_img = {"title": "Img", "image": "base64..."}
@@ -154,7 +270,7 @@ class TestAPIClientExtended:
         result = APIClient.add_product(prod_with_img)
         assert result["image"] == "base64..."
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_add_product_null_values(self, mock_post):
         """18. Test null values in optional fields"""
         prod_null = {"title": "Nulls", "desc": None, "price": 10}
@@ -163,7 +279,7 @@ class TestAPIClientExtended:
         result = APIClient.add_product(prod_null)
         assert result["desc"] is None
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_add_product_extra_fields(self, mock_post):
         """19. Test sending extra unknown fields"""
         prod_extra = {"title": "X", "extra": "field"}
@@ -172,7 +288,7 @@ class TestAPIClientExtended:
         result = APIClient.add_product(prod_extra)
         assert result["extra"] == "field"
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_add_product_zero_price(self, mock_post):
         """20. Test zero price product"""
         prod_zero = {"title": "Free", "price": 0.0}
@@ -182,7 +298,7 @@ class TestAPIClientExtended:
         assert result["price"] == 0.0
 
     # --- update_product (5 Tests) ---
-    @patch("requests.put")
+    @patch("requests.Session.put")
     def test_update_product_success(self, mock_put):
         """21. Test successful update"""
         mock_put.return_value.status_code = 200
@@ -190,7 +306,7 @@ class TestAPIClientExtended:
         result = APIClient.update_product(1, VALID_PRODUCT)
         assert result["id"] == 1
 
-    @patch("requests.put")
+    @patch("requests.Session.put")
     def test_update_product_404(self, mock_put):
         """22. Test updating non-existent product"""
         mock_put.return_value.status_code = 404
@@ -198,14 +314,14 @@ class TestAPIClientExtended:
         with pytest.raises(requests.exceptions.RequestException):
              APIClient.update_product(999, VALID_PRODUCT)
 
-    @patch("requests.put")
+    @patch("requests.Session.put")
     def test_update_product_network_error(self, mock_put):
         """23. Test network error on update"""
         mock_put.side_effect = requests.exceptions.ConnectionError
         with pytest.raises(requests.exceptions.ConnectionError):
              APIClient.update_product(1, VALID_PRODUCT)
 
-    @patch("requests.put")
+    @patch("requests.Session.put")
     def test_update_product_validation_error(self, mock_put):
         """24. Test invalid data on update"""
         mock_put.return_value.status_code = 400
@@ -213,7 +329,7 @@ class TestAPIClientExtended:
         with pytest.raises(requests.exceptions.RequestException):
              APIClient.update_product(1, {"price": "invalid"})
 
-    @patch("requests.put")
+    @patch("requests.Session.put")
     def test_update_product_partial(self, mock_put):
         """25. Test partial update payload"""
         partial = {"price": 20.0}
@@ -223,13 +339,13 @@ class TestAPIClientExtended:
         assert result["price"] == 20.0
 
     # --- delete_product (5 Tests) ---
-    @patch("requests.delete")
+    @patch("requests.Session.delete")
     def test_delete_product_success(self, mock_delete):
         """26. Test successful delete"""
         mock_delete.return_value.status_code = 204 # No Content
         APIClient.delete_product(1)
 
-    @patch("requests.delete")
+    @patch("requests.Session.delete")
     def test_delete_product_404(self, mock_delete):
         """27. Test delete non-existent"""
         mock_delete.return_value.status_code = 404
@@ -237,7 +353,7 @@ class TestAPIClientExtended:
         with pytest.raises(requests.exceptions.RequestException):
              APIClient.delete_product(999)
 
-    @patch("requests.delete")
+    @patch("requests.Session.delete")
     def test_delete_product_error(self, mock_delete):
         """28. Test delete server error"""
         mock_delete.return_value.status_code = 500
@@ -246,7 +362,7 @@ class TestAPIClientExtended:
              APIClient.delete_product(1)
 
     # --- Special Cases (2 Tests) ---
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_api_base_url_slash(self, mock_get):
         """29. Test URL construction (Logic check if we can override BASE_URL)"""
         original = APIClient.BASE_URL
@@ -265,3 +381,55 @@ class TestAPIClientExtended:
         """30. Test client init replacement (Static class structure)"""
         assert hasattr(APIClient, 'get_products')
         assert APIClient.BASE_URL is not None
+
+
+class TestListCache:
+
+    @patch("requests.Session.get")
+    def test_304_reuses_cached_body(self, mock_get):
+        first = MagicMock(status_code=200, content=b'[{"id": 1}]', headers={"ETag": '"v1"'})
+        first.json.return_value = [{"id": 1}]
+        not_modified = MagicMock(status_code=304, content=b"", headers={"ETag": '"v1"'})
+        mock_get.side_effect = [first, not_modified]
+
+        assert APIClient.get_materials() == [{"id": 1}]
+        again = APIClient.get_materials()
+
+        assert again == [{"id": 1}]
+        assert mock_get.call_args_list[0].kwargs["headers"] == {}
+        assert mock_get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    @patch("requests.Session.get")
+    def test_cached_body_is_a_fresh_copy(self, mock_get):
+        first = MagicMock(status_code=200, content=b'[{"id": 1}]', headers={"ETag": '"v1"'})
+        first.json.return_value = [{"id": 1}]
+        not_modified = MagicMock(status_code=304, content=b"", headers={})
+        mock_get.side_effect = [first, not_modified, not_modified]
+
+        APIClient.get_products()
+        APIClient.get_products()[0]["id"] = 99
+        assert APIClient.get_products() == [{"id": 1}]
+
+    @patch("requests.Session.get")
+    def test_cache_keyed_by_params(self, mock_get):
+        summary = MagicMock(status_code=200, content=b'[]', headers={"ETag": '"s"'})
+        summary.json.return_value = []
+        full = MagicMock(status_code=200, content=b'[]', headers={"ETag": '"f"'})
+        full.json.return_value = []
+        mock_get.side_effect = [summary, full]
+
+        APIClient.get_products(fields="summary")
+        APIClient.get_products()
+
+        # The unfiltered list never sends the summary's tag
+        assert mock_get.call_args_list[1].kwargs["headers"] == {}
+
+    @patch("requests.Session.get")
+    def test_page_cursor_survives_304(self, mock_get):
+        first = MagicMock(status_code=200, content=b'[{"id": 3}]', headers={"ETag": '"p"', "X-Next-Cursor": "c1"})
+        first.json.return_value = [{"id": 3}]
+        not_modified = MagicMock(status_code=304, content=b"", headers={"ETag": '"p"'})
+        mock_get.side_effect = [first, not_modified]
+
+        APIClient.get_transactions_page(limit=1)
+        assert APIClient.get_transactions_page(limit=1) == ([{"id": 3}], "c1")
@@ -0,0 +1,62 @@
+import json
+import threading
+
+from client.change_listener import ChangeListener, changes_url, RESYNC
+
+
+class FakeConnection:
+    def __init__(self, messages):
+        self.messages = messages
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def close(self):
+        pass
+
+
+def test_changes_url_follows_server_url():
+    assert changes_url("http://127.0.0.1:8000") == "ws://127.0.0.1:8000/ws/changes"
+    assert changes_url("https://example.com") == "wss://example.com/ws/changes"
+
+
+def test_queues_events_and_resyncs_after_reconnect(monkeypatch):
+    monkeypatch.setattr("client.change_listener.RECONNECT_MIN_S", 0.01)
+    done = threading.Event()
+    sessions = [
+        [json.dumps([{"table": "transactions", "id": 1, "op": "insert"}])],
+        [json.dumps([{"table": "products", "id": 2, "op": "update"}])],
+    ]
+    urls = []
+
+    def connect(url, open_timeout):
+        urls.append(url)
+        if not sessions:
+            done.set()
+            raise OSError("Connection refused")
+        return FakeConnection(sessions.pop(0))
+
+    listener = ChangeListener("ws://test/ws/changes", connect=connect)
+    listener.start()
+    assert done.wait(2)
+    listener.stop()
+
+    assert listener.drain() == [
+        {"table": "transactions", "id": 1, "op": "insert"},
+        RESYNC,
+        {"table": "products", "id": 2, "op": "update"},
+    ]
+    assert listener.drain() == []
+    assert set(urls) == {"ws://test/ws/changes"}
+    assert not listener.connected
+
+
+def test_unavailable_without_websockets(monkeypatch):
+    monkeypatch.setattr("client.change_listener.ws_connect", None)
+    assert not ChangeListener.available()
@@ -0,0 +1,89 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+
+import client.api_client as api_client
+from client.api_client import APIClient
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 503 until `failures` requests have been seen, then 200."""
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        server = self.server
+        server.hits.append((self.command, self.client_address[1]))
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        status = 503 if len(server.hits) <= server.failures else 200
+        body = b'[]' if status == 200 else b'{"detail": "busy"}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    httpd.hits = []
+    httpd.failures = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(APIClient, "BASE_URL", f"http://127.0.0.1:{httpd.server_address[1]}")
+    # No real backoff sleeps in tests
+    monkeypatch.setattr(api_client, "HTTP_BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(api_client, "HTTP_BACKOFF_JITTER", 0)
+    APIClient.close_session()
+    yield httpd
+    APIClient.close_session()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_calls_reuse_one_connection(server):
+    for _ in range(3):
+        assert APIClient.get_materials() == []
+
+    ports = {port for _, port in server.hits}
+    assert len(server.hits) == 3
+    assert len(ports) == 1
+
+
+def test_idempotent_requests_retry_transient_errors(server):
+    server.failures = 2
+    assert APIClient.get_products() == []
+    assert [method for method, _ in server.hits] == ["GET", "GET", "GET"]
+
+
+def test_post_is_not_retried(server):
+    server.failures = 1
+    with pytest.raises(requests.exceptions.HTTPError):
+        APIClient.add_material({"name": "Soy Wax"})
+    assert [method for method, _ in server.hits] == ["POST"]
+
+
+def test_default_timeout_applied():
+    with patch("requests.Session.get") as mock_get:
+        mock_get.return_value.json.return_value = []
+        APIClient.get_materials()
+    assert mock_get.call_args.kwargs["timeout"] == APIClient.TIMEOUT
+
+
+def test_session_is_shared_and_recreated_after_close():
+    APIClient.close_session()
+    first = APIClient.session()
+    assert APIClient.session() is first
+    APIClient.close_session()
+    assert APIClient.session() is not first
+    APIClient.close_session()
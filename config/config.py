@@ -111,11 +111,17 @@ defaults = {
             "transaction_type": "VARCHAR(50)",
             "total": "DECIMAL(10, 2)",
             "supplier": "VARCHAR(255)",
-            "product_id": "INT DEFAULT NULL"
+            "product_id": "INT DEFAULT NULL",
+            "updated_at": "TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)", # Delta sync (GET /changes)
+            # Secondary indexes: "INDEX <name>" -> key parts
+            "INDEX idx_transaction_date": "(transaction_date, id)", # Date filters + keyset paging
+            "INDEX idx_product_id": "(product_id)",
+            "INDEX idx_updated_at": "(updated_at)"
         },
         "products_schema": {
             "id": "INT AUTO_INCREMENT PRIMARY KEY",
             "title": "VARCHAR(255) NOT NULL",
+            "title_normalized": "VARCHAR(255) GENERATED ALWAYS AS (LOWER(TRIM(title))) STORED", # Indexed duplicate-check key
             "sku": "VARCHAR(50)",
             "upc": "VARCHAR(50)",
             "description": "TEXT",
@@ -147,7 +153,11 @@ defaults = {
             "amazon_data": "JSON", 
             "etsy_data": "JSON", 
             "common_data": "JSON",
-            "image": "LONGBLOB" # Legacy single image, keeping for compatibility
+            "image": "LONGBLOB", # Legacy single image, keeping for compatibility
+            "updated_at": "TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)", # Delta sync (GET /changes)
+            "INDEX idx_sku": "(sku)",
+            "INDEX idx_title_normalized": "(title_normalized)", # LOWER(TRIM(title)) lookups
+            "INDEX idx_updated_at": "(updated_at)"
         },
         "product_images_schema": {
             "id": "INT AUTO_INCREMENT PRIMARY KEY",
@@ -155,7 +165,8 @@ defaults = {
             "image_data": "LONGBLOB",
             "image_url": "TEXT",
             "display_order": "INT DEFAULT 0",
-            "FOREIGN KEY (product_id)": "REFERENCES products(id) ON DELETE CASCADE"
+            "FOREIGN KEY (product_id)": "REFERENCES products(id) ON DELETE CASCADE",
+            "INDEX idx_product_order": "(product_id, display_order)"
         },
         "materials_table": "materials",
         "materials_test_table": "materials_test",
@@ -165,7 +176,20 @@ defaults = {
             "category": "VARCHAR(50)",
             "stock_quantity": "DECIMAL(10, 2) DEFAULT 0.00",
             "unit_cost": "DECIMAL(10, 4)",
-            "unit_type": "VARCHAR(20)"
+            "unit_type": "VARCHAR(20)",
+            "updated_at": "TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)", # Delta sync (GET /changes)
+            "INDEX idx_name": "(name)", # deduct_stock_by_name / BOM joins
+            "INDEX idx_updated_at": "(updated_at)"
+        },
+        # Ids of deleted rows, so GET /changes can report deletes
+        "tombstones_table": "change_tombstones",
+        "tombstones_schema": {
+            "id": "BIGINT AUTO_INCREMENT PRIMARY KEY",
+            "table_name": "VARCHAR(64) NOT NULL",
+            "row_id": "INT NOT NULL",
+            "deleted_at": "TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6)",
+            "INDEX idx_table_deleted": "(table_name, deleted_at)",
+            "INDEX idx_deleted_at": "(deleted_at)" # Retention pruning
         },
         "default_labor_rate": 17.60
     },
@@ -232,6 +256,10 @@ if "FOREIGN KEY (product_id)" in PRODUCT_IMAGES_SCHEMA:
 MATERIALS_SCHEMA = config_data["data"].get("materials_schema", {})
 MATERIALS_TABLE = MATERIALS_TABLE_NAME
 
+# Delta sync tombstones (deleted row ids); retention is under "database" below
+TOMBSTONES_TABLE = config_data["data"].get("tombstones_table", "change_tombstones")
+TOMBSTONES_SCHEMA = config_data["data"].get("tombstones_schema", {})
+
 if is_frozen:
     PRODUCT_IMAGES_TABLE = "product_images"
 else:
@@ -255,6 +283,13 @@ FEATURES = features_config
 SERVER_HOST = config_data.get("app", {}).get("server", {}).get("host", "127.0.0.1")
 SERVER_PORT = config_data.get("app", {}).get("server", {}).get("port", 8000)
 SERVER_URL = f"http://{SERVER_HOST}:{SERVER_PORT}"
+# How long the launcher waits for /health/ready before starting the GUI anyway
+SERVER_READY_TIMEOUT = float(config_data.get("app", {}).get("server", {}).get("ready_timeout", 15.0))
+# "subprocess" runs the API as a second process; "embedded" runs it on a thread of the GUI process
+SERVER_MODE = config_data.get("app", {}).get("server", {}).get("mode", "subprocess")
+# "async" serves the hot read routes with async handlers on an async DB pool;
+# the environment variable wins so benchmarks can compare both
+SERVER_DB_ACCESS = os.getenv("SERVER_DB_ACCESS") or config_data.get("app", {}).get("server", {}).get("db_access", "sync")
 
 FEATURES = features_config
 
@@ -264,3 +299,34 @@ DEFAULT_LABOR_RATE = float(os.getenv("DEFAULT_LABOR_RATE", 17.60))
 # Manufacturing / BOM
 MANUFACTURING_CONFIG = config_data.get("manufacturing", {})
 BOM_LAYOUT = MANUFACTURING_CONFIG.get("bom_layout", [])
+
+# Database Connection Pool
+DB_POOL_CONFIG = config_data.get("database", {}).get("pool", {})
+DB_POOL_SIZE = int(DB_POOL_CONFIG.get("size", 5))
+DB_POOL_MAX_OVERFLOW = int(DB_POOL_CONFIG.get("max_overflow", 10))
+DB_POOL_TIMEOUT = float(DB_POOL_CONFIG.get("timeout", 30))
+DB_POOL_RECYCLE_SECONDS = int(DB_POOL_CONFIG.get("recycle_seconds", 1800))
+DB_POOL_PRE_PING = bool(DB_POOL_CONFIG.get("pre_ping", True))
+
+# Delta sync: deleted row ids are kept this long; older sync tokens force a full reload
+TOMBSTONE_RETENTION_DAYS = int(config_data.get("database", {}).get("tombstone_retention_days", 30))
+
+# HTTP client (APIClient): one pooled keep-alive session shared by all calls
+HTTP_CLIENT_CONFIG = config_data.get("app", {}).get("client", {})
+HTTP_POOL_CONNECTIONS = int(HTTP_CLIENT_CONFIG.get("pool_connections", 2))
+HTTP_POOL_MAXSIZE = int(HTTP_CLIENT_CONFIG.get("pool_maxsize", 10))
+HTTP_CONNECT_TIMEOUT = float(HTTP_CLIENT_CONFIG.get("connect_timeout", 3.05))
+HTTP_READ_TIMEOUT = float(HTTP_CLIENT_CONFIG.get("read_timeout", 30))
+# Retries apply to idempotent methods only (GET/PUT/DELETE), never POST
+HTTP_RETRIES = int(HTTP_CLIENT_CONFIG.get("retries", 3))
+HTTP_BACKOFF_FACTOR = float(HTTP_CLIENT_CONFIG.get("backoff_factor", 0.2))
+HTTP_BACKOFF_JITTER = float(HTTP_CLIENT_CONFIG.get("backoff_jitter", 0.1))
+# Compress responses (server) and accept compressed responses (client)
+HTTP_GZIP = bool(HTTP_CLIENT_CONFIG.get("gzip", False))
+HTTP_GZIP_MIN_SIZE = int(HTTP_CLIENT_CONFIG.get("gzip_min_size", 1024))
+
+# Image Thumbnails (server-side cache, relative paths resolve next to the app)
+IMAGES_CONFIG = config_data.get("images", {})
+_app_dir = Path(sys.executable).parent if is_frozen else Path(__file__).parent.parent
+THUMBNAIL_CACHE_DIR = str(_app_dir / IMAGES_CONFIG.get("thumbnail_cache_dir", "cache/thumbnails"))
+GALLERY_THUMBNAIL_SIZE = int(IMAGES_CONFIG.get("gallery_thumbnail_size", 100))
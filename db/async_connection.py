@@ -0,0 +1,208 @@
+"""
+Async counterpart of db_connection for the async API routes.
+
+Uses the asyncio driver bundled with mysql-connector-python
+(mysql.connector.aio, 9.0 and later). AsyncConnectionPool follows
+ConnectionPool: `size` warm connections plus `max_overflow` under bursts,
+checkouts that wait at most `timeout`, recycling and pre-ping, and a
+rollback of any open transaction on release. Waiting for a connection
+suspends the request instead of blocking a threadpool worker.
+
+asyncio objects belong to one event loop, so get_async_pool() keeps one
+pool per running loop.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from mysql.connector.errors import PoolError
+from config.config import (
+    mysql_config, DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE_SECONDS, DB_POOL_PRE_PING
+)
+
+try:
+    from mysql.connector import aio as mysql_aio
+except ImportError:
+    mysql_aio = None
+
+
+def async_db_available():
+    """True when the installed connector has the asyncio driver."""
+    return mysql_aio is not None
+
+
+class AsyncConnectionPool:
+    """Pool of mysql.connector.aio connections for one event loop."""
+
+    def __init__(self, size=DB_POOL_SIZE, max_overflow=DB_POOL_MAX_OVERFLOW,
+                 timeout=DB_POOL_TIMEOUT, recycle_seconds=DB_POOL_RECYCLE_SECONDS,
+                 pre_ping=DB_POOL_PRE_PING, connect=None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.max_overflow = max(0, max_overflow)
+        self.timeout = timeout
+        self.recycle_seconds = recycle_seconds
+        self.pre_ping = pre_ping
+        self._connect = connect or (lambda: mysql_aio.connect(**mysql_config))
+
+        self._cond = asyncio.Condition()
+        self._idle = []  # LIFO stack of (raw_connection, released_at)
+        self._checked_out = 0
+        self._counters = {
+            "created": 0,
+            "reused": 0,
+            "recycled": 0,
+            "discarded": 0,
+            "timeouts": 0,
+        }
+
+    def _can_check_out(self):
+        return self._idle or self._checked_out + len(self._idle) < self.size + self.max_overflow
+
+    async def acquire(self):
+        """
+        Check a raw connection out of the pool; hand it back with release().
+
+        Raises:
+            PoolError: if no connection becomes available within `timeout`.
+        """
+        async with self._cond:
+            try:
+                await asyncio.wait_for(self._cond.wait_for(self._can_check_out), self.timeout)
+            except asyncio.TimeoutError:
+                self._counters["timeouts"] += 1
+                raise PoolError(
+                    f"Connection pool exhausted (size={self.size}, "
+                    f"max_overflow={self.max_overflow})"
+                )
+            raw, released_at = self._idle.pop() if self._idle else (None, None)
+            self._checked_out += 1
+
+        try:
+            if raw is None:
+                return await self._open()
+            return await self._validate(raw, released_at)
+        except BaseException:
+            async with self._cond:
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+
+    async def _open(self):
+        raw = await self._connect()
+        self._counters["created"] += 1
+        return raw
+
+    async def _validate(self, raw, released_at):
+        if self.recycle_seconds and time.monotonic() - released_at > self.recycle_seconds:
+            await self._close_quietly(raw)
+            self._counters["recycled"] += 1
+            return await self._open()
+
+        if self.pre_ping and not await raw.is_connected():
+            await self._close_quietly(raw)
+            self._counters["discarded"] += 1
+            return await self._open()
+
+        self._counters["reused"] += 1
+        return raw
+
+    async def release(self, raw):
+        healthy = True
+        try:
+            # Same rule as the sync pool: no stale REPEATABLE READ snapshots
+            if raw.in_transaction:
+                await raw.rollback()
+        except Exception:
+            healthy = False
+
+        keep = False
+        async with self._cond:
+            self._checked_out -= 1
+            if healthy and len(self._idle) < self.size:
+                self._idle.append((raw, time.monotonic()))
+                keep = True
+            elif not healthy:
+                self._counters["discarded"] += 1
+            self._cond.notify()
+
+        if not keep:
+            await self._close_quietly(raw)
+
+    @asynccontextmanager
+    async def connection(self):
+        raw = await self.acquire()
+        try:
+            yield raw
+        finally:
+            await self.release(raw)
+
+    @staticmethod
+    async def _close_quietly(raw):
+        try:
+            await raw.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        """Return a snapshot of pool usage counters."""
+        return {
+            "size": self.size,
+            "max_overflow": self.max_overflow,
+            "checked_out": self._checked_out,
+            "idle": len(self._idle),
+            **self._counters,
+        }
+
+    async def dispose(self):
+        """Close every idle connection. Checked-out connections close on release."""
+        idle, self._idle = self._idle, []
+        for raw, _ in idle:
+            await self._close_quietly(raw)
+
+
+_pools = {}
+
+
+def get_async_pool():
+    """The pool for the running event loop, created on first use."""
+    if mysql_aio is None:
+        raise RuntimeError("mysql-connector-python has no asyncio driver (needs 9.0 or later)")
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        # Drop pools whose loops are gone (test clients, restarted servers)
+        for old_loop in [l for l in _pools if l.is_closed()]:
+            del _pools[old_loop]
+        pool = _pools[loop] = AsyncConnectionPool()
+    return pool
+
+
+async def close_async_pool():
+    """Dispose of the running loop's pool, if it has one."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.dispose()
+
+
+async def fetch_all(sql, params=(), dictionary=True):
+    async with get_async_pool().connection() as conn:
+        cursor = await conn.cursor(dictionary=dictionary)
+        try:
+            await cursor.execute(sql, params)
+            return await cursor.fetchall()
+        finally:
+            await cursor.close()
+
+
+async def fetch_one(sql, params=(), dictionary=True):
+    async with get_async_pool().connection() as conn:
+        cursor = await conn.cursor(dictionary=dictionary)
+        try:
+            await cursor.execute(sql, params)
+            return await cursor.fetchone()
+        finally:
+            await cursor.close()
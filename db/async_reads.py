@@ -0,0 +1,58 @@
+"""
+Async versions of the read queries behind the hot API routes.
+
+The SQL comes from the same builders the sync functions use, so both
+paths always run identical queries; only the driver differs.
+"""
+
+import mysql.connector
+
+from db.async_connection import fetch_all, fetch_one
+from db.transactions import read_transactions_sql, transactions_page_query, split_page, summary_query
+from db.products import products_sql, product_image_sql, main_image_sql
+from db.changes import table_versions_query, versions_from_rows
+from config.config import TABLE_NAME, PRODUCTS_TABLE_NAME, PRODUCT_IMAGES_TABLE
+
+
+async def table_versions(tables):
+    """See db.changes.table_versions."""
+    sql, params = table_versions_query(tables)
+    return versions_from_rows(await fetch_all(sql, params))
+
+
+async def read_transactions(table=TABLE_NAME):
+    return await fetch_all(read_transactions_sql(table))
+
+
+async def read_transactions_page(table=TABLE_NAME, limit=None, after=None, q=None, transaction_type=None,
+                                 supplier=None, date_from=None, date_to=None, sort="-date"):
+    """See db.transactions.read_transactions_page."""
+    sql, params = transactions_page_query(
+        table, limit, after, q, transaction_type, supplier, date_from, date_to, sort
+    )
+    return split_page(await fetch_all(sql, params), limit)
+
+
+async def summarize_transactions(table=TABLE_NAME, date_from=None, date_to=None,
+                                 year=None, month=None, quarter=None):
+    sql, params = summary_query(table, date_from, date_to, year, month, quarter)
+    return await fetch_all(sql, params)
+
+
+async def get_products(table=PRODUCTS_TABLE_NAME, columns=None):
+    sql = products_sql(table, columns)
+    try:
+        return await fetch_all(sql)
+    except mysql.connector.Error as err:
+        # Same contract as db.products.get_products
+        print(f"Error: {err}")
+        return []
+
+
+async def get_product_image(image_id, table=PRODUCT_IMAGES_TABLE):
+    return await fetch_one(product_image_sql(table), (image_id,))
+
+
+async def get_product_main_image(product_id, table=PRODUCTS_TABLE_NAME):
+    row = await fetch_one(main_image_sql(table), (product_id,), dictionary=False)
+    return row[0] if row else None
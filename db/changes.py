@@ -0,0 +1,152 @@
+"""
+Row-level change feed for delta sync (GET /changes).
+
+Inserts and updates are found through each table's updated_at column,
+which MySQL maintains (ON UPDATE CURRENT_TIMESTAMP(6)), so set-based
+statements such as the stock UPDATE ... JOINs are covered too. Deletes
+leave a tombstone (table name, row id) written in the same DB transaction
+as the DELETE.
+
+A sync token is the database clock at the start of a read. The next read
+looks TOKEN_OVERLAP_S further back than the token, so rows written by a
+transaction that was still open at the time are picked up late rather
+than never; clients merge by id, so repeats are harmless.
+"""
+
+from datetime import datetime, timedelta
+
+from db.db_connection import get_db_connection
+from config.config import (
+    TABLE_NAME, PRODUCTS_TABLE_NAME, MATERIALS_TABLE, TOMBSTONES_TABLE, TOMBSTONE_RETENTION_DAYS
+)
+
+# How far behind the token each read starts (longest expected write transaction)
+TOKEN_OVERLAP_S = 10
+
+TRANSACTION_SYNC_COLUMNS = [
+    "id", "transaction_date", "description", "quantity", "price", "total",
+    "transaction_type", "supplier", "product_id", "created_at", "updated_at"
+]
+
+
+def synced_tables():
+    """Feed name -> (table, select list). Product rows leave out the image blob."""
+    # db.products imports record_deletes from this module
+    from db.products import sync_select_list
+    return {
+        "transactions": (TABLE_NAME, ", ".join(TRANSACTION_SYNC_COLUMNS)),
+        "products": (PRODUCTS_TABLE_NAME, sync_select_list()),
+        "materials": (MATERIALS_TABLE, "*"),
+    }
+
+
+def encode_token(moment):
+    return moment.isoformat()
+
+
+def decode_token(token):
+    try:
+        return datetime.fromisoformat(token)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid sync token: {token!r}")
+
+
+def record_deletes(cursor, table, row_ids):
+    """
+    Write tombstones for deleted rows. Call on the deleting cursor before
+    its commit; expired tombstones are pruned on the way.
+    """
+    row_ids = list(row_ids)
+    if not row_ids:
+        return
+    cursor.executemany(
+        f"INSERT INTO {TOMBSTONES_TABLE} (table_name, row_id) VALUES (%s, %s)",
+        [(table, row_id) for row_id in row_ids]
+    )
+    cursor.execute(
+        f"DELETE FROM {TOMBSTONES_TABLE} WHERE deleted_at < NOW(6) - INTERVAL %s DAY",
+        (TOMBSTONE_RETENTION_DAYS,)
+    )
+
+
+def table_versions_query(tables):
+    """Row count and newest updated_at of each table, in one round trip."""
+    sql = " UNION ALL ".join(
+        f"SELECT %s AS name, COUNT(*) AS row_count, MAX(updated_at) AS last_update FROM {table}"
+        for table in tables
+    )
+    return sql, list(tables)
+
+
+def versions_from_rows(rows):
+    return {row["name"]: f"{row['row_count']}:{row['last_update'] or ''}" for row in rows}
+
+
+def table_versions(tables):
+    """
+    Current version of each table, for the list ETags.
+
+    Inserts and updates move MAX(updated_at) and deletes change COUNT(*),
+    whichever process made them, so the version changes with every
+    committed write to the table.
+
+    Returns:
+        dict: {table: version string}
+    """
+    sql, params = table_versions_query(tables)
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(sql, params)
+        return versions_from_rows(cursor.fetchall())
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def read_changes(since=None, names=None):
+    """
+    Rows changed after the `since` token.
+
+    Args:
+        since: token from a previous call, or None to just start syncing.
+        names: feed names from synced_tables() (default: all).
+
+    Returns:
+        dict: {"token": next token, "full": bool, <name>: {"upserts": [rows], "deleted": [ids]}}.
+        full=True (with no rows) means the caller must reload everything and
+        sync from the returned token: there was no token, or it is older
+        than the tombstone retention.
+    """
+    tables = synced_tables()
+    names = list(names) if names else list(tables)
+    unknown = [n for n in names if n not in tables]
+    if unknown:
+        raise ValueError(f"Unknown change feeds: {', '.join(unknown)}")
+    since_at = decode_token(since) if since else None
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT NOW(6) AS now")
+        now = cursor.fetchone()["now"]
+        result = {"token": encode_token(now), "full": True}
+        if since_at is None or since_at < now - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+            return result
+
+        result["full"] = False
+        window = since_at - timedelta(seconds=TOKEN_OVERLAP_S)
+        for name in names:
+            table, select_list = tables[name]
+            cursor.execute(f"SELECT {select_list} FROM {table} WHERE updated_at > %s", (window,))
+            upserts = cursor.fetchall()
+            cursor.execute(
+                f"SELECT DISTINCT row_id FROM {TOMBSTONES_TABLE} WHERE table_name = %s AND deleted_at > %s",
+                (table, window)
+            )
+            deleted = [row["row_id"] for row in cursor.fetchall()]
+            result[name] = {"upserts": upserts, "deleted": deleted}
+        return result
+    finally:
+        cursor.close()
+        conn.close()
@@ -1,12 +1,242 @@
+import threading
+import time
+from contextlib import contextmanager
+
 import mysql.connector
-from config.config import mysql_config
+from mysql.connector.errors import PoolError
+from config.config import (
+    mysql_config, DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE_SECONDS, DB_POOL_PRE_PING
+)
+
+
+class PooledConnection:
+    """
+    Thin proxy around a raw MySQL connection checked out from a ConnectionPool.
+
+    Behaves like the underlying connection (cursor, commit, rollback...), but
+    close() hands the connection back to the pool instead of dropping it, so
+    existing `conn.close()` calls keep working unchanged.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            raise PoolError("Connection has already been returned to the pool")
+        return getattr(raw, name)
+
+    def close(self):
+        # Idempotent: several db helpers close more than once.
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool._release(raw)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of MySQL connections.
+
+    Keeps up to `size` idle connections warm and allows `max_overflow` extra
+    connections under bursts. Checkouts block for at most `timeout` seconds
+    when the pool is exhausted. Connections idle longer than
+    `recycle_seconds` are reopened, and `pre_ping` verifies liveness before
+    handing a reused connection out.
+    """
+
+    def __init__(self, size=DB_POOL_SIZE, max_overflow=DB_POOL_MAX_OVERFLOW,
+                 timeout=DB_POOL_TIMEOUT, recycle_seconds=DB_POOL_RECYCLE_SECONDS,
+                 pre_ping=DB_POOL_PRE_PING, connect=None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.max_overflow = max(0, max_overflow)
+        self.timeout = timeout
+        self.recycle_seconds = recycle_seconds
+        self.pre_ping = pre_ping
+        self._connect = connect or (lambda: mysql.connector.connect(**mysql_config))
+
+        self._cond = threading.Condition()
+        self._idle = []  # LIFO stack of (raw_connection, released_at)
+        self._checked_out = 0
+        self._counters = {
+            "created": 0,
+            "reused": 0,
+            "recycled": 0,
+            "discarded": 0,
+            "timeouts": 0,
+        }
+
+    def acquire(self):
+        """
+        Check a connection out of the pool.
+
+        Returns:
+            PooledConnection
+
+        Raises:
+            PoolError: if no connection becomes available within `timeout`.
+        """
+        deadline = time.monotonic() + self.timeout
+        raw, released_at = None, None
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, released_at = self._idle.pop()
+                    break
+                if self._checked_out + len(self._idle) < self.size + self.max_overflow:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolError(
+                        f"Connection pool exhausted (size={self.size}, "
+                        f"max_overflow={self.max_overflow})"
+                    )
+                self._cond.wait(remaining)
+            self._checked_out += 1
+
+        # Network I/O happens outside the lock
+        try:
+            if raw is None:
+                raw = self._open()
+            else:
+                raw = self._validate(raw, released_at)
+        except Exception:
+            with self._cond:
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, raw)
+
+    def _open(self):
+        raw = self._connect()
+        with self._cond:
+            self._counters["created"] += 1
+        return raw
+
+    def _validate(self, raw, released_at):
+        if self.recycle_seconds and time.monotonic() - released_at > self.recycle_seconds:
+            self._close_quietly(raw)
+            with self._cond:
+                self._counters["recycled"] += 1
+            return self._open()
+
+        if self.pre_ping and not raw.is_connected():
+            self._close_quietly(raw)
+            with self._cond:
+                self._counters["discarded"] += 1
+            return self._open()
+
+        with self._cond:
+            self._counters["reused"] += 1
+        return raw
+
+    def _release(self, raw):
+        healthy = True
+        try:
+            # Never hand out a connection with an open transaction: a stale
+            # REPEATABLE READ snapshot would hide other clients' writes.
+            if raw.in_transaction:
+                raw.rollback()
+        except Exception:
+            healthy = False
+
+        keep = False
+        with self._cond:
+            self._checked_out -= 1
+            if healthy and len(self._idle) < self.size:
+                self._idle.append((raw, time.monotonic()))
+                keep = True
+            elif not healthy:
+                self._counters["discarded"] += 1
+            self._cond.notify()
+
+        if not keep:
+            self._close_quietly(raw)
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        """Return a snapshot of pool usage counters."""
+        with self._cond:
+            return {
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "checked_out": self._checked_out,
+                "idle": len(self._idle),
+                **self._counters,
+            }
+
+    def dispose(self):
+        """Close every idle connection. Checked-out connections close on release."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for raw, _ in idle:
+            self._close_quietly(raw)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
 
 
 def get_db_connection():
     """
-    Returns a MySQL connection.
+    Returns a MySQL connection from the shared pool.
+
+    Calling close() on it returns it to the pool.
 
     Returns:
-        mysql.connector.connection.MySQLConnection
+        PooledConnection
+    """
+    return get_pool().acquire()
+
+
+@contextmanager
+def db_connection():
     """
-    return mysql.connector.connect(**mysql_config)
+    Context manager around a pooled connection.
+
+    Rolls back on error and always returns the connection to the pool:
+
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            ...
+            conn.commit()
+    """
+    conn = get_db_connection()
+    try:
+        yield conn
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        conn.close()
+
+
+def pool_stats():
+    """Return usage statistics for the shared connection pool."""
+    return get_pool().stats()
@@ -1,4 +1,5 @@
 import os
+import re
 from db.db_connection import get_db_connection
 from config.config import (
     TABLE_NAME, PRODUCTS_TABLE_NAME, MATERIALS_TABLE, PRODUCT_IMAGES_TABLE,
@@ -6,6 +7,94 @@ from config.config import (
     DB_SCHEMA
 )
 
+# Schema keys like "INDEX idx_name" / "UNIQUE INDEX idx_name" declare indexes;
+# the value is the parenthesised key part list, e.g. "(product_id, display_order)"
+# or a functional key part "((LOWER(title)))".
+INDEX_KEY_RE = re.compile(r"^(UNIQUE\s+)?(?:INDEX|KEY)\s+(\w+)$", re.IGNORECASE)
+
+
+def parse_index_key(key):
+    """Return (index_name, unique) for an index schema key, else None."""
+    match = INDEX_KEY_RE.match(key.strip())
+    if not match:
+        return None
+    return match.group(2), bool(match.group(1))
+
+
+def get_declared_indexes(schema):
+    """{index_name: (unique, key_parts)} for the indexes declared in a schema."""
+    indexes = {}
+    for key, definition in schema.items():
+        parsed = parse_index_key(key)
+        if parsed:
+            name, unique = parsed
+            indexes[name] = (unique, definition.strip())
+    return indexes
+
+
+def _normalize_key_parts(key_parts):
+    """Comparable form of a key part list: lowercase, no spaces or backticks."""
+    return re.sub(r"[\s`]", "", key_parts).lower()
+
+
+def _existing_key_parts(rows):
+    """
+    Rebuild "(col_a, col_b)" from SHOW INDEX rows of one index, so it can be
+    compared against the declared definition. Functional parts come back in
+    the Expression column.
+    """
+    parts = []
+    for row in sorted(rows, key=lambda r: r['Seq_in_index']):
+        if row.get('Column_name'):
+            parts.append(row['Column_name'])
+        else:
+            parts.append(f"({row.get('Expression') or ''})")
+    return f"({', '.join(parts)})"
+
+
+def sync_indexes(cursor, conn, table_name, schema):
+    """
+    Create declared indexes that are missing and rebuild ones whose key parts
+    changed. Indexes not declared in the schema (PRIMARY, FK-generated ones)
+    are left alone.
+
+    Returns False if any index could not be built.
+    """
+    declared = get_declared_indexes(schema)
+    if not declared:
+        return True
+
+    cursor.execute(f"SHOW INDEX FROM {table_name}")
+    existing = {}
+    for row in cursor.fetchall():
+        existing.setdefault(row['Key_name'], []).append(row)
+
+    ok = True
+    for name, (unique, key_parts) in declared.items():
+        create_sql = f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table_name} {key_parts}"
+        rows = existing.get(name)
+        if rows:
+            same_parts = _normalize_key_parts(_existing_key_parts(rows)) == _normalize_key_parts(key_parts)
+            same_unique = (not rows[0].get('Non_unique')) == unique
+            if same_parts and same_unique:
+                continue
+            print(f"Index '{name}' on '{table_name}' changed. Rebuilding...")
+            statements = [f"DROP INDEX {name} ON {table_name}", create_sql]
+        else:
+            print(f"Adding missing index '{name}' to '{table_name}'...")
+            statements = [create_sql]
+
+        try:
+            for sql in statements:
+                cursor.execute(sql)
+            conn.commit()
+            print(f"Index '{name}' ready.")
+        except Exception as idx_err:
+            print(f"Failed to create index '{name}': {idx_err}")
+            ok = False
+    return ok
+
+
 def generate_create_table_sql(table_name, schema):
     if not schema:
         print("Warning: DB_SCHEMA is empty. Cannot generate SQL.")
@@ -21,10 +110,15 @@ def generate_create_table_sql(table_name, schema):
 def create_table(table_name, schema):
     """
     Checks if table exists. If not, generates SQL from schema and creates it.
-    If it does exist, it checks for missing columns and adds them via ALTER TABLE.
+    If it does exist, it checks for missing columns and adds them via ALTER TABLE,
+    then creates or rebuilds declared indexes that are missing or changed.
+
+    Failures are printed and skipped so the remaining changes still apply;
+    returns False if anything failed.
     """
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
+    ok = True
     
     try:
         # Check if table exists
@@ -35,7 +129,7 @@ def create_table(table_name, schema):
             print(f"Table '{table_name}' already exists. Checking for missing columns...")
             if not schema:
                 print("Warning: DB_SCHEMA is empty. Cannot check columns.")
-                return
+                return ok
 
             # Get existing columns
             cursor.execute(f"DESCRIBE {table_name}")
@@ -43,9 +137,11 @@ def create_table(table_name, schema):
 
             # Find missing columns
             for col_name, col_def in schema.items():
-                # Ignore foreign keys from this basic check
+                # Ignore foreign keys and indexes from this basic check
                 if "FOREIGN KEY" in col_name.upper() or "PRIMARY KEY" in col_name.upper():
                     continue
+                if parse_index_key(col_name):
+                    continue
                 
                 if col_name not in existing_columns:
                     print(f"Adding missing column '{col_name}' to '{table_name}'...")
@@ -56,6 +152,9 @@ def create_table(table_name, schema):
                         print(f"Added '{col_name}' successfully.")
                     except Exception as alt_err:
                         print(f"Failed to add column '{col_name}': {alt_err}")
+                        ok = False
+
+            ok = sync_indexes(cursor, conn, table_name, schema) and ok
         else:
             print(f"Table '{table_name}' does not exist. Creating...")
             create_sql = generate_create_table_sql(table_name, schema)
@@ -66,12 +165,15 @@ def create_table(table_name, schema):
                 print(f"Table '{table_name}' created successfully.")
             else:
                 print(f"Failed to create table '{table_name}': No schema defined.")
+                ok = False
                 
     except Exception as e:
         print(f"Database initialization failed: {e}")
+        ok = False
     finally:
         cursor.close()
         conn.close()
+    return ok
 
 def init_db(table_name=TABLE_NAME, schema=TRANSACTIONS_SCHEMA):
     create_table(table_name, schema)
@@ -0,0 +1,148 @@
+from db.db_connection import get_db_connection
+from db.transactions import ALLOWED_TABLES, insert_transactions
+from config.config import TABLE_NAME, PRODUCTS_TABLE_NAME, MATERIALS_TABLE
+
+
+def _units_sold(transactions):
+    """Total quantity per product over the income rows that link a product."""
+    sold = {}
+    for t in transactions:
+        product_id = t.get("product_id")
+        if product_id and str(t["transaction_type"]).lower() == "income":
+            sold[product_id] = sold.get(product_id, 0) + t["quantity"]
+    return sold
+
+
+def affects_stock(transactions):
+    """True if posting `transactions` would deduct any stock (a sale of a product)."""
+    return bool(_units_sold(transactions))
+
+
+def _pairs_sql(pairs, key, value):
+    """Derived table (key, value) built from literal pairs, with its params."""
+    sql = " UNION ALL ".join([f"SELECT %s AS {key}, %s AS {value}"] * len(pairs))
+    params = [v for pair in pairs for v in pair]
+    return sql, params
+
+
+def _sold_sql(sold):
+    """Derived table (product_id, qty) for the sold products, with its params."""
+    return _pairs_sql(sold.items(), "product_id", "qty")
+
+
+def _bom_sql(sold, products_table):
+    """
+    Derived table (name, amount) of material usage for the sold products:
+    wax by weight, one wick and one container per unit.
+    """
+    sold_sql, sold_params = _sold_sql(sold)
+    sql = f"""
+        SELECT name, SUM(amount) AS amount FROM (
+            SELECT p.wax_type AS name, p.wax_weight_g * s.qty AS amount
+            FROM {products_table} p JOIN ({sold_sql}) s ON s.product_id = p.id
+            WHERE p.wax_type <> '' AND p.wax_weight_g > 0
+            UNION ALL
+            SELECT p.wick_type, s.qty
+            FROM {products_table} p JOIN ({sold_sql}) s ON s.product_id = p.id
+            WHERE p.wick_type <> ''
+            UNION ALL
+            SELECT p.container_type, s.qty
+            FROM {products_table} p JOIN ({sold_sql}) s ON s.product_id = p.id
+            WHERE p.container_type <> ''
+        ) bom GROUP BY name
+    """
+    return sql, sold_params * 3
+
+
+def post_transactions(
+    transactions,
+    table=TABLE_NAME,
+    products_table=PRODUCTS_TABLE_NAME,
+    materials_table=MATERIALS_TABLE
+):
+    """
+    Record transactions and apply their inventory effects in one DB transaction.
+
+    Income rows with a product_id deduct that product's stock and its bill
+    of materials (wax, wick, container). Material names are not unique, so
+    like materials.deduct_stock_by_name only the first row (lowest id) with
+    a given name is deducted. Everything happens on a single connection
+    with set-based UPDATE ... JOIN statements, so a sale either posts
+    completely or not at all.
+
+    Args:
+        transactions: iterable of dicts with transaction_date, description,
+            quantity, price, transaction_type and optional supplier/product_id.
+
+    Returns:
+        dict: {"ids": [new transaction ids in input order],
+               "products": [{"id", "stock_quantity"}],
+               "materials": [{"id", "name", "stock_quantity"}]}
+        with the stock levels after posting for everything that changed.
+    """
+    if table not in ALLOWED_TABLES:
+        raise ValueError("Invalid table name")
+
+    transactions = list(transactions)
+    result = {"ids": [], "products": [], "materials": []}
+    if not transactions:
+        return result
+
+    sold = _units_sold(transactions)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        result["ids"] = insert_transactions(cursor, transactions, table)
+
+        if sold:
+            sold_sql, sold_params = _sold_sql(sold)
+            cursor.execute(f"""
+                UPDATE {products_table} p JOIN ({sold_sql}) s ON p.id = s.product_id
+                SET p.stock_quantity = p.stock_quantity - s.qty
+            """, sold_params)
+
+            # Resolve each used material name to its first row
+            bom_sql, bom_params = _bom_sql(sold, products_table)
+            cursor.execute(f"""
+                SELECT MIN(m.id), MIN(d.amount)
+                FROM {materials_table} m JOIN ({bom_sql}) d ON m.name = d.name
+                GROUP BY d.name
+            """, bom_params)
+            usage = cursor.fetchall()
+            if usage:
+                usage_sql, usage_params = _pairs_sql(usage, "id", "amount")
+                cursor.execute(f"""
+                    UPDATE {materials_table} m JOIN ({usage_sql}) u ON m.id = u.id
+                    SET m.stock_quantity = m.stock_quantity - u.amount
+                """, usage_params)
+
+            # Read back inside the same transaction so the levels match what was written
+            placeholders = ", ".join(["%s"] * len(sold))
+            cursor.execute(
+                f"SELECT id, stock_quantity FROM {products_table} WHERE id IN ({placeholders})",
+                list(sold)
+            )
+            result["products"] = [
+                {"id": row[0], "stock_quantity": row[1]} for row in cursor.fetchall()
+            ]
+
+            if usage:
+                placeholders = ", ".join(["%s"] * len(usage))
+                cursor.execute(
+                    f"SELECT id, name, stock_quantity FROM {materials_table} WHERE id IN ({placeholders})",
+                    [row[0] for row in usage]
+                )
+                result["materials"] = [
+                    {"id": row[0], "name": row[1], "stock_quantity": row[2]} for row in cursor.fetchall()
+                ]
+
+        conn.commit()
+        return result
+    except Exception as e:
+        print(f"Error posting transactions: {e}")
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
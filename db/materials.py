@@ -1,4 +1,5 @@
 from db.db_connection import get_db_connection
+from db.changes import record_deletes
 from config.config import MATERIALS_TABLE
 
 def add_material(name, category, stock_quantity, unit_cost, unit_type, table=MATERIALS_TABLE):
@@ -46,7 +47,12 @@ def delete_material(material_id, table=MATERIALS_TABLE):
     cursor = conn.cursor()
     try:
         cursor.execute(f"DELETE FROM {table} WHERE id=%s", (material_id,))
+        if cursor.rowcount:
+            record_deletes(cursor, table, [material_id])
         conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         cursor.close()
         conn.close()
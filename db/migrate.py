@@ -0,0 +1,193 @@
+"""
+Versioned schema migrations.
+
+Applied migrations are recorded in the schema_migrations table. At startup
+migrate() reads that table once; when every migration is applied and the
+declared schemas in config are unchanged it returns without touching
+anything else. Otherwise it takes a named lock, applies pending migrations
+in version order and re-syncs the declared schemas (missing tables,
+columns and indexes) through init_db.create_table. The fingerprint is only
+recorded when every table synced cleanly, so a failed ALTER is retried on
+the next start rather than reported as up to date.
+
+Adding a column or index only needs the schema in config to change; the
+fingerprint below notices it. Data changes or anything create_table can't
+express (renames, backfills) go in MIGRATIONS with the next version number.
+"""
+
+import hashlib
+import json
+
+import mysql.connector
+from db.db_connection import get_db_connection
+from db.init_db import create_table
+from config.config import (
+    TABLE_NAME, PRODUCTS_TABLE_NAME, MATERIALS_TABLE, PRODUCT_IMAGES_TABLE, TOMBSTONES_TABLE,
+    TRANSACTIONS_SCHEMA, PRODUCTS_SCHEMA, MATERIALS_SCHEMA, PRODUCT_IMAGES_SCHEMA, TOMBSTONES_SCHEMA
+)
+
+MIGRATIONS_TABLE = "schema_migrations"
+# Row that records the fingerprint of the declared schemas it last synced
+SCHEMA_SYNC_VERSION = 0
+LOCK_NAME = "schema_migrations"
+LOCK_TIMEOUT_S = 30
+
+
+def declared_tables():
+    """(table, schema) pairs in creation order; referenced tables come first."""
+    return [
+        (TABLE_NAME, TRANSACTIONS_SCHEMA),
+        (PRODUCTS_TABLE_NAME, PRODUCTS_SCHEMA),
+        (MATERIALS_TABLE, MATERIALS_SCHEMA),
+        (PRODUCT_IMAGES_TABLE, PRODUCT_IMAGES_SCHEMA),
+        (TOMBSTONES_TABLE, TOMBSTONES_SCHEMA),
+    ]
+
+
+def schema_fingerprint(tables=None):
+    """Stable hash of the declared table names and schemas."""
+    payload = json.dumps(tables if tables is not None else declared_tables(), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# --- Migrations ---
+
+def _table_columns(cursor, table):
+    cursor.execute("SHOW TABLES LIKE %s", (table,))
+    if not cursor.fetchall():
+        return None
+    cursor.execute(f"SHOW COLUMNS FROM {table}")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def rename_products_name_to_title(cursor):
+    """Early databases called the product title column 'name'."""
+    columns = _table_columns(cursor, PRODUCTS_TABLE_NAME)
+    if columns and "name" in columns and "title" not in columns:
+        cursor.execute(f"ALTER TABLE {PRODUCTS_TABLE_NAME} CHANGE COLUMN name title VARCHAR(255) NOT NULL")
+
+
+# (version, name, function(cursor)); versions only ever increase
+MIGRATIONS = [
+    (1, "rename_products_name_to_title", rename_products_name_to_title),
+]
+
+
+# --- Runner ---
+
+def _read_applied(cursor):
+    """{version: checksum} from schema_migrations, or None if it doesn't exist yet."""
+    try:
+        cursor.execute(f"SELECT version, checksum FROM {MIGRATIONS_TABLE}")
+        return {row[0]: row[1] for row in cursor.fetchall()}
+    except mysql.connector.Error:
+        return None
+
+
+def pending_migrations(applied):
+    return [m for m in MIGRATIONS if m[0] not in (applied or {})]
+
+
+def is_up_to_date(applied, fingerprint):
+    return (
+        applied is not None
+        and not pending_migrations(applied)
+        and applied.get(SCHEMA_SYNC_VERSION) == fingerprint
+    )
+
+
+def _record(cursor, version, name, checksum=None):
+    cursor.execute(
+        f"REPLACE INTO {MIGRATIONS_TABLE} (version, name, checksum) VALUES (%s, %s, %s)",
+        (version, name, checksum)
+    )
+
+
+def migration_status():
+    """
+    Report migration state with a single query (used by /health/ready).
+
+    Raises if the database can't be reached.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        applied = _read_applied(cursor)
+    finally:
+        cursor.close()
+        conn.close()
+
+    pending = [name for _, name, _ in pending_migrations(applied)]
+    schema_synced = applied is not None and applied.get(SCHEMA_SYNC_VERSION) == schema_fingerprint()
+    return {
+        "up_to_date": not pending and schema_synced,
+        "pending": pending,
+        "schema_synced": schema_synced
+    }
+
+
+def migrate():
+    """
+    Bring the database up to date.
+
+    Returns:
+        list[str]: names of the steps that ran (empty on the fast path).
+    """
+    fingerprint = schema_fingerprint()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    ran = []
+    try:
+        # Fast path: one query when nothing changed
+        applied = _read_applied(cursor)
+        if is_up_to_date(applied, fingerprint):
+            return ran
+
+        # Another process may be migrating; wait for it, then re-check
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, LOCK_TIMEOUT_S))
+        granted = cursor.fetchall()
+        if not granted or granted[0][0] != 1:
+            raise RuntimeError(f"Could not take the '{LOCK_NAME}' lock within {LOCK_TIMEOUT_S}s")
+        try:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+                    version INT PRIMARY KEY,
+                    name VARCHAR(255) NOT NULL,
+                    checksum VARCHAR(64) DEFAULT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            applied = _read_applied(cursor) or {}
+
+            for version, name, func in pending_migrations(applied):
+                print(f"Applying migration {version}: {name}...")
+                func(cursor)
+                _record(cursor, version, name)
+                conn.commit()
+                ran.append(name)
+
+            if ran or applied.get(SCHEMA_SYNC_VERSION) != fingerprint:
+                print("Declared schema changed. Syncing tables...")
+                failed = [table for table, schema in declared_tables() if not create_table(table, schema)]
+                if failed:
+                    # Leave the fingerprint stale so the next start retries
+                    raise RuntimeError(f"Schema sync failed for: {', '.join(failed)}")
+                _record(cursor, SCHEMA_SYNC_VERSION, "declared_schema", fingerprint)
+                conn.commit()
+                ran.append("declared_schema")
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cursor.fetchall()
+        return ran
+    except Exception as e:
+        print(f"Database migration failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    steps = migrate()
+    print(f"Applied: {', '.join(steps)}" if steps else "Database is up to date.")
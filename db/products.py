@@ -1,8 +1,49 @@
 import json
 from db.db_connection import get_db_connection
-from config.config import PRODUCTS_TABLE_NAME
+from db.changes import record_deletes
+from config.config import PRODUCTS_TABLE_NAME, PRODUCTS_SCHEMA
 import mysql.connector
 
+# Columns that hold binary payloads; never selected by projected listings
+BLOB_COLUMNS = {"image"}
+
+# Everything the list views need: identity, stock/price, shipping weight and
+# the inputs of ProductsTab.calculate_product_cost_static
+PRODUCT_LIST_COLUMNS = [
+    "id", "title", "sku", "stock_quantity", "selling_price", "total_cost", "weight_g",
+    "wax_weight_g", "wax_rate", "fragrance_weight_g", "fragrance_rate",
+    "wick_quantity", "wick_rate", "container_quantity", "container_rate",
+    "box_quantity", "box_price", "wrap_price", "business_card_cost",
+    "labor_time", "labor_rate"
+]
+
+# Columns accepted by create_product / create_products_bulk
+PRODUCT_INSERT_COLUMNS = [
+    "title", "sku", "upc", "description", "stock_quantity", "weight_g", "length_cm", "width_cm", "height_cm",
+    "wax_type", "wax_weight_g", "wax_rate", 
+    "fragrance_type", "fragrance_weight_g", "fragrance_rate",
+    "wick_type", "wick_rate", "wick_quantity", 
+    "container_type", "container_rate", "container_quantity", "container_unit", "container_details",
+    "second_container_type", "second_container_weight_g", "second_container_rate",
+    "box_type", "box_price", "box_quantity", "wrap_price", "business_card_cost", "labor_time", "labor_rate", "selling_price", 
+    "amazon_data", "etsy_data", "common_data", 'image'
+]
+
+# Max rows per executemany statement; keeps multi-row INSERTs under max_allowed_packet
+BULK_CHUNK_SIZE = 500
+# Image batches are also capped by payload size since each row carries a blob
+BULK_IMAGE_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def _prepare_product_row(product_data):
+    """Filter to insertable columns and JSON-encode the marketplace fields."""
+    data = {k: v for k, v in product_data.items() if k in PRODUCT_INSERT_COLUMNS}
+    for key in ('amazon_data', 'etsy_data', 'common_data'):
+        if key in data and not isinstance(data[key], str):
+            data[key] = json.dumps(data[key])
+    return data
+
+
 def create_product(product_data, table=PRODUCTS_TABLE_NAME):
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -11,30 +52,8 @@ def create_product(product_data, table=PRODUCTS_TABLE_NAME):
     #       wax_type, wax_weight_g, wick_type, container_type, container_details, 
     #       box_price, wrap_price, image (BLOB)
     
-    # We'll construct the query dynamically based on keys present, 
-    # but strict adherence to schema is safer.
-    
-    columns = [
-        "title", "sku", "upc", "description", "stock_quantity", "weight_g", "length_cm", "width_cm", "height_cm",
-        "wax_type", "wax_weight_g", "wax_rate", 
-        "fragrance_type", "fragrance_weight_g", "fragrance_rate",
-        "wick_type", "wick_rate", "wick_quantity", 
-        "container_type", "container_rate", "container_quantity", "container_unit", "container_details",
-        "second_container_type", "second_container_weight_g", "second_container_rate",
-        "box_type", "box_price", "box_quantity", "wrap_price", "business_card_cost", "labor_time", "labor_rate", "selling_price", 
-        "amazon_data", "etsy_data", "common_data", 'image'
-    ]
-    
     # Filter data to only valid columns
-    data = {k: v for k, v in product_data.items() if k in columns}
-    
-    # JSON Serialization
-    if 'amazon_data' in data and not isinstance(data['amazon_data'], str):
-        data['amazon_data'] = json.dumps(data['amazon_data'])
-    if 'etsy_data' in data and not isinstance(data['etsy_data'], str):
-        data['etsy_data'] = json.dumps(data['etsy_data'])
-    if 'common_data' in data and not isinstance(data['common_data'], str):
-        data['common_data'] = json.dumps(data['common_data'])
+    data = _prepare_product_row(product_data)
     
     cols_str = ", ".join(data.keys())
     # placeholders: %s
@@ -42,8 +61,6 @@ def create_product(product_data, table=PRODUCTS_TABLE_NAME):
     
     sql = f"INSERT INTO {table} ({cols_str}) VALUES ({placeholders})"
     
-    sql = f"INSERT INTO {table} ({cols_str}) VALUES ({placeholders})"
-    
     cursor.execute(sql, list(data.values()))
     conn.commit()
     new_id = cursor.lastrowid
@@ -51,12 +68,76 @@ def create_product(product_data, table=PRODUCTS_TABLE_NAME):
     conn.close()
     return new_id
 
-def get_products(table=PRODUCTS_TABLE_NAME):
+
+def create_products_bulk(products, table=PRODUCTS_TABLE_NAME):
+    """
+    Insert many products on one connection in a single transaction.
+
+    Each row is its own INSERT so its id comes from that statement's
+    lastrowid: with innodb_autoinc_lock_mode=2 (the MySQL 8 default) a
+    multi-row INSERT is not guaranteed consecutive ids, and callers attach
+    images by these ids. One commit at the end still keeps the batch cheap.
+
+    Returns:
+        list[int]: new product ids, in the same order as `products`.
+        Nothing is written if any row fails.
+    """
+    rows = [_prepare_product_row(p) for p in products]
+    if not rows:
+        return []
+
+    ids = []
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        for data in rows:
+            cols = list(data.keys())
+            sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(['%s'] * len(cols))})"
+            cursor.execute(sql, list(data.values()))
+            ids.append(cursor.lastrowid)
+        conn.commit()
+        return ids
+    except mysql.connector.Error as err:
+        print(f"Error bulk creating products in {table}: {err}")
+        conn.rollback()
+        raise err
+    finally:
+        cursor.close()
+        conn.close()
+
+def _projection(columns):
+    """Validate requested columns against the schema and build the SELECT list."""
+    known = {c for c in PRODUCTS_SCHEMA if " " not in c} | {"id"}
+    invalid = [c for c in columns if c not in known or c in BLOB_COLUMNS]
+    if invalid:
+        raise ValueError(f"Invalid product fields: {', '.join(invalid)}")
+    # id is always needed to address the row later
+    ordered = ["id"] + [c for c in dict.fromkeys(columns) if c != "id"]
+    return ", ".join(ordered)
+
+
+def sync_select_list():
+    """Every column except blobs, for the change feed (db.changes)."""
+    return _projection([c for c in PRODUCTS_SCHEMA if " " not in c and c not in BLOB_COLUMNS])
+
+
+def products_sql(table=PRODUCTS_TABLE_NAME, columns=None):
+    select_list = _projection(columns) if columns else "*"
+    return f"SELECT {select_list} FROM {table}"
+
+
+def get_products(table=PRODUCTS_TABLE_NAME, columns=None):
+    """
+    List products. With `columns`, only those fields are selected, which keeps
+    the LONGBLOB image column off the wire entirely.
+    """
+    sql = products_sql(table, columns)
+
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     
     try:
-        cursor.execute(f"SELECT * FROM {table}")
+        cursor.execute(sql)
         return cursor.fetchall()
     except mysql.connector.Error as err:
         print(f"Error: {err}")
@@ -128,36 +209,44 @@ def delete_product(product_id, table=PRODUCTS_TABLE_NAME):
     
     try:
         cursor.execute(f"DELETE FROM {table} WHERE id = %s", (product_id,))
+        if cursor.rowcount:
+            record_deletes(cursor, table, [product_id])
         conn.commit()
     except mysql.connector.Error as err:
         print(f"Error: {err}")
-    except mysql.connector.Error as err:
-        print(f"Error: {err}")
+        conn.rollback()
     finally:
         cursor.close()
         conn.close()
 
+def normalize_title(title):
+    """Python side of the title_normalized generated column (LOWER(TRIM(title)))."""
+    return (title or "").strip().lower()
+
+
 def product_exists(title, sku=None, table=PRODUCTS_TABLE_NAME):
     """
     Check if a product exists by title (case-insensitive) or SKU.
     Returns True if exists, False otherwise.
+
+    One indexed lookup on sku / title_normalized. For checking many rows at
+    once, load get_existing_product_keys() instead.
     """
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        # Check SKU first if provided
         if sku:
-            cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE sku = %s", (sku,))
-            if cursor.fetchone()[0] > 0:
-                return True
-        
-        # Check Title (case-insensitive)
-        cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE LOWER(title) = LOWER(%s)", (title,))
-        if cursor.fetchone()[0] > 0:
-            return True
-            
-        return False
+            cursor.execute(
+                f"SELECT 1 FROM {table} WHERE sku = %s OR title_normalized = %s LIMIT 1",
+                (sku, normalize_title(title))
+            )
+        else:
+            cursor.execute(
+                f"SELECT 1 FROM {table} WHERE title_normalized = %s LIMIT 1",
+                (normalize_title(title),)
+            )
+        return cursor.fetchone() is not None
     except mysql.connector.Error as err:
         print(f"Error checking product existence: {err}")
         return False
@@ -165,6 +254,34 @@ def product_exists(title, sku=None, table=PRODUCTS_TABLE_NAME):
         cursor.close()
         conn.close()
 
+
+def get_existing_product_keys(table=PRODUCTS_TABLE_NAME):
+    """
+    Load every existing (normalized title, sku) in one query.
+
+    Returns:
+        tuple(set, set): normalized titles and non-empty SKUs, so an import can
+        check each row for duplicates in memory.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(f"SELECT title_normalized, sku FROM {table}")
+        titles, skus = set(), set()
+        for title_key, sku in cursor.fetchall():
+            if title_key:
+                titles.add(title_key)
+            if sku:
+                skus.add(sku)
+        return titles, skus
+    except mysql.connector.Error as err:
+        print(f"Error loading product keys: {err}")
+        raise err
+    finally:
+        cursor.close()
+        conn.close()
+
 from config.config import PRODUCTS_TABLE_NAME, PRODUCT_IMAGES_TABLE
 import mysql.connector
 
@@ -186,6 +303,43 @@ def add_product_image(product_id, image_data, display_order=0, table=PRODUCT_IMA
         cursor.close()
         conn.close()
 
+def add_product_images_bulk(images, table=PRODUCT_IMAGES_TABLE):
+    """
+    Insert gallery images in one transaction.
+
+    Args:
+        images: iterable of (product_id, image_data, display_order)
+
+    Returns:
+        int: number of rows inserted. Nothing is written if any batch fails.
+    """
+    images = list(images)
+    if not images:
+        return 0
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        sql = f"INSERT INTO {table} (product_id, image_data, display_order) VALUES (%s, %s, %s)"
+        batch, batch_bytes = [], 0
+        for row in images:
+            batch.append(row)
+            batch_bytes += len(row[1] or b"")
+            if len(batch) >= BULK_CHUNK_SIZE or batch_bytes >= BULK_IMAGE_CHUNK_BYTES:
+                cursor.executemany(sql, batch)
+                batch, batch_bytes = [], 0
+        if batch:
+            cursor.executemany(sql, batch)
+        conn.commit()
+        return len(images)
+    except mysql.connector.Error as err:
+        print(f"Error bulk adding images: {err}")
+        conn.rollback()
+        raise err
+    finally:
+        cursor.close()
+        conn.close()
+
 def get_product_images(product_id):
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
@@ -200,6 +354,50 @@ def get_product_images(product_id):
         cursor.close()
         conn.close()
 
+def list_product_images(product_id, table=PRODUCT_IMAGES_TABLE):
+    """Image metadata for a product, without the image bytes."""
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        sql = f"SELECT id, product_id, image_url, display_order FROM {table} WHERE product_id = %s ORDER BY display_order ASC"
+        cursor.execute(sql, (product_id,))
+        return cursor.fetchall()
+    except mysql.connector.Error as err:
+        print(f"Error listing images: {err}")
+        return []
+    finally:
+        cursor.close()
+        conn.close()
+
+def product_image_sql(table=PRODUCT_IMAGES_TABLE):
+    return f"SELECT id, product_id, image_data FROM {table} WHERE id = %s"
+
+def get_product_image(image_id, table=PRODUCT_IMAGES_TABLE):
+    """Fetch a single gallery image row (including image_data) by id."""
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(product_image_sql(table), (image_id,))
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+        conn.close()
+
+def main_image_sql(table=PRODUCTS_TABLE_NAME):
+    return f"SELECT image FROM {table} WHERE id = %s"
+
+def get_product_main_image(product_id, table=PRODUCTS_TABLE_NAME):
+    """Return the legacy main image bytes of a product, or None."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(main_image_sql(table), (product_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    finally:
+        cursor.close()
+        conn.close()
+
 def delete_product_image(image_id):
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from mysql.connector.errors import PoolError
+import db.async_connection as async_db
+from db.async_connection import AsyncConnectionPool
+
+
+def make_raw():
+    raw = MagicMock()
+    raw.in_transaction = False
+    raw.is_connected = AsyncMock(return_value=True)
+    raw.rollback = AsyncMock()
+    raw.close = AsyncMock()
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.fetchall = AsyncMock(return_value=[{"id": 1}])
+    cursor.fetchone = AsyncMock(return_value=(b"png",))
+    cursor.close = AsyncMock()
+    raw.cursor = AsyncMock(return_value=cursor)
+    return raw
+
+
+@pytest.fixture
+def connect():
+    return AsyncMock(side_effect=lambda: make_raw())
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_connection_is_reused_after_release(connect):
+    async def scenario():
+        pool = AsyncConnectionPool(size=2, max_overflow=0, connect=connect)
+        async with pool.connection() as first:
+            pass
+        async with pool.connection() as second:
+            pass
+        return pool, first, second
+
+    pool, first, second = run(scenario())
+    assert first is second
+    assert connect.await_count == 1
+    assert pool.stats()["reused"] == 1
+
+
+def test_waiter_gets_released_connection(connect):
+    async def scenario():
+        pool = AsyncConnectionPool(size=1, max_overflow=0, timeout=2, connect=connect)
+        held = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        await pool.release(held)
+        return held, await waiter
+
+    held, got = run(scenario())
+    assert got is held
+
+
+def test_exhausted_pool_times_out(connect):
+    async def scenario():
+        pool = AsyncConnectionPool(size=1, max_overflow=0, timeout=0.05, connect=connect)
+        await pool.acquire()
+        with pytest.raises(PoolError):
+            await pool.acquire()
+        return pool
+
+    assert run(scenario()).stats()["timeouts"] == 1
+
+
+def test_overflow_closed_and_transactions_rolled_back(connect):
+    async def scenario():
+        pool = AsyncConnectionPool(size=1, max_overflow=1, connect=connect)
+        a = await pool.acquire()
+        b = await pool.acquire()
+        a.in_transaction = True
+        await pool.release(a)
+        await pool.release(b)
+        return pool, a, b
+
+    pool, a, b = run(scenario())
+    a.rollback.assert_awaited_once()
+    a.close.assert_not_awaited()
+    b.close.assert_awaited_once()
+    assert pool.stats()["idle"] == 1
+
+
+def test_dead_connection_replaced_on_pre_ping(connect):
+    async def scenario():
+        pool = AsyncConnectionPool(size=1, max_overflow=0, pre_ping=True, connect=connect)
+        first = await pool.acquire()
+        await pool.release(first)
+        first.is_connected.return_value = False
+        return pool, first, await pool.acquire()
+
+    pool, first, second = run(scenario())
+    assert second is not first
+    assert pool.stats()["discarded"] == 1
+
+
+def test_failed_connect_frees_slot():
+    connect = AsyncMock(side_effect=[OSError("refused"), make_raw()])
+
+    async def scenario():
+        pool = AsyncConnectionPool(size=1, max_overflow=0, timeout=0.05, connect=connect)
+        with pytest.raises(OSError):
+            await pool.acquire()
+        return await pool.acquire()
+
+    assert run(scenario()) is not None
+
+
+def test_fetch_helpers_use_the_loop_pool(connect):
+    async def scenario():
+        with patch.object(async_db, "AsyncConnectionPool", lambda: AsyncConnectionPool(connect=connect)), \
+             patch.object(async_db, "mysql_aio", MagicMock()):
+            rows = await async_db.fetch_all("SELECT 1")
+            row = await async_db.fetch_one("SELECT image FROM p WHERE id = %s", (3,), dictionary=False)
+            pool = async_db.get_async_pool()
+            await async_db.close_async_pool()
+            return rows, row, pool
+
+    rows, row, pool = run(scenario())
+    assert rows == [{"id": 1}]
+    assert row == (b"png",)
+    assert connect.await_count == 1
+    assert pool.stats()["idle"] == 0
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import db.changes as changes_db
+from config.config import TABLE_NAME, TOMBSTONES_TABLE
+
+NOW = datetime(2025, 3, 1, 12, 0, 0, 500000)
+
+
+@pytest.fixture
+def cursor():
+    with patch("db.changes.get_db_connection") as get_conn:
+        conn = MagicMock()
+        cursor = MagicMock()
+        conn.cursor.return_value = cursor
+        get_conn.return_value = conn
+        cursor.fetchone.return_value = {"now": NOW}
+        yield cursor
+
+
+def test_without_token_only_a_token_comes_back(cursor):
+    result = changes_db.read_changes()
+    assert result == {"token": NOW.isoformat(), "full": True}
+    assert cursor.execute.call_count == 1
+
+
+def test_expired_token_forces_full_reload(cursor):
+    old = NOW - timedelta(days=changes_db.TOMBSTONE_RETENTION_DAYS + 1)
+    result = changes_db.read_changes(since=old.isoformat())
+    assert result["full"] is True
+    assert "transactions" not in result
+
+
+def test_delta_reads_updated_rows_and_tombstones(cursor):
+    since = NOW - timedelta(minutes=5)
+    cursor.fetchall.side_effect = [
+        [{"id": 7, "description": "Wax"}],
+        [{"row_id": 3}],
+    ]
+
+    result = changes_db.read_changes(since=since.isoformat(), names=["transactions"])
+
+    assert result == {
+        "token": NOW.isoformat(),
+        "full": False,
+        "transactions": {"upserts": [{"id": 7, "description": "Wax"}], "deleted": [3]}
+    }
+    rows_sql, rows_params = cursor.execute.call_args_list[1][0]
+    assert f"FROM {TABLE_NAME} WHERE updated_at > %s" in rows_sql
+    # Reads start a little before the token to catch late commits
+    assert rows_params == (since - timedelta(seconds=changes_db.TOKEN_OVERLAP_S),)
+    tomb_sql, tomb_params = cursor.execute.call_args_list[2][0]
+    assert TOMBSTONES_TABLE in tomb_sql
+    assert tomb_params[0] == TABLE_NAME
+
+
+def test_bad_input_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        changes_db.read_changes(since="yesterday")
+    with pytest.raises(ValueError):
+        changes_db.read_changes(names=["suppliers"])
+
+
+def test_table_versions_one_query_for_all_tables(cursor):
+    cursor.fetchall.return_value = [
+        {"name": "products", "row_count": 4, "last_update": NOW},
+        {"name": "materials", "row_count": 0, "last_update": None},
+    ]
+
+    versions = changes_db.table_versions(["products", "materials"])
+
+    assert versions == {"products": f"4:{NOW}", "materials": "0:"}
+    sql, params = cursor.execute.call_args[0]
+    assert "COUNT(*)" in sql and "MAX(updated_at)" in sql and "UNION ALL" in sql
+    assert params == ["products", "materials"]
+
+
+def test_record_deletes_writes_tombstones():
+    cursor = MagicMock()
+    changes_db.record_deletes(cursor, "materials", [4, 5])
+
+    sql, rows = cursor.executemany.call_args[0]
+    assert f"INSERT INTO {TOMBSTONES_TABLE}" in sql
+    assert rows == [("materials", 4), ("materials", 5)]
+    # Expired tombstones are pruned in the same transaction
+    assert "DELETE FROM" in cursor.execute.call_args[0][0]
+
+
+def test_delete_transaction_leaves_tombstone():
+    with patch("db.transactions.get_db_connection") as get_conn, \
+         patch("db.transactions.record_deletes") as record:
+        conn = get_conn.return_value
+        cursor = conn.cursor.return_value
+        cursor.rowcount = 1
+        import db.transactions as transactions_db
+        transactions_db.delete_transaction(9, table=TABLE_NAME)
+
+    record.assert_called_once_with(cursor, TABLE_NAME, [9])
+    conn.commit.assert_called_once()
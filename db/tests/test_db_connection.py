@@ -0,0 +1,142 @@
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from mysql.connector.errors import PoolError
+from db.db_connection import ConnectionPool, PooledConnection, db_connection
+
+
+def make_raw():
+    raw = MagicMock()
+    raw.in_transaction = False
+    raw.is_connected.return_value = True
+    return raw
+
+
+@pytest.fixture
+def connect():
+    return MagicMock(side_effect=lambda: make_raw())
+
+
+def test_connection_is_reused_after_close(connect):
+    """Closing a pooled connection returns it for the next checkout"""
+    pool = ConnectionPool(size=2, max_overflow=0, connect=connect)
+
+    conn = pool.acquire()
+    raw = conn._raw
+    conn.close()
+
+    conn2 = pool.acquire()
+    assert conn2._raw is raw
+    assert connect.call_count == 1
+    assert pool.stats()["reused"] == 1
+
+
+def test_close_is_idempotent(connect):
+    pool = ConnectionPool(size=1, max_overflow=0, connect=connect)
+    conn = pool.acquire()
+    conn.close()
+    conn.close()
+    assert pool.stats()["checked_out"] == 0
+    assert pool.stats()["idle"] == 1
+
+
+def test_proxy_forwards_attributes(connect):
+    pool = ConnectionPool(size=1, max_overflow=0, connect=connect)
+    conn = pool.acquire()
+    assert isinstance(conn, PooledConnection)
+    conn.cursor(dictionary=True)
+    conn._raw.cursor.assert_called_once_with(dictionary=True)
+    conn.close()
+    with pytest.raises(PoolError):
+        conn.cursor()
+
+
+def test_overflow_connections_are_closed_on_release(connect):
+    pool = ConnectionPool(size=1, max_overflow=1, connect=connect)
+    c1 = pool.acquire()
+    c2 = pool.acquire()
+    raw2 = c2._raw
+    c1.close()
+    c2.close()
+
+    raw2.close.assert_called_once()
+    stats = pool.stats()
+    assert stats["idle"] == 1
+    assert stats["created"] == 2
+
+
+def test_exhausted_pool_times_out(connect):
+    pool = ConnectionPool(size=1, max_overflow=0, timeout=0.05, connect=connect)
+    pool.acquire()
+    with pytest.raises(PoolError):
+        pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiter_gets_released_connection(connect):
+    pool = ConnectionPool(size=1, max_overflow=0, timeout=2, connect=connect)
+    conn = pool.acquire()
+    got = []
+
+    t = threading.Thread(target=lambda: got.append(pool.acquire()))
+    t.start()
+    conn.close()
+    t.join(timeout=2)
+
+    assert len(got) == 1
+    assert connect.call_count == 1
+
+
+def test_open_transaction_rolled_back_on_release(connect):
+    pool = ConnectionPool(size=1, max_overflow=0, connect=connect)
+    conn = pool.acquire()
+    raw = conn._raw
+    raw.in_transaction = True
+    conn.close()
+    raw.rollback.assert_called_once()
+
+
+def test_dead_connection_replaced_on_pre_ping(connect):
+    pool = ConnectionPool(size=1, max_overflow=0, pre_ping=True, connect=connect)
+    conn = pool.acquire()
+    raw = conn._raw
+    conn.close()
+    raw.is_connected.return_value = False
+
+    conn2 = pool.acquire()
+    assert conn2._raw is not raw
+    assert pool.stats()["discarded"] == 1
+
+
+def test_idle_connection_recycled(connect):
+    pool = ConnectionPool(size=1, max_overflow=0, recycle_seconds=10, connect=connect)
+    with patch("db.db_connection.time.monotonic", return_value=100.0):
+        conn = pool.acquire()
+        raw = conn._raw
+        conn.close()
+    with patch("db.db_connection.time.monotonic", return_value=200.0):
+        conn2 = pool.acquire()
+
+    assert conn2._raw is not raw
+    raw.close.assert_called_once()
+    assert pool.stats()["recycled"] == 1
+
+
+def test_failed_connect_frees_slot():
+    connect = MagicMock(side_effect=Exception("Access denied"))
+    pool = ConnectionPool(size=1, max_overflow=0, connect=connect)
+    with pytest.raises(Exception):
+        pool.acquire()
+    assert pool.stats()["checked_out"] == 0
+
+
+def test_db_connection_context_manager_rolls_back(connect):
+    pool = ConnectionPool(size=1, max_overflow=0, connect=connect)
+    with patch("db.db_connection.get_pool", return_value=pool):
+        with pytest.raises(RuntimeError):
+            with db_connection() as conn:
+                raw = conn._raw
+                raise RuntimeError("boom")
+
+    raw.rollback.assert_called()
+    assert pool.stats()["checked_out"] == 0
@@ -4,6 +4,7 @@ import mysql.connector
 import db.products as products_db
 import db.materials as materials_db
 import db.transactions as transactions_db
+import db.inventory as inventory_db
 
 # Test Data
 VALID_PROD_DATA = {
@@ -27,7 +28,8 @@ class TestDBExtended:
     def mock_db_conn(self):
         with patch("db.products.get_db_connection") as mock_conn_prod, \
              patch("db.materials.get_db_connection") as mock_conn_mat, \
-             patch("db.transactions.get_db_connection") as mock_conn_trans:
+             patch("db.transactions.get_db_connection") as mock_conn_trans, \
+             patch("db.inventory.get_db_connection") as mock_conn_inv:
             
             # Create a shared mock connection
             mock_real_conn = MagicMock()
@@ -38,6 +40,7 @@ class TestDBExtended:
             mock_conn_prod.return_value = mock_real_conn
             mock_conn_mat.return_value = mock_real_conn
             mock_conn_trans.return_value = mock_real_conn
+            mock_conn_inv.return_value = mock_real_conn
             
             yield mock_real_conn, mock_cursor
 
@@ -78,6 +81,22 @@ class TestDBExtended:
         assert len(prods) == 1
         assert prods[0]["title"] == "C1"
 
+    def test_get_products_projection_skips_blob(self, mock_db_conn):
+        """Projected listing selects only the requested columns"""
+        conn, cursor = mock_db_conn
+        cursor.fetchall.return_value = []
+        products_db.get_products(columns=products_db.PRODUCT_LIST_COLUMNS)
+        sql = cursor.execute.call_args[0][0]
+        assert sql.startswith("SELECT id, title, sku")
+        assert "*" not in sql
+        assert "image" not in sql
+
+    def test_get_products_projection_rejects_blob_and_unknown(self, mock_db_conn):
+        with pytest.raises(ValueError):
+            products_db.get_products(columns=["title", "image"])
+        with pytest.raises(ValueError):
+            products_db.get_products(columns=["title; DROP TABLE x"])
+
     def test_delete_product(self, mock_db_conn):
         """4. Test delete product"""
         conn, cursor = mock_db_conn
@@ -171,6 +190,241 @@ class TestDBExtended:
         with pytest.raises(ValueError):
             transactions_db.read_transactions(table="invalid_table")
 
+    def test_read_transactions_page_keyset(self, mock_db_conn):
+        """Page query seeks past the cursor instead of using OFFSET"""
+        import datetime
+        conn, cursor = mock_db_conn
+        cursor.fetchall.return_value = [
+            {"id": 9, "transaction_date": datetime.date(2025, 1, 3)},
+            {"id": 8, "transaction_date": datetime.date(2025, 1, 2)},
+            {"id": 7, "transaction_date": datetime.date(2025, 1, 1)},
+        ]
+        rows, next_cursor = transactions_db.read_transactions_page(
+            table="transactions_test", limit=2, after="2025-01-04:10", transaction_type="income"
+        )
+        assert [r["id"] for r in rows] == [9, 8]
+        assert next_cursor == "2025-01-02:8"
+        sql, params = cursor.execute.call_args[0]
+        assert "OFFSET" not in sql
+        assert "ORDER BY transaction_date DESC, id DESC" in sql
+        assert "id < %s" in sql
+        assert params == ("income", "2025-01-04", "2025-01-04", 10, 3)
+
+    def test_read_transactions_page_last_page(self, mock_db_conn):
+        conn, cursor = mock_db_conn
+        cursor.fetchall.return_value = [{"id": 1, "transaction_date": "2025-01-01"}]
+        rows, next_cursor = transactions_db.read_transactions_page(
+            table="transactions_test", limit=5, q="wax", sort="date"
+        )
+        assert next_cursor is None
+        sql, params = cursor.execute.call_args[0]
+        assert "ORDER BY transaction_date ASC, id ASC" in sql
+        assert params[:2] == ("%wax%", "%wax%")
+
+    def test_read_transactions_page_invalid_input(self, mock_db_conn):
+        with pytest.raises(ValueError):
+            transactions_db.read_transactions_page(table="transactions_test", sort="price")
+        with pytest.raises(ValueError):
+            transactions_db.read_transactions_page(table="transactions_test", after="garbage")
+
+    def test_summarize_transactions_groups_by_type(self, mock_db_conn):
+        """Summary is a single GROUP BY query"""
+        conn, cursor = mock_db_conn
+        cursor.fetchall.return_value = [{"transaction_type": "income", "total": 10, "units": 1, "count": 1}]
+        rows = transactions_db.summarize_transactions(table="transactions_test")
+        assert rows[0]["transaction_type"] == "income"
+        sql = cursor.execute.call_args[0][0]
+        assert "GROUP BY transaction_type" in sql
+        assert "WHERE" not in sql
+        assert conn.close.called
+
+    def test_summarize_transactions_quarter_range(self, mock_db_conn):
+        """Quarter filter becomes a sargable date range"""
+        conn, cursor = mock_db_conn
+        cursor.fetchall.return_value = []
+        transactions_db.summarize_transactions(table="transactions_test", year=2025, quarter=4, date_from="2025-11-01")
+        sql, params = cursor.execute.call_args[0]
+        assert "transaction_date >= %s AND transaction_date < %s" in sql
+        assert params == ("2025-11-01", "2025-10-01", "2026-01-01")
+
+    def test_summarize_transactions_month_requires_year(self, mock_db_conn):
+        with pytest.raises(ValueError):
+            transactions_db.summarize_transactions(table="transactions_test", month=3)
+
+    def test_write_transactions_bulk_single_commit(self, mock_db_conn):
+        """Bulk insert returns each row's own id and commits once"""
+        conn, cursor = mock_db_conn
+        new_ids = iter([3, 9, 4])
+
+        def execute(sql, params):
+            cursor.lastrowid = next(new_ids)
+        cursor.execute.side_effect = execute
+        rows = [
+            {"transaction_date": "2025-01-01", "description": f"T{i}", "quantity": 1,
+             "price": 2.0, "transaction_type": "income"}
+            for i in range(3)
+        ]
+        ids = transactions_db.write_transactions_bulk(rows, table="transactions_test")
+        assert ids == [3, 9, 4]
+        sql, params = cursor.execute.call_args_list[0][0]
+        assert "INSERT INTO transactions_test" in sql
+        assert params == ("2025-01-01", "T0", 1, 2.0, None, "income", None)
+        conn.commit.assert_called_once()
+
+    def test_write_transactions_bulk_rolls_back(self, mock_db_conn):
+        conn, cursor = mock_db_conn
+        cursor.execute.side_effect = mysql.connector.Error("Data too long")
+        with pytest.raises(mysql.connector.Error):
+            transactions_db.write_transactions_bulk(
+                [{"transaction_date": "2025-01-01", "description": "x", "quantity": 1,
+                  "price": 1.0, "transaction_type": "income"}],
+                table="transactions_test"
+            )
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+    def test_affects_stock_only_for_product_sales(self):
+        sale = {"transaction_type": "Income", "product_id": 4, "quantity": 1}
+        assert inventory_db.affects_stock([{"transaction_type": "expense", "product_id": 4, "quantity": 1}, sale])
+        assert not inventory_db.affects_stock([{"transaction_type": "income", "product_id": None, "quantity": 1}])
+
+    def test_post_transactions_single_connection_and_commit(self, mock_db_conn):
+        """Insert, product and BOM deductions share one connection and one commit"""
+        conn, cursor = mock_db_conn
+        new_ids = iter([40, 44, 41])
+
+        def execute(sql, params):
+            if "INSERT INTO" in sql:
+                cursor.lastrowid = next(new_ids)
+        cursor.execute.side_effect = execute
+        cursor.fetchall.side_effect = [
+            [(2, 300.0), (3, 3)],
+            [(7, 5)],
+            [(2, "Soy", 900.0), (3, "Jar", 11)],
+        ]
+        rows = [
+            {"transaction_date": "2025-01-01", "description": "Sale", "quantity": 2,
+             "price": 20.0, "transaction_type": "Income", "product_id": 7},
+            {"transaction_date": "2025-01-01", "description": "Sale", "quantity": 1,
+             "price": 20.0, "transaction_type": "income", "product_id": 7},
+            {"transaction_date": "2025-01-02", "description": "Wax", "quantity": 1,
+             "price": 9.0, "transaction_type": "expense", "product_id": 7},
+        ]
+
+        result = inventory_db.post_transactions(
+            rows, table="transactions_test", products_table="products_test", materials_table="materials_test"
+        )
+
+        # Ids come from each row's own INSERT, never assumed consecutive
+        assert result["ids"] == [40, 44, 41]
+        assert result["products"] == [{"id": 7, "stock_quantity": 5}]
+        assert result["materials"][0] == {"id": 2, "name": "Soy", "stock_quantity": 900.0}
+        cursor.executemany.assert_not_called()
+        calls = cursor.execute.call_args_list[3:]
+        statements = [c[0][0] for c in calls]
+        assert "UPDATE products_test p JOIN" in statements[0]
+        # Sales of the same product are summed; expenses deduct nothing
+        assert calls[0][0][1] == [7, 3]
+        # Each material name resolves to its first row, which alone is deducted
+        assert "MIN(m.id)" in statements[1] and "GROUP BY name" in statements[1]
+        assert "UPDATE materials_test m JOIN" in statements[2]
+        assert "ON m.id = u.id" in statements[2]
+        assert calls[2][0][1] == [2, 300.0, 3, 3]
+        assert calls[4][0][1] == [2, 3]
+        conn.commit.assert_called_once()
+        conn.rollback.assert_not_called()
+
+    def test_post_transactions_skips_materials_without_stock_rows(self, mock_db_conn):
+        conn, cursor = mock_db_conn
+        cursor.lastrowid = 5
+        cursor.fetchall.side_effect = [[], [(7, 4)]]
+        result = inventory_db.post_transactions(
+            [{"transaction_date": "2025-01-01", "description": "Sale", "quantity": 1,
+              "price": 20.0, "transaction_type": "income", "product_id": 7}],
+            table="transactions_test", products_table="products_test", materials_table="materials_test"
+        )
+        assert result == {"ids": [5], "products": [{"id": 7, "stock_quantity": 4}], "materials": []}
+        statements = [c[0][0] for c in cursor.execute.call_args_list]
+        assert not any("UPDATE materials_test" in s for s in statements)
+        conn.commit.assert_called_once()
+
+    def test_post_transactions_without_sales_skips_stock(self, mock_db_conn):
+        conn, cursor = mock_db_conn
+        cursor.lastrowid = 3
+        result = inventory_db.post_transactions(
+            [{"transaction_date": "2025-01-01", "description": "Wax", "quantity": 1,
+              "price": 9.0, "transaction_type": "expense"}],
+            table="transactions_test"
+        )
+        assert result == {"ids": [3], "products": [], "materials": []}
+        cursor.execute.assert_called_once()
+        assert "INSERT INTO transactions_test" in cursor.execute.call_args[0][0]
+        conn.commit.assert_called_once()
+
+    def test_post_transactions_rolls_back_everything(self, mock_db_conn):
+        conn, cursor = mock_db_conn
+        cursor.lastrowid = 1
+        cursor.execute.side_effect = mysql.connector.Error("Lock wait timeout")
+        with pytest.raises(mysql.connector.Error):
+            inventory_db.post_transactions(
+                [{"transaction_date": "2025-01-01", "description": "Sale", "quantity": 1,
+                  "price": 1.0, "transaction_type": "income", "product_id": 2}],
+                table="transactions_test"
+            )
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+    def test_post_transactions_rejects_unknown_table(self, mock_db_conn):
+        with pytest.raises(ValueError):
+            inventory_db.post_transactions([{}], table="users")
+
+    def test_create_products_bulk_returns_ids_in_order(self, mock_db_conn):
+        """Ids come from each row's own INSERT, never assumed consecutive"""
+        conn, cursor = mock_db_conn
+        new_ids = iter([10, 14, 12])
+
+        def execute(sql, params):
+            cursor.lastrowid = next(new_ids)
+        cursor.execute.side_effect = execute
+
+        ids = products_db.create_products_bulk([
+            {"title": "A", "sku": "A1"},
+            {"title": "B", "sku": "B1", "image": b"img"},
+            {"title": "C", "sku": "C1", "bogus": 1},
+        ])
+
+        assert ids == [10, 14, 12]
+        assert cursor.execute.call_count == 3
+        assert "image" in cursor.execute.call_args_list[1][0][0]
+        conn.commit.assert_called_once()
+
+    def test_add_product_images_bulk_chunks_by_size(self, mock_db_conn):
+        conn, cursor = mock_db_conn
+        with patch.object(products_db, "BULK_IMAGE_CHUNK_BYTES", 10):
+            count = products_db.add_product_images_bulk([(1, b"x" * 6, 1), (1, b"y" * 6, 2), (2, b"z", 1)])
+        assert count == 3
+        batches = [c[0][1] for c in cursor.executemany.call_args_list]
+        assert [len(b) for b in batches] == [2, 1]
+        conn.commit.assert_called_once()
+
+    def test_product_exists_single_indexed_query(self, mock_db_conn):
+        conn, cursor = mock_db_conn
+        cursor.fetchone.return_value = (1,)
+        assert products_db.product_exists("  Rose Candle ", "RC-1") is True
+        assert cursor.execute.call_count == 1
+        sql, params = cursor.execute.call_args[0]
+        assert "title_normalized = %s" in sql
+        assert "LOWER" not in sql
+        assert params == ("RC-1", "rose candle")
+
+    def test_get_existing_product_keys(self, mock_db_conn):
+        conn, cursor = mock_db_conn
+        cursor.fetchall.return_value = [("rose candle", "RC-1"), ("cedar", None)]
+        titles, skus = products_db.get_existing_product_keys()
+        assert titles == {"rose candle", "cedar"}
+        assert skus == {"RC-1"}
+        assert cursor.execute.call_count == 1
+
     def test_connection_close(self, mock_db_conn):
         """21. Verify connection close called"""
         conn, cursor = mock_db_conn
@@ -42,3 +42,75 @@ def test_init_db_table_missing():
         assert "col1 INT" in create_query
         
         mock_conn.return_value.commit.assert_called_once()
+
+def test_parse_index_key():
+    from db.init_db import parse_index_key
+    assert parse_index_key("INDEX idx_sku") == ("idx_sku", False)
+    assert parse_index_key("UNIQUE INDEX uq_sku") == ("uq_sku", True)
+    assert parse_index_key("FOREIGN KEY (product_id)") is None
+    assert parse_index_key("sku") is None
+
+def test_generate_create_table_sql_includes_indexes():
+    schema = {
+        "id": "INT PRIMARY KEY",
+        "product_id": "INT",
+        "INDEX idx_product": "(product_id, id)"
+    }
+    sql = generate_create_table_sql("images", schema)
+    assert "INDEX idx_product (product_id, id)" in sql
+
+def _existing_table_cursor(mock_conn, columns, index_rows):
+    mock_cursor = mock_conn.return_value.cursor.return_value
+    mock_cursor.fetchone.return_value = {"Tables_in_db": "tbl"}
+    mock_cursor.fetchall.side_effect = [
+        [{"Field": c} for c in columns],
+        index_rows
+    ]
+    return mock_cursor
+
+def test_existing_table_creates_missing_and_changed_indexes():
+    """Indexes are diffed by name and key parts; index keys are never added as columns"""
+    schema = {
+        "id": "INT PRIMARY KEY",
+        "sku": "VARCHAR(50)",
+        "title": "VARCHAR(255)",
+        "transaction_date": "DATE",
+        "INDEX idx_sku": "(sku)",
+        "INDEX idx_date": "(transaction_date, id)",
+        "INDEX idx_title_lower": "((LOWER(title)))",
+        "UNIQUE INDEX uq_title": "(title)"
+    }
+    index_rows = [
+        {"Key_name": "PRIMARY", "Seq_in_index": 1, "Column_name": "id", "Non_unique": 0},
+        # Up to date
+        {"Key_name": "idx_sku", "Seq_in_index": 1, "Column_name": "sku", "Non_unique": 1},
+        # Declared as composite now
+        {"Key_name": "idx_date", "Seq_in_index": 1, "Column_name": "transaction_date", "Non_unique": 1},
+        # Functional index, already there
+        {"Key_name": "idx_title_lower", "Seq_in_index": 1, "Column_name": None,
+         "Expression": "lower(`title`)", "Non_unique": 1},
+    ]
+    with patch("db.init_db.get_db_connection") as mock_conn:
+        mock_cursor = _existing_table_cursor(mock_conn, ["id", "sku", "title", "transaction_date"], index_rows)
+        assert create_table("tbl", schema) is True
+
+    statements = [c[0][0] for c in mock_cursor.execute.call_args_list]
+    assert not any("ADD COLUMN" in s for s in statements)
+    assert "DROP INDEX idx_date ON tbl" in statements
+    assert "CREATE INDEX idx_date ON tbl (transaction_date, id)" in statements
+    assert "CREATE UNIQUE INDEX uq_title ON tbl (title)" in statements
+    assert not any("idx_sku ON" in s for s in statements)
+    assert not any("idx_title_lower ON" in s for s in statements)
+
+def test_existing_table_index_failure_is_reported_not_raised(capsys):
+    schema = {"id": "INT PRIMARY KEY", "INDEX idx_missing": "(nope)"}
+    with patch("db.init_db.get_db_connection") as mock_conn:
+        mock_cursor = _existing_table_cursor(mock_conn, ["id"], [])
+        def execute(sql, *args):
+            if sql.startswith("CREATE INDEX"):
+                raise Exception("Key column 'nope' doesn't exist")
+        mock_cursor.execute.side_effect = execute
+        ok = create_table("tbl", schema)
+
+    assert "Failed to create index 'idx_missing'" in capsys.readouterr().out
+    assert ok is False
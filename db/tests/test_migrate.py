@@ -0,0 +1,155 @@
+import pytest
+from unittest.mock import MagicMock, patch, DEFAULT
+import mysql.connector
+import db.migrate as migrate_db
+
+
+@pytest.fixture
+def mock_conn():
+    with patch("db.migrate.get_db_connection") as get_conn, \
+         patch("db.migrate.create_table") as create_table:
+        conn = MagicMock()
+        cursor = MagicMock()
+        conn.cursor.return_value = cursor
+        get_conn.return_value = conn
+        cursor.lock_result = [(1,)]
+        # GET_LOCK answers with lock_result; every other read with fetchall.return_value
+        cursor.fetchall.side_effect = lambda: (
+            cursor.lock_result if cursor.execute.call_args[0][0].startswith("SELECT GET_LOCK") else DEFAULT
+        )
+        create_table.return_value = True
+        yield conn, cursor, create_table
+
+
+def _statements(cursor):
+    return [c[0][0] for c in cursor.execute.call_args_list]
+
+
+def test_fast_path_is_a_single_query(mock_conn):
+    conn, cursor, create_table = mock_conn
+    applied = [(v, None) for v, _, _ in migrate_db.MIGRATIONS]
+    applied.append((migrate_db.SCHEMA_SYNC_VERSION, migrate_db.schema_fingerprint()))
+    cursor.fetchall.return_value = applied
+
+    assert migrate_db.migrate() == []
+
+    assert cursor.execute.call_count == 1
+    assert "SELECT version, checksum FROM schema_migrations" in _statements(cursor)[0]
+    create_table.assert_not_called()
+    conn.commit.assert_not_called()
+    conn.close.assert_called_once()
+
+
+def test_fresh_database_runs_everything(mock_conn):
+    conn, cursor, create_table = mock_conn
+
+    def execute(sql, params=None):
+        if sql.startswith("SELECT version"):
+            raise mysql.connector.ProgrammingError("Table 'schema_migrations' doesn't exist")
+    cursor.execute.side_effect = execute
+    cursor.fetchall.return_value = []
+
+    ran = migrate_db.migrate()
+
+    assert ran == [name for _, name, _ in migrate_db.MIGRATIONS] + ["declared_schema"]
+    statements = _statements(cursor)
+    assert any("CREATE TABLE IF NOT EXISTS schema_migrations" in s for s in statements)
+    assert any(s.startswith("SELECT GET_LOCK") for s in statements)
+    assert statements[-1].startswith("SELECT RELEASE_LOCK")
+    assert [c[0][0] for c in create_table.call_args_list] == [t for t, _ in migrate_db.declared_tables()]
+    # The sync row stores the schema fingerprint
+    sync_params = [c[0][1] for c in cursor.execute.call_args_list if c[0][0].startswith("REPLACE INTO")][-1]
+    assert sync_params == (migrate_db.SCHEMA_SYNC_VERSION, "declared_schema", migrate_db.schema_fingerprint())
+
+
+def test_changed_schema_only_resyncs(mock_conn):
+    conn, cursor, create_table = mock_conn
+    applied = [(v, None) for v, _, _ in migrate_db.MIGRATIONS]
+    applied.append((migrate_db.SCHEMA_SYNC_VERSION, "stale-fingerprint"))
+    cursor.fetchall.return_value = applied
+
+    assert migrate_db.migrate() == ["declared_schema"]
+    assert create_table.call_count == len(migrate_db.declared_tables())
+
+
+def test_pending_migrations_run_in_version_order(mock_conn, monkeypatch):
+    conn, cursor, create_table = mock_conn
+    order = []
+    monkeypatch.setattr(migrate_db, "MIGRATIONS", [
+        (1, "first", lambda c: order.append(1)),
+        (2, "second", lambda c: order.append(2)),
+        (3, "third", lambda c: order.append(3)),
+    ])
+    cursor.fetchall.return_value = [(1, None), (migrate_db.SCHEMA_SYNC_VERSION, migrate_db.schema_fingerprint())]
+
+    ran = migrate_db.migrate()
+
+    assert order == [2, 3]
+    assert ran == ["second", "third", "declared_schema"]
+
+
+def test_failed_migration_rolls_back_and_releases_lock(mock_conn, monkeypatch):
+    conn, cursor, create_table = mock_conn
+
+    def broken(c):
+        raise mysql.connector.Error("Duplicate column name")
+    monkeypatch.setattr(migrate_db, "MIGRATIONS", [(1, "broken", broken)])
+    cursor.fetchall.return_value = []
+
+    with pytest.raises(mysql.connector.Error):
+        migrate_db.migrate()
+
+    assert _statements(cursor)[-1].startswith("SELECT RELEASE_LOCK")
+    conn.rollback.assert_called_once()
+    create_table.assert_not_called()
+
+
+def test_fingerprint_tracks_schema_changes():
+    tables = [("products", {"id": "INT"})]
+    changed = [("products", {"id": "INT", "INDEX idx_sku": "(sku)"})]
+    assert migrate_db.schema_fingerprint(tables) == migrate_db.schema_fingerprint([("products", {"id": "INT"})])
+    assert migrate_db.schema_fingerprint(tables) != migrate_db.schema_fingerprint(changed)
+
+
+def test_migration_status_reports_pending(mock_conn):
+    conn, cursor, create_table = mock_conn
+    cursor.fetchall.return_value = [(migrate_db.SCHEMA_SYNC_VERSION, migrate_db.schema_fingerprint())]
+
+    status = migrate_db.migration_status()
+
+    assert status == {
+        "up_to_date": False,
+        "pending": [name for _, name, _ in migrate_db.MIGRATIONS],
+        "schema_synced": True
+    }
+    assert cursor.execute.call_count == 1
+    conn.close.assert_called_once()
+
+
+def test_failed_table_sync_is_not_recorded(mock_conn):
+    conn, cursor, create_table = mock_conn
+    applied = [(v, None) for v, _, _ in migrate_db.MIGRATIONS]
+    applied.append((migrate_db.SCHEMA_SYNC_VERSION, "stale-fingerprint"))
+    cursor.fetchall.return_value = applied
+    create_table.side_effect = lambda table, schema: table != migrate_db.declared_tables()[1][0]
+
+    with pytest.raises(RuntimeError, match="Schema sync failed"):
+        migrate_db.migrate()
+
+    # Every table was still attempted, but the fingerprint stays stale
+    assert create_table.call_count == len(migrate_db.declared_tables())
+    assert not any(s.startswith("REPLACE INTO") for s in _statements(cursor))
+    assert _statements(cursor)[-1].startswith("SELECT RELEASE_LOCK")
+
+
+def test_lock_not_granted_fails_without_changes(mock_conn):
+    conn, cursor, create_table = mock_conn
+    cursor.fetchall.return_value = []
+    cursor.lock_result = [(0,)]
+
+    with pytest.raises(RuntimeError, match="lock"):
+        migrate_db.migrate()
+
+    statements = _statements(cursor)
+    assert not any("CREATE TABLE" in s or s.startswith("SELECT RELEASE_LOCK") for s in statements)
+    create_table.assert_not_called()
@@ -1,4 +1,5 @@
 from db.db_connection import get_db_connection
+from db.changes import record_deletes
 from config.config import TABLE_NAME
 
 ALLOWED_TABLES = {"transactions", "transactions_test"}
@@ -43,16 +44,81 @@ def write_transaction(
         conn.close()
 
 
-def read_transactions(table=TABLE_NAME):
+def insert_sql(table):
+    return f"""
+            INSERT INTO {table}
+            (transaction_date, description, quantity, price, supplier, transaction_type, product_id)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """
+
+
+def transaction_row(t):
+    """INSERT parameters for a transaction dict, in insert_sql column order."""
+    return (
+        t["transaction_date"],
+        t["description"],
+        t["quantity"],
+        t["price"],
+        t.get("supplier"),
+        t["transaction_type"],
+        t.get("product_id")
+    )
+
+
+def insert_transactions(cursor, transactions, table=TABLE_NAME):
+    """
+    INSERT transactions on the caller's cursor without committing.
+
+    One statement per row rather than executemany: callers need every new
+    id (change events, stock posting), and a multi-row INSERT is not
+    guaranteed consecutive ids under innodb_autoinc_lock_mode=2.
+
+    Returns:
+        list[int]: new ids, in input order.
+    """
+    query = insert_sql(table)
+    ids = []
+    for t in transactions:
+        cursor.execute(query, transaction_row(t))
+        ids.append(cursor.lastrowid)
+    return ids
+
+
+def write_transactions_bulk(transactions, table=TABLE_NAME):
+    """
+    Insert many transactions on one connection in a single commit.
+
+    Args:
+        transactions: iterable of dicts with transaction_date, description,
+            quantity, price, transaction_type and optional supplier/product_id.
+
+    Returns:
+        list[int]: new ids, in input order. Nothing is written if any row fails.
+    """
     if table not in ALLOWED_TABLES:
         raise ValueError("Invalid table name")
 
+    transactions = list(transactions)
+    if not transactions:
+        return []
+
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor()
 
     try:
-        cursor.execute(f"""
-            SELECT
+        ids = insert_transactions(cursor, transactions, table)
+        conn.commit()
+        return ids
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# Columns returned by the transaction list reads
+READ_COLUMNS = """
                 id,
                 transaction_date,
                 description,
@@ -62,10 +128,261 @@ def read_transactions(table=TABLE_NAME):
                 transaction_type,
                 supplier,
                 product_id,
-                created_at
+                created_at"""
+
+
+def read_transactions_sql(table=TABLE_NAME):
+    if table not in ALLOWED_TABLES:
+        raise ValueError("Invalid table name")
+    return f"""
+            SELECT{READ_COLUMNS}
             FROM {table}
             ORDER BY transaction_date DESC
-        """)
+        """
+
+
+def read_transactions(table=TABLE_NAME):
+    sql = read_transactions_sql(table)
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+        cursor.execute(sql)
+        return cursor.fetchall()
+
+    finally:
+        cursor.close()
+        conn.close()
+
+SORT_ORDERS = {"date": "ASC", "-date": "DESC"}
+
+
+def encode_cursor(transaction_date, transaction_id):
+    """Build the opaque keyset cursor for a (transaction_date, id) position."""
+    return f"{transaction_date}:{transaction_id}"
+
+
+def decode_cursor(cursor):
+    """Parse a cursor produced by encode_cursor into (date_str, id)."""
+    try:
+        date_part, id_part = cursor.rsplit(":", 1)
+        return date_part, int(id_part)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def transactions_page_query(
+    table=TABLE_NAME,
+    limit=None,
+    after=None,
+    q=None,
+    transaction_type=None,
+    supplier=None,
+    date_from=None,
+    date_to=None,
+    sort="-date"
+):
+    """(sql, params) for read_transactions_page; validates every argument."""
+    if table not in ALLOWED_TABLES:
+        raise ValueError("Invalid table name")
+    if sort not in SORT_ORDERS:
+        raise ValueError(f"Invalid sort: {sort!r}")
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be positive")
+
+    direction = SORT_ORDERS[sort]
+    conditions = []
+    params = []
+
+    if q:
+        conditions.append("(description LIKE %s OR supplier LIKE %s)")
+        pattern = f"%{q}%"
+        params.extend([pattern, pattern])
+    if transaction_type:
+        conditions.append("transaction_type = %s")
+        params.append(transaction_type)
+    if supplier:
+        conditions.append("supplier = %s")
+        params.append(supplier)
+    if date_from:
+        conditions.append("transaction_date >= %s")
+        params.append(date_from)
+    if date_to:
+        conditions.append("transaction_date <= %s")
+        params.append(date_to)
+    if after:
+        after_date, after_id = decode_cursor(after)
+        op = ">" if direction == "ASC" else "<"
+        conditions.append(
+            f"(transaction_date {op} %s OR (transaction_date = %s AND id {op} %s))"
+        )
+        params.extend([after_date, after_date, after_id])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    limit_sql = ""
+    if limit is not None:
+        # Fetch one extra row to know whether another page exists
+        limit_sql = "LIMIT %s"
+        params.append(limit + 1)
+
+    sql = f"""
+            SELECT{READ_COLUMNS}
+            FROM {table}
+            {where}
+            ORDER BY transaction_date {direction}, id {direction}
+            {limit_sql}
+        """
+    return sql, tuple(params)
+
+
+def split_page(rows, limit):
+    """Trim the extra row fetched by transactions_page_query into (rows, next_cursor)."""
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last['transaction_date'], last['id'])
+    return rows, next_cursor
+
+
+def read_transactions_page(
+    table=TABLE_NAME,
+    limit=None,
+    after=None,
+    q=None,
+    transaction_type=None,
+    supplier=None,
+    date_from=None,
+    date_to=None,
+    sort="-date"
+):
+    """
+    Read a filtered window of transactions using keyset pagination.
+
+    Rows are ordered by (transaction_date, id) so `after` - a cursor from
+    encode_cursor - resumes exactly where the previous page stopped, without
+    an OFFSET scan.
+
+    Returns:
+        tuple(list[dict], str|None): the rows and the cursor for the next page
+        (None when this is the last page).
+    """
+    sql, params = transactions_page_query(
+        table, limit, after, q, transaction_type, supplier, date_from, date_to, sort
+    )
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+    return split_page(rows, limit)
+
+
+def _period_bounds(year=None, month=None, quarter=None):
+    """
+    Translate year/month/quarter filters into a half-open [start, end) date range.
+    Returns (None, None) when no period is requested.
+    """
+    if month is None and quarter is None and year is None:
+        return None, None
+    if year is None:
+        raise ValueError("year is required when filtering by month or quarter")
+    if month is not None and quarter is not None:
+        raise ValueError("Use either month or quarter, not both")
+
+    if month is not None:
+        if not 1 <= month <= 12:
+            raise ValueError("month must be between 1 and 12")
+        start_month, end_month = month, month + 1
+    elif quarter is not None:
+        if not 1 <= quarter <= 4:
+            raise ValueError("quarter must be between 1 and 4")
+        start_month, end_month = (quarter - 1) * 3 + 1, quarter * 3 + 1
+    else:
+        start_month, end_month = 1, 13
+
+    start = f"{year:04d}-{start_month:02d}-01"
+    if end_month > 12:
+        end = f"{year + 1:04d}-01-01"
+    else:
+        end = f"{year:04d}-{end_month:02d}-01"
+    return start, end
+
+
+def summary_query(
+    table=TABLE_NAME,
+    date_from=None,
+    date_to=None,
+    year=None,
+    month=None,
+    quarter=None
+):
+    """(sql, params) for summarize_transactions; validates every argument."""
+    if table not in ALLOWED_TABLES:
+        raise ValueError("Invalid table name")
+
+    conditions = []
+    params = []
+
+    if date_from:
+        conditions.append("transaction_date >= %s")
+        params.append(date_from)
+    if date_to:
+        conditions.append("transaction_date <= %s")
+        params.append(date_to)
+
+    period_start, period_end = _period_bounds(year, month, quarter)
+    if period_start:
+        # Range predicates (not YEAR()/MONTH()) so an index on transaction_date applies
+        conditions.append("transaction_date >= %s AND transaction_date < %s")
+        params.extend([period_start, period_end])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    sql = f"""
+            SELECT
+                transaction_type,
+                COALESCE(SUM(total), 0) AS total,
+                COALESCE(SUM(quantity), 0) AS units,
+                COUNT(*) AS count
+            FROM {table}
+            {where}
+            GROUP BY transaction_type
+        """
+    return sql, tuple(params)
+
+
+def summarize_transactions(
+    table=TABLE_NAME,
+    date_from=None,
+    date_to=None,
+    year=None,
+    month=None,
+    quarter=None
+):
+    """
+    Aggregate totals per transaction type in a single GROUP BY query.
+
+    date_from / date_to are inclusive YYYY-MM-DD bounds; year, month and
+    quarter narrow the range further.
+
+    Returns:
+        list[dict]: one row per type with keys transaction_type, total, units, count
+    """
+    sql, params = summary_query(table, date_from, date_to, year, month, quarter)
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+        cursor.execute(sql, params)
         return cursor.fetchall()
 
     finally:
@@ -75,12 +392,17 @@ def read_transactions(table=TABLE_NAME):
 def delete_transaction(transaction_id, table=TABLE_NAME):
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute(f"DELETE FROM {table} WHERE id=%s", (transaction_id,))
-    conn.commit()
-    cursor.close()
-    conn.close()
-
-    conn.close()
+    try:
+        cursor.execute(f"DELETE FROM {table} WHERE id=%s", (transaction_id,))
+        if cursor.rowcount:
+            record_deletes(cursor, table, [transaction_id])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
 
 
 def update_transaction(
@@ -1,18 +1,29 @@
 from tkinter import messagebox, filedialog
 from services.utils import TransactionUtils
 from services.data_service import DataService
-from gui.models import TransactionModel
+from gui.models import TransactionModel, TransactionStore
 from gui.views import MainWindow, InputFrame, TreeFrame, SummaryFrame
-from gui.charts import AnalyticsFrame
-from gui.tabs.materials_tab import MaterialsTab
-from gui.tabs.products_tab import ProductsTab
-from gui.tabs.shipping_tab import ShippingTab
+from gui.tasks import TaskRunner
+from gui.progress import run_with_progress
+from gui.lazy import LazyClass
+from client.change_listener import ChangeListener
 from config.config import TREE_COLUMNS, TRANSACTION_TYPES, WINDOW_TITLE, FEATURES
 
+# Feature tabs are imported on first use, so disabled features cost nothing
+# at startup (gui.charts alone pulls in matplotlib)
+AnalyticsFrame = LazyClass("gui.charts", "AnalyticsFrame")
+MaterialsTab = LazyClass("gui.tabs.materials_tab", "MaterialsTab")
+ProductsTab = LazyClass("gui.tabs.products_tab", "ProductsTab")
+
+# How often the Tk thread picks up events pushed over /ws/changes
+REMOTE_CHANGES_MS = 250
+
 class TransactionController:
     def __init__(self, table_name):
         self.model = TransactionModel(table_name)
         self.view = MainWindow(WINDOW_TITLE, features=FEATURES)
+        # API calls run off the Tk thread; results come back through after()
+        self.tasks = TaskRunner(self.view, on_busy=self._show_busy)
         
         # --- Tab 1: Transactions ---
         self.input_frame = InputFrame(
@@ -59,12 +70,10 @@ class TransactionController:
             self.shipping_tab = self.view.tab_shipping  # Already constructed in MainWindow
 
         # --- Tab 4: Analytics ---
-        if FEATURES.get("analytics", True):
-            self.analytics_frame = AnalyticsFrame(self.view.tab_analytics)
-            self.analytics_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        else:
+        # Built the first time the tab is shown (see _refresh_charts)
+        self.analytics_frame = None
+        if not FEATURES.get("analytics", True):
             self.view.hide_analytics_tab()
-            self.analytics_frame = None
 
         # UI State
         self.current_search_query = ""
@@ -83,15 +92,44 @@ class TransactionController:
             "total": "total"
         }
 
+        # Loaded transactions; sort/search/mutations work against this store and
+        # only refresh_ui goes back to the server
+        self.store = TransactionStore()
+
+        # Views outside the transactions grid refresh lazily: a change marks
+        # them stale and they reload the next time their tab is shown.
+        self._lazy_views = {}
+        if hasattr(self, 'products_tab'):
+            self._lazy_views["products"] = (self.view.tab_products, self.products_tab.refresh_product_list)
+        if hasattr(self, 'materials_tab'):
+            self._lazy_views["materials"] = (self.view.tab_materials, self.materials_tab.refresh)
+        if hasattr(self, 'shipping_tab'):
+            self._lazy_views["shipping"] = (self.shipping_tab, self.shipping_tab.refresh)
+        if FEATURES.get("analytics", True):
+            self._lazy_views["analytics"] = (self.view.tab_analytics, self._refresh_charts)
+        self._stale_views = set()
+        self.view.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed, add="+")
+
         # Initial Load
         self.refresh_ui()
 
+        # Edits made by other clients arrive as pushed events
+        self.listener = None
+        if FEATURES.get("live_updates", True) and ChangeListener.available():
+            self.listener = ChangeListener()
+            self.listener.start()
+            self.view.after(REMOTE_CHANGES_MS, self._poll_remote_changes)
+
     def run(self):
-        self.view.mainloop()
+        try:
+            self.view.mainloop()
+        finally:
+            if self.listener:
+                self.listener.stop()
 
     def filter_transactions(self, query):
         self.current_search_query = query.lower().strip()
-        self.refresh_ui()
+        self.render_transactions()
 
     def export_csv(self):
         filename = filedialog.asksaveasfilename(
@@ -99,79 +137,191 @@ class TransactionController:
             filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
         )
         if filename:
-            DataService.export_to_csv(filename, self.model.get_all_transactions())
-            messagebox.showinfo("Success", f"Exported to {filename}")
+            def do_export(progress):
+                DataService.export_to_csv(filename, self.model.get_all_transactions(), progress_callback=progress)
+
+            run_with_progress(
+                self.view, "Exporting Transactions", do_export,
+                on_success=lambda _: messagebox.showinfo("Success", f"Exported to {filename}"),
+                on_error=lambda e: messagebox.showerror("Error", f"Export failed: {e}")
+            )
 
     def import_csv(self):
         filename = filedialog.askopenfilename(
             filetypes=[("Data Files", "*.csv;*.xlsx"), ("CSV Files", "*.csv"), ("Excel Files", "*.xlsx"), ("All Files", "*.*")]
         )
         if filename:
-            current_data = self.model.get_all_transactions()
-            # Changed method name to import_data
-            new_items = DataService.import_data(filename, current_data)
-            
-            if not new_items:
-                messagebox.showinfo("Import", "No new transactions found to import.")
-                return
-            
-            # Add new items
-            count = 0
-            for item in new_items:
-                try:
-                    self.model.add_transaction(
-                        item['date'], 
-                        item['description'], 
-                        item['quantity'], 
-                        item['price'], 
-                        item['type'], 
-                        item['supplier']
-                    )
-                    count += 1
-                except Exception as e:
-                    print(f"Failed to add imported item: {item} - {e}")
-            
-            self.refresh_ui()
-            messagebox.showinfo("Success", f"Imported {count} new transactions.")
+            def do_import(progress):
+                current_data = self.model.get_all_transactions()
+                # Changed method name to import_data
+                new_items = DataService.import_data(filename, current_data, progress_callback=progress)
+                if not new_items:
+                    return None
+
+                # Add new items in a single request / DB transaction
+                payload = [
+                    {
+                        "date": item['date'],
+                        "description": item['description'],
+                        "quantity": item['quantity'],
+                        "price": item['price'],
+                        "type": item['type'],
+                        "supplier": item['supplier']
+                    }
+                    for item in new_items
+                ]
+                progress(0, len(payload), f"Saving {len(payload)} transactions...")
+                return self.model.add_transactions_bulk(payload)
+
+            def on_done(count):
+                if count is None:
+                    messagebox.showinfo("Import", "No new transactions found to import.")
+                    return
+                self.refresh_ui()
+                messagebox.showinfo("Success", f"Imported {count} new transactions.")
 
-    def refresh_ui(self):
-        all_transactions = self.model.get_all_transactions()
-        
-        # Filter if search is active
-        if self.current_search_query:
-            display_transactions = [
-                t for t in all_transactions
-                if self.current_search_query in t['description'].lower() or 
-                   (t['supplier'] and self.current_search_query in t['supplier'].lower())
-            ]
-        else:
-            display_transactions = all_transactions
-
-        # Sort
-        if self.sort_col:
-            sort_key = self.COLUMN_MAP.get(self.sort_col, self.sort_col)
-            display_transactions.sort(
-                key=lambda x: x[sort_key] if x[sort_key] is not None else "",
-                reverse=self.sort_reverse
+            def on_error(e):
+                print(f"Failed to add imported items: {e}")
+                messagebox.showerror("Error", f"Import failed: {e}")
+
+            run_with_progress(
+                self.view, "Importing Transactions", do_import,
+                on_success=on_done,
+                on_error=on_error
             )
 
+    def refresh_ui(self):
+        """Bring transactions up to date and mark every dependent view stale."""
+        self._sync_transactions()
+        self._refresh_product_choices()
+        self.invalidate_views(*self._lazy_views)
+
+    def _sync_transactions(self):
+        self.tasks.submit(
+            self._fetch_transactions, key="transactions",
+            on_success=self._on_transactions_fetched,
+            on_error=lambda e: print(f"Error fetching transactions: {e}")
+        )
+
+    def _fetch_transactions(self):
+        """
+        Worker: ("delta", changes, token) since the last sync when possible,
+        else ("full", rows, token).
+        """
+        changes, token = self.model.get_transaction_changes()
+        if changes is not None:
+            return "delta", changes, token
+        token = self.model.begin_sync()
+        return "full", self.model.get_all_transactions(), token
+
+    def _on_transactions_fetched(self, fetched):
+        kind, payload, token = fetched
+        # Advanced only here: a superseded fetch never gets this far, so the
+        # next one starts from the last token whose changes were applied
+        self.model.sync_token = token
+        if kind == "full":
+            self._load_transactions(payload)
+        elif self.store.apply_changes(payload.get("upserts", []), payload.get("deleted", [])):
+            self.render_transactions()
+
+    def _poll_remote_changes(self):
+        try:
+            self.apply_remote_changes(self.listener.drain())
+        except Exception as e:
+            print(f"Error applying remote changes: {e}")
+        try:
+            self.view.after(REMOTE_CHANGES_MS, self._poll_remote_changes)
+        except Exception:
+            pass  # Window destroyed
+
+    def apply_remote_changes(self, events):
+        """
+        React to change events from /ws/changes. Transactions go through the
+        same delta fetch as Refresh; other tables only mark their views stale.
+        """
+        if not events:
+            return
+        if any(e.get("op") == "resync" for e in events):
+            self.refresh_ui()
+            return
+
+        tables = {e.get("table") for e in events}
+        if "transactions" in tables:
+            self._sync_transactions()
+        if "products" in tables:
+            self._refresh_product_choices()
+            self.invalidate_views("products", "shipping")
+        if "materials" in tables:
+            self.invalidate_views("materials")
+
+    def _load_transactions(self, transactions):
+        self.store.load(transactions)
+        self.render_transactions()
+
+    def _show_busy(self, busy):
+        try:
+            self.view.config(cursor="watch" if busy else "")
+        except Exception:
+            pass
+
+    # --- Views ---
+
+    def _display_transactions(self):
+        """Loaded transactions after the active search and sort."""
+        return self.store.query(self.current_search_query, self._sort_key(), self.sort_reverse)
+
+    def _sort_key(self):
+        if not self.sort_col:
+            return None
+        return self.COLUMN_MAP.get(self.sort_col, self.sort_col)
+
+    @staticmethod
+    def _row_values(t):
+        return (
+            t['transaction_date'],
+            t['description'],
+            t['quantity'],
+            t['price'],
+            t['transaction_type'],
+            t['total'],
+            t['supplier']
+        )
+
+    @staticmethod
+    def _row_iid(t):
+        return str(t['id']) if t.get('id') is not None else None
+
+    def render_transactions(self):
+        """Rebuild the grid from the loaded rows (used for sort/search/reload)."""
+        display_transactions = self._display_transactions()
+
         self.tree_frame.clear()
-        
         for t in display_transactions:
-            row_values = (
-                t['transaction_date'],
-                t['description'],
-                t['quantity'],
-                t['price'],
-                t['transaction_type'],
-                t['total'],
-                t['supplier']
-            )
-            self.tree_frame.insert(row_values)
-        
+            self.tree_frame.insert(self._row_values(t), iid=self._row_iid(t))
         self.tree_frame.autosize_columns()
 
-        # Update Summary
+        self._update_summary(display_transactions)
+        self.invalidate_views("analytics")
+
+    def _place_row(self, t):
+        """Insert, move or hide the grid row for one changed transaction."""
+        iid = self._row_iid(t)
+        index = self.store.index_of(t, self.current_search_query, self._sort_key(), self.sort_reverse)
+        display_transactions = self._display_transactions()
+
+        if index is None:
+            self.tree_frame.delete_row(iid)
+        elif self.tree_frame.has_row(iid):
+            self.tree_frame.update_row(iid, self._row_values(t), index=index)
+        else:
+            self.tree_frame.insert(self._row_values(t), iid=iid, index=index)
+
+        self._update_summary(display_transactions)
+        self.invalidate_views("analytics")
+
+    def _update_summary(self, display_transactions):
+        if not self.summary_frame:
+            return
         summary = TransactionUtils.calculate_summary(display_transactions)
         summary_text = (
             f"Income: {summary['total_income']:.2f}  |  "
@@ -179,30 +329,55 @@ class TransactionController:
             f"Balance: {summary['balance']:.2f}  |  "
             f"Units Sold: {summary['total_sold_units']}"
         )
-        if self.summary_frame:
-            self.summary_frame.update_summary(summary_text)
+        self.summary_frame.update_summary(summary_text)
+
+    def _refresh_charts(self):
+        if self.analytics_frame is None:
+            self.analytics_frame = AnalyticsFrame(self.view.tab_analytics)
+            self.analytics_frame.pack(fill='both', expand=True, padx=10, pady=10)
+        # Charts follow the filtered view, matching the grid
+        self.analytics_frame.refresh_charts(self._display_transactions())
 
-        # Update Charts (Always use All Transactions or Filtered? Ideally Filtered matches view)
-        if self.analytics_frame:
-            self.analytics_frame.refresh_charts(display_transactions)
-            
+    def _refresh_product_choices(self):
         # Update Product List in InputFrame (for inventory linking)
-        try:
-            products = self.model.get_products()
-            self.input_frame.update_products(products)
-        except Exception as e:
-            print(f"Error fetching products: {e}")
+        self.tasks.submit(
+            self.model.get_products, key="product_choices",
+            on_success=self.input_frame.update_products,
+            on_error=lambda e: print(f"Error fetching products: {e}")
+        )
 
-        # GLOBAL REFRESH: Ensure all tabs are up to date
-        if hasattr(self, 'products_tab'):
-            self.products_tab.refresh_product_list()
+    def invalidate_views(self, *names):
+        """Mark views stale; the one currently on screen refreshes right away."""
+        self._stale_views.update(n for n in names if n in self._lazy_views)
+        self._refresh_visible_view()
 
-        if hasattr(self, 'materials_tab'):
-            self.materials_tab.refresh()
+    def _on_tab_changed(self, event=None):
+        if self._is_tab_visible(self.view.tab_transactions):
+            # Products may have been edited on another tab
+            self._refresh_product_choices()
+        self._refresh_visible_view()
 
-        if hasattr(self, 'shipping_tab'):
-            self.shipping_tab.refresh()
+    def _is_tab_visible(self, page):
+        try:
+            return str(self.view.notebook.select()) == str(page)
+        except Exception:
+            return False
+
+    def _refresh_visible_view(self):
+        for name in list(self._stale_views):
+            page, refresh = self._lazy_views[name]
+            if self._is_tab_visible(page):
+                self._stale_views.discard(name)
+                try:
+                    refresh()
+                except Exception as e:
+                    print(f"Error refreshing {name}: {e}")
 
+    def _inventory_views_for(self, t_type, product_id):
+        # Income with a linked product deducts product stock and materials
+        if product_id and str(t_type).lower() == 'income':
+            return ("products", "materials", "shipping")
+        return ()
 
     def sort_transactions(self, col):
         if self.sort_col == col:
@@ -211,7 +386,7 @@ class TransactionController:
             self.sort_col = col
             self.sort_reverse = False
         
-        self.refresh_ui()
+        self.render_transactions()
 
 
     def add_transaction(self, data):
@@ -224,12 +399,32 @@ class TransactionController:
 
         desc = TransactionUtils.normalize_text(data['desc'])
         supplier = TransactionUtils.normalize_text(data['supplier'])
-
-        self.model.add_transaction(
-            data['date'], desc, qty, price, data['type'], supplier, data.get('product_id')
+        product_id = data.get('product_id')
+
+        def on_added(new_id):
+            self.input_frame.clear_fields()
+
+            row = {
+                'id': new_id,
+                'transaction_date': data['date'],
+                'description': desc,
+                'quantity': qty,
+                'price': price,
+                'transaction_type': data['type'],
+                'total': round(qty * price, 2),
+                'supplier': supplier,
+                'product_id': product_id
+            }
+            self.store.add(row)
+            self._place_row(row)
+            self.invalidate_views(*self._inventory_views_for(data['type'], product_id))
+
+        self.tasks.submit(
+            self.model.add_transaction,
+            data['date'], desc, qty, price, data['type'], supplier, product_id,
+            on_success=on_added,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to add transaction: {e}")
         )
-        self.input_frame.clear_fields()
-        self.refresh_ui()
 
     def update_transaction(self, t_id, data):
         try:
@@ -242,17 +437,36 @@ class TransactionController:
         desc = TransactionUtils.normalize_text(data['desc'])
         supplier = TransactionUtils.normalize_text(data['supplier'])
 
-        self.model.update_transaction(
-            t_id, data['date'], desc, qty, price, data['type'], supplier, data.get('product_id')
+        def on_updated(_):
+            self.input_frame.clear_fields()
+
+            row = self.store.update(t_id, {
+                'transaction_date': data['date'],
+                'description': desc,
+                'quantity': qty,
+                'price': price,
+                'transaction_type': data['type'],
+                'total': round(qty * price, 2),
+                'supplier': supplier,
+                'product_id': data.get('product_id')
+            })
+            if row is None:
+                self.refresh_ui()
+            else:
+                self._place_row(row)
+            messagebox.showinfo("Success", "Transaction Updated")
+
+        self.tasks.submit(
+            self.model.update_transaction,
+            t_id, data['date'], desc, qty, price, data['type'], supplier, data.get('product_id'),
+            on_success=on_updated,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to update transaction: {e}")
         )
-        self.input_frame.clear_fields()
-        self.refresh_ui()
-        messagebox.showinfo("Success", "Transaction Updated")
 
     def prep_edit_transaction(self, tree_item):
         values = tree_item['values']
         # We search in ALL transactions to find the ID, even if filtered view
-        transactions = self.model.get_all_transactions()
+        transactions = self.store.all()
         found = None
         for t in transactions:
             if (str(t['transaction_date']) == str(values[0]) and 
@@ -271,7 +485,7 @@ class TransactionController:
 
     def prompt_delete_transaction(self, tree_item):
         values = tree_item['values']
-        transactions = self.model.get_all_transactions()
+        transactions = self.store.all()
         found = None
         for t in transactions:
              if (str(t['transaction_date']) == str(values[0]) and 
@@ -283,8 +497,17 @@ class TransactionController:
         
         if found:
             if messagebox.askyesno("Delete", "Are you sure?"):
-                self.model.delete_transaction(found['id'])
-                # Clear search if deleting to avoid confusion? No, keep context.
-                self.refresh_ui()
+                def on_deleted(_):
+                    # Clear search if deleting to avoid confusion? No, keep context.
+                    self.store.remove(found['id'])
+                    self.tree_frame.delete_row(str(found['id']))
+                    self._update_summary(self._display_transactions())
+                    self.invalidate_views("analytics")
+
+                self.tasks.submit(
+                    self.model.delete_transaction, found['id'],
+                    on_success=on_deleted,
+                    on_error=lambda e: messagebox.showerror("Error", f"Failed to delete transaction: {e}")
+                )
         else:
             messagebox.showerror("Error", "Could not locate record.")
@@ -3,7 +3,8 @@ import copy
 import base64
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from config.config import DEFAULT_LABOR_RATE, UI_LABELS, BUTTON_ADD, BUTTON_UPDATE, BUTTON_CLEAR
+from gui.tasks import TaskRunner
+from config.config import DEFAULT_LABOR_RATE, UI_LABELS, BUTTON_ADD, BUTTON_UPDATE, BUTTON_CLEAR, GALLERY_THUMBNAIL_SIZE
 from services.shipping_service import format_shipping_summary, get_cheapest_by_destination
 
 import io
@@ -22,6 +23,7 @@ class ProductForm(tk.Frame):
         self.image_data = None # Holds specific image being uploaded (bytes)
         self.pending_gallery_images = [] # List of pending images for new product
         self.current_product_id = None # Track ID if editing existing product
+        self.tasks = TaskRunner(self)
 
         self.columnconfigure(0, weight=1)
         self.rowconfigure(0, weight=1)
@@ -519,96 +521,147 @@ class ProductForm(tk.Frame):
         if not HAS_PIL:
             tk.Label(self.gallery_frame, text="PIL Required").pack()
             return
-            
-        try:
-            images = []
-            if self.current_product_id:
-                images = APIClient.get_product_images(self.current_product_id)
-            else:
-                images = self.pending_gallery_images
 
-            row = 0
-            col = 0
-            max_cols = 5
-            self.gallery_refs = [] # Keep refs to prevent GC
-            
-            for img in images:
-                img_data = img.get('image_data')
-                img_id = img.get('id')
+        # Fetch and decode off the Tk thread; only PhotoImage creation and
+        # widget building happen in _render_gallery
+        self.tasks.submit(
+            self._load_gallery_images, self.current_product_id, list(self.pending_gallery_images),
+            key="gallery",
+            on_success=self._render_gallery,
+            on_error=lambda e: tk.Label(self.gallery_frame, text=f"Error loading gallery: {e}").pack()
+        )
+
+    @staticmethod
+    def _load_gallery_images(product_id, pending_images):
+        """Worker side: returns (img_id, img_bytes, thumbnail) tuples."""
+        if product_id:
+            # Metadata only; bytes come from the cached binary endpoint
+            images = APIClient.list_product_images(product_id)
+        else:
+            images = pending_images
+
+        loaded = []
+        for img in images:
+            img_id = img.get('id')
+            img_data = img.get('image_data')
+            try:
                 if img_data:
-                    try:
-                        b64_data = img_data
-                        if "," in b64_data:
-                            b64_data = b64_data.split(",")[1]
-                        
-                        img_bytes = base64.b64decode(b64_data)
-                        pil_img = Image.open(io.BytesIO(img_bytes))
-                        pil_img.thumbnail((100, 100)) # Smaller thumbnail
-                        tk_img = ImageTk.PhotoImage(pil_img)
-                        self.gallery_refs.append(tk_img)
-                        
-                        # Container Frame
-                        f = tk.Frame(self.gallery_frame, bd=1, relief="solid")
-                        f.grid(row=row, column=col, padx=5, pady=5)
-                        
-                        lbl = tk.Label(f, image=tk_img)
-                        lbl.pack()
-                        
-                        # Context Menu
-                        menu = tk.Menu(f, tearoff=0)
-                        menu.add_command(label="Set as Main Image", command=lambda i=img_id, d=b64_data: self.set_main_image_from_gallery(d))
-                        
-                        def do_popup(event, m=menu):
-                            try: m.tk_popup(event.x_root, event.y_root)
-                            finally: m.grab_release()
-                        lbl.bind("<Button-3>", do_popup) 
-                        
-                        btn_del = tk.Button(f, text="x", font=("Arial", 8), fg="red", 
-                                            command=lambda i=img_id: self.delete_image_from_gallery(i))
-                        btn_del.place(relx=1.0, rely=0.0, anchor="ne")
-                        
-                        col += 1
-                        if col >= max_cols:
-                            col = 0; row += 1
-                    except Exception as e:
-                        print(f"Error rendering gallery image {img_id}: {e}")
-        except Exception as e:
-            tk.Label(self.gallery_frame, text=f"Error loading gallery: {e}").pack()
+                    b64_data = img_data
+                    if "," in b64_data:
+                        b64_data = b64_data.split(",")[1]
+                    img_bytes = base64.b64decode(b64_data)
+                else:
+                    # Server-side thumbnail: a few KB per tile instead of the original
+                    img_bytes = APIClient.get_image(img_id, size=GALLERY_THUMBNAIL_SIZE)
+            except Exception as e:
+                print(f"Error loading gallery image {img_id}: {e}")
+                continue
 
-    def set_main_image_from_gallery(self, b64_data):
-        self.display_main_image(b64_data)
+            if img_bytes:
+                try:
+                    pil_img = Image.open(io.BytesIO(img_bytes))
+                    pil_img.thumbnail((100, 100)) # Smaller thumbnail
+                    loaded.append((img_id, img_bytes, pil_img))
+                except Exception as e:
+                    print(f"Error decoding gallery image {img_id}: {e}")
+        return loaded
+
+    def _render_gallery(self, loaded):
+        for widget in self.gallery_frame.winfo_children():
+            widget.destroy()
+
+        row = 0
+        col = 0
+        max_cols = 5
+        self.gallery_refs = [] # Keep refs to prevent GC
+
+        for img_id, img_bytes, pil_img in loaded:
+            try:
+                tk_img = ImageTk.PhotoImage(pil_img)
+                self.gallery_refs.append(tk_img)
+                
+                # Container Frame
+                f = tk.Frame(self.gallery_frame, bd=1, relief="solid")
+                f.grid(row=row, column=col, padx=5, pady=5)
+                
+                lbl = tk.Label(f, image=tk_img)
+                lbl.pack()
+                
+                # Context Menu
+                menu = tk.Menu(f, tearoff=0)
+                menu.add_command(label="Set as Main Image",
+                                 command=lambda d=img_bytes, i=img_id: self.set_main_image_from_gallery(d, image_id=i))
+                
+                def do_popup(event, m=menu):
+                    try: m.tk_popup(event.x_root, event.y_root)
+                    finally: m.grab_release()
+                lbl.bind("<Button-3>", do_popup) 
+                
+                btn_del = tk.Button(f, text="x", font=("Arial", 8), fg="red", 
+                                    command=lambda i=img_id: self.delete_image_from_gallery(i))
+                btn_del.place(relx=1.0, rely=0.0, anchor="ne")
+                
+                col += 1
+                if col >= max_cols:
+                    col = 0; row += 1
+            except Exception as e:
+                print(f"Error rendering gallery image {img_id}: {e}")
+
+    def set_main_image_from_gallery(self, image_input, image_id=None):
+        # Saved gallery tiles only hold the server thumbnail; fetch the
+        # original so the main image keeps its full resolution
+        if image_id is not None and not str(image_id).startswith("temp_"):
+            self.tasks.submit(
+                APIClient.get_image, image_id,
+                on_success=self._apply_gallery_original,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to load image: {e}")
+            )
+            return
+        self._apply_main_image(image_input)
+
+    def _apply_gallery_original(self, img_bytes):
+        if not img_bytes:
+            messagebox.showerror("Error", "Failed to load the full-size image.")
+            return
+        self._apply_main_image(img_bytes)
+
+    def _apply_main_image(self, image_input):
+        self.display_main_image(image_input)
         
-        # Internal State Update
+        # Internal State Update (accepts raw bytes or a base64 string)
         try:
-             clean_b64 = b64_data.split(",")[1] if "," in b64_data else b64_data
-             self.image_data = base64.b64decode(clean_b64)
+             if isinstance(image_input, bytes):
+                 self.image_data = image_input
+             else:
+                 clean_b64 = image_input.split(",")[1] if "," in image_input else image_input
+                 self.image_data = base64.b64decode(clean_b64)
         except Exception as e:
              print(f"Error updating local state for image: {e}")
 
-        # If Live Mode, API Call
+        # If Live Mode, API Call (APIClient base64-encodes bytes)
         if self.current_product_id:
-            try:
-                APIClient.update_product(self.current_product_id, {'image': b64_data})
-                messagebox.showinfo("Success", "Main image updated.")
-                # We should notify parent to refresh? Or assume parent handles list refresh elsewhere.
-                # Actually parent list is stale if we don't refresh it.
-                # Ideally, form should trigger an event. But for now, let's just save valid state.
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to update main image: {e}")
+            # We should notify parent to refresh? Or assume parent handles list refresh elsewhere.
+            # Actually parent list is stale if we don't refresh it.
+            # Ideally, form should trigger an event. But for now, let's just save valid state.
+            self.tasks.submit(
+                APIClient.update_product, self.current_product_id, {'image': image_input},
+                on_success=lambda _: messagebox.showinfo("Success", "Main image updated."),
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to update main image: {e}")
+            )
 
     def delete_image_from_gallery(self, img_id):
         if not messagebox.askyesno("Confirm", "Delete this image?"):
             return
             
-        try:
-            if str(img_id).startswith("temp_"):
-                self.pending_gallery_images = [img for img in self.pending_gallery_images if img['id'] != img_id]
-                self.refresh_gallery()
-            else:
-                APIClient.delete_product_image(img_id)
-                self.refresh_gallery()
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        if str(img_id).startswith("temp_"):
+            self.pending_gallery_images = [img for img in self.pending_gallery_images if img['id'] != img_id]
+            self.refresh_gallery()
+        else:
+            self.tasks.submit(
+                APIClient.delete_product_image, img_id,
+                on_success=lambda _: self.refresh_gallery(),
+                on_error=lambda e: messagebox.showerror("Error", str(e))
+            )
 
     def clear(self):
         # Helper to clear entries
@@ -0,0 +1,42 @@
+"""
+Deferred imports for heavy GUI modules.
+
+Tabs and charts are only needed when their feature is enabled in
+features.json, and gui.charts alone pulls in matplotlib. A LazyClass stands
+in for the class at module level, so names stay importable and patchable,
+and the real module is imported the first time the class is used.
+
+PyInstaller can't see these string imports; list new targets under
+hiddenimports in main.spec.
+"""
+
+import importlib
+
+
+class LazyClass:
+    """Placeholder for module.name that imports it on first call or attribute access."""
+
+    def __init__(self, module, name):
+        self._module = module
+        self._name = name
+        self._cls = None
+
+    def load(self):
+        if self._cls is None:
+            self._cls = getattr(importlib.import_module(self._module), self._name)
+        return self._cls
+
+    @property
+    def loaded(self):
+        return self._cls is not None
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        # Static helpers such as ProductsTab.calculate_product_cost_static
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyClass {self._module}.{self._name} ({state})>"
@@ -1,3 +1,4 @@
+from bisect import bisect_left
 from client.api_client import APIClient
 
 class TransactionModel:
@@ -8,13 +9,49 @@ class TransactionModel:
         self.table_name = table_name
         # Note: table_name is less relevant on client side now as API handles it, 
         # but kept for compatibility or potentially sending as param if API supported dynamic tables.
+        # Token for GET /changes; None until a full load has been synced
+        self.sync_token = None
 
     def get_all_transactions(self):
         return APIClient.get_all_transactions()
 
+    def begin_sync(self):
+        """
+        Take a sync token. Call right before a full load: changes made while
+        the load runs are then included in the first delta.
+
+        Returns the token (None if the server can't be reached); store it in
+        sync_token once the load has been applied.
+        """
+        changes = APIClient.get_changes(tables=["transactions"])
+        return changes.get("token") if changes else None
+
+    def get_transaction_changes(self):
+        """
+        Transactions changed since sync_token as ({"upserts", "deleted"}, new_token),
+        or (None, None) when a full load is needed instead (never synced, token
+        expired or server unreachable).
+
+        sync_token is left alone: this runs on a worker whose result may be
+        dropped, and advancing the token for a delta nobody applied would
+        lose those changes.
+        """
+        if not self.sync_token:
+            return None, None
+        changes = APIClient.get_changes(since=self.sync_token, tables=["transactions"])
+        if not changes or changes.get("full"):
+            return None, None
+        return changes["transactions"], changes["token"]
+
+    def get_transactions_page(self, limit=100, after=None, **filters):
+        return APIClient.get_transactions_page(limit=limit, after=after, **filters)
+
     def add_transaction(self, date, desc, qty, price, t_type, supplier=None, product_id=None):
         return APIClient.add_transaction(date, desc, qty, price, t_type, supplier, product_id)
 
+    def add_transactions_bulk(self, items):
+        return APIClient.add_transactions_bulk(items)
+
     def delete_transaction(self, t_id):
         APIClient.delete_transaction(t_id)
     
@@ -22,4 +59,176 @@ class TransactionModel:
         APIClient.update_transaction(t_id, date, desc, qty, price, t_type, supplier, product_id)
 
     def get_products(self):
-        return APIClient.get_products()
+        # Only id/title are needed for the description combobox
+        return APIClient.get_products(fields="summary")
+
+
+class TransactionStore:
+    """
+    Loaded transactions kept in memory for sorting and searching.
+
+    Each sortable column gets a pre-sorted index, built on first use and kept
+    up to date with bisect on add/update/remove, so sorting is a walk over an
+    existing list. Description and supplier are lowercased once per row into a
+    search index. Rows are the dicts returned by the API and are mutated in
+    place by update().
+    """
+
+    SEARCH_FIELDS = ("description", "supplier")
+
+    def __init__(self, rows=None):
+        self.load(rows or [])
+
+    def load(self, rows):
+        self._rows = []
+        self._seq = {}          # id(row) -> insertion counter, breaks sort ties
+        self._search_text = {}  # id(row) -> lowercase searchable text
+        self._indexes = {}      # column -> (keys, rows) sorted ascending
+        self._next_seq = 0
+        self._last_query = None
+        for row in rows:
+            self._register(row)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def all(self):
+        return list(self._rows)
+
+    def get(self, t_id):
+        return next((r for r in self._rows if str(r.get('id')) == str(t_id)), None)
+
+    # --- Mutations ---
+
+    def add(self, row):
+        self._register(row)
+        for column, (keys, rows) in self._indexes.items():
+            key = self._key(row, column)
+            pos = bisect_left(keys, key)
+            keys.insert(pos, key)
+            rows.insert(pos, row)
+        self._last_query = None
+        return row
+
+    def update(self, t_id, changes):
+        row = self.get(t_id)
+        if row is None:
+            return None
+        return self._update_row(row, changes)
+
+    def _update_row(self, row, changes):
+        self._unindex(row)
+        row.update(changes)
+        self._search_text[id(row)] = self._text(row)
+        for column, (keys, rows) in self._indexes.items():
+            key = self._key(row, column)
+            pos = bisect_left(keys, key)
+            keys.insert(pos, key)
+            rows.insert(pos, row)
+        self._last_query = None
+        return row
+
+    def remove(self, t_id):
+        row = self.get(t_id)
+        if row is None:
+            return None
+        return self._remove_row(row)
+
+    def _remove_row(self, row):
+        self._unindex(row)
+        self._rows.remove(row)
+        del self._seq[id(row)]
+        del self._search_text[id(row)]
+        self._last_query = None
+        return row
+
+    def apply_changes(self, upserts=(), deleted=()):
+        """
+        Merge a delta from GET /changes: rows are added or updated in place
+        by id, then deleted ids are dropped. Repeated rows are harmless.
+        Returns True if anything was applied.
+        """
+        by_id = {str(r.get('id')): r for r in self._rows}
+        applied = False
+        for row in upserts:
+            key = str(row.get('id'))
+            current = by_id.get(key)
+            if current is None:
+                by_id[key] = self.add(dict(row))
+            else:
+                self._update_row(current, row)
+            applied = True
+        for t_id in deleted:
+            row = by_id.pop(str(t_id), None)
+            if row is not None:
+                self._remove_row(row)
+                applied = True
+        return applied
+
+    # --- Queries ---
+
+    def query(self, search="", sort_key=None, reverse=False):
+        """Rows matching `search` (lowercase substring), ordered by `sort_key`."""
+        search = (search or "").lower()
+        previous = self._last_query
+        if previous and previous[1:3] == (sort_key, reverse) and search.startswith(previous[0]):
+            # Typing more characters only narrows the previous result
+            candidates = previous[3]
+        else:
+            candidates = self._ordered(sort_key, reverse)
+
+        if search:
+            text = self._search_text
+            result = [r for r in candidates if search in text[id(r)]]
+        else:
+            result = list(candidates)
+
+        self._last_query = (search, sort_key, reverse, result)
+        return list(result)
+
+    def index_of(self, row, search="", sort_key=None, reverse=False):
+        """Position of `row` in query(search, sort_key, reverse), or None if filtered out."""
+        result = self.query(search, sort_key, reverse)
+        return next((i for i, r in enumerate(result) if r is row), None)
+
+    # --- Internals ---
+
+    def _register(self, row):
+        self._rows.append(row)
+        self._seq[id(row)] = self._next_seq
+        self._next_seq += 1
+        self._search_text[id(row)] = self._text(row)
+
+    def _text(self, row):
+        return "\n".join(str(row.get(f) or "") for f in self.SEARCH_FIELDS).lower()
+
+    def _key(self, row, column):
+        seq = self._seq[id(row)]
+        if column is None:
+            return (0, 0, seq)
+        value = row.get(column)
+        if value is None:
+            return (0, "", seq)
+        if isinstance(value, str):
+            # Numeric strings (e.g. DECIMAL sent as text) still sort numerically
+            try:
+                return (1, float(value), seq)
+            except ValueError:
+                return (2, value, seq)
+        return (1, value, seq)
+
+    def _index(self, column):
+        if column not in self._indexes:
+            pairs = sorted(((self._key(r, column), r) for r in self._rows), key=lambda p: p[0])
+            self._indexes[column] = ([k for k, _ in pairs], [r for _, r in pairs])
+        return self._indexes[column]
+
+    def _ordered(self, column, reverse):
+        rows = self._index(column)[1] if column is not None else self._rows
+        return rows[::-1] if reverse else rows
+
+    def _unindex(self, row):
+        for column, (keys, rows) in self._indexes.items():
+            pos = bisect_left(keys, self._key(row, column))
+            del keys[pos]
+            del rows[pos]
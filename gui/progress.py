@@ -0,0 +1,157 @@
+"""
+Progress reporting for long-running GUI jobs (Etsy import, CSV import/export).
+
+The job runs on a TaskRunner worker and reports through a ProgressChannel,
+which only queues updates; ProgressDialog drains the channel from after()
+on the Tk thread, so workers never touch widgets. Updates are throttled so
+a tight loop over thousands of rows does not flood the event loop.
+"""
+
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from gui.tasks import TaskRunner
+
+# Minimum time between queued progress updates (the final one always goes through)
+THROTTLE_S = 0.1
+# How often the dialog checks for new progress
+POLL_MS = 100
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when the user pressed Cancel."""
+
+
+class ProgressChannel:
+    """
+    Thread-safe progress sink with the progress_callback(current, total,
+    message) signature used by the services.
+
+    Calling it after cancel() raises JobCancelled, so any job that reports
+    progress stops at its next step without extra plumbing. Jobs that want
+    to wind down cleanly instead can watch cancel_event.
+    """
+
+    def __init__(self, min_interval=THROTTLE_S):
+        self.min_interval = min_interval
+        self.cancel_event = threading.Event()
+        self._updates = queue.Queue()
+        self._last_sent = 0.0
+
+    def __call__(self, current, total, message=""):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+        now = time.monotonic()
+        final = total and current >= total
+        if not final and now - self._last_sent < self.min_interval:
+            return
+        self._last_sent = now
+        self._updates.put((current, total, message))
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def drain(self):
+        """Return the newest (current, total, message) update, or None."""
+        latest = None
+        while True:
+            try:
+                latest = self._updates.get_nowait()
+            except queue.Empty:
+                return latest
+
+
+class ProgressDialog(tk.Toplevel):
+    """Modal progress window with a determinate bar and a Cancel button."""
+
+    def __init__(self, parent, title, channel):
+        super().__init__(parent)
+        self.channel = channel
+        self.title(title)
+        self.geometry("400x150")
+        self.transient(parent)
+        self.protocol("WM_DELETE_WINDOW", self.request_cancel)
+
+        # Center the window
+        self.update_idletasks()
+        x = (self.winfo_screenwidth() // 2) - (self.winfo_width() // 2)
+        y = (self.winfo_screenheight() // 2) - (self.winfo_height() // 2)
+        self.geometry(f"+{x}+{y}")
+
+        self.status_label = tk.Label(self, text="Starting...", wraplength=380)
+        self.status_label.pack(pady=(20, 10))
+
+        self.progress_bar = ttk.Progressbar(self, mode='determinate', length=350)
+        self.progress_bar.pack(pady=5)
+
+        self.btn_cancel = tk.Button(self, text="Cancel", command=self.request_cancel)
+        self.btn_cancel.pack(pady=10)
+
+        self.grab_set()
+        self._closed = False
+        self.after(POLL_MS, self._poll)
+
+    def request_cancel(self):
+        self.channel.cancel()
+        self.btn_cancel.config(state="disabled")
+        self.status_label.config(text="Cancelling...")
+
+    def _poll(self):
+        if self._closed:
+            return
+        update = self.channel.drain()
+        if update and not self.channel.cancelled:
+            current, total, message = update
+            if total:
+                self.progress_bar['value'] = (current / total) * 100
+            if message:
+                self.status_label.config(text=message)
+        self.after(POLL_MS, self._poll)
+
+    def close(self):
+        self._closed = True
+        try:
+            self.grab_release()
+            self.destroy()
+        except tk.TclError:
+            pass
+
+
+def run_with_progress(parent, title, job, on_success, on_error=None, on_cancel=None):
+    """
+    Run job(channel) in the background behind a ProgressDialog.
+
+    Exactly one of on_success(result), on_error(exception) or on_cancel()
+    is called on the Tk thread once the job ends. Returns the channel.
+    """
+    channel = ProgressChannel()
+    # Inline runs (tests) have no mainloop to drive the dialog
+    dialog = None if TaskRunner.inline else ProgressDialog(parent, title, channel)
+
+    def finish(callback, *args):
+        if dialog:
+            dialog.close()
+        if callback:
+            callback(*args)
+
+    def handle_error(e):
+        if isinstance(e, JobCancelled):
+            finish(on_cancel)
+        elif on_error:
+            finish(on_error, e)
+        else:
+            finish(print, f"{title} failed: {e}")
+
+    TaskRunner(parent).submit(
+        job, channel,
+        on_success=lambda result: finish(on_success, result),
+        on_error=handle_error
+    )
+    return channel
@@ -1,11 +1,13 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from client.api_client import APIClient
+from gui.tasks import TaskRunner
 
 class MaterialsTab(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.materials = []
+        self.tasks = TaskRunner(self)
         
         # Configure layout
         self.columnconfigure(1, weight=1)
@@ -113,10 +115,17 @@ class MaterialsTab(tk.Frame):
         self.refresh_list()
 
     def refresh_list(self):
+        self.tasks.submit(
+            APIClient.get_materials, key="materials",
+            on_success=self._populate_list,
+            on_error=lambda e: print(f"Error refreshing materials: {e}")
+        )
+
+    def _populate_list(self, materials):
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        self.materials = APIClient.get_materials()
+        self.materials = materials
         for m in self.materials:
             self.tree.insert("", "end", values=(m['id'], m['name'], m.get('stock_quantity', 0), m['unit_cost'], m['unit_type']))
 
@@ -129,31 +138,32 @@ class MaterialsTab(tk.Frame):
     def _save_material(self, is_update):
         data = self._get_form_data()
         if not data: return
-        try:
-            if is_update:
-                selected = self.tree.selection()
-                if not selected:
-                    # Try using ID field if no selection
-                    search_id = self.entry_id.get().strip()
-                    if search_id.isdigit():
-                         m_id = int(search_id)
-                    else:
-                        messagebox.showwarning("Warning", "No material selected or ID provided")
-                        return
+        if is_update:
+            selected = self.tree.selection()
+            if not selected:
+                # Try using ID field if no selection
+                search_id = self.entry_id.get().strip()
+                if search_id.isdigit():
+                     m_id = int(search_id)
                 else:
-                    m_id = self.tree.item(selected[0])['values'][0]
-                
-                APIClient.update_material(m_id, data)
-                messagebox.showinfo("Success", "Material Updated")
+                    messagebox.showwarning("Warning", "No material selected or ID provided")
+                    return
             else:
-                APIClient.add_material(data)
-                messagebox.showinfo("Success", "Material Added")
-            
+                m_id = self.tree.item(selected[0])['values'][0]
+            call, args, message = APIClient.update_material, (m_id, data), "Material Updated"
+        else:
+            call, args, message = APIClient.add_material, (data,), "Material Added"
+
+        def on_saved(_):
+            messagebox.showinfo("Success", message)
             self.refresh_list()
             self.clear_inputs()
-                
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+
+        self.tasks.submit(
+            call, *args,
+            on_success=on_saved,
+            on_error=lambda e: messagebox.showerror("Error", str(e))
+        )
 
     def delete_material(self):
         selected = self.tree.selection()
@@ -161,12 +171,16 @@ class MaterialsTab(tk.Frame):
         
         if messagebox.askyesno("Confirm", "Delete material?"):
             m_id = self.tree.item(selected[0])['values'][0]
-            try:
-                APIClient.delete_material(m_id)
+
+            def on_deleted(_):
                 self.refresh_list()
                 self.clear_inputs()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+
+            self.tasks.submit(
+                APIClient.delete_material, m_id,
+                on_success=on_deleted,
+                on_error=lambda e: messagebox.showerror("Error", str(e))
+            )
 
     def _get_form_data(self):
         name = self.entry_name.get().strip()
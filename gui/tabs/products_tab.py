@@ -2,10 +2,11 @@ from client.api_client import APIClient
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from config.config import DEFAULT_LABOR_RATE
-import threading
 
 from gui.forms.product_form import ProductForm
 from gui.dialogs.create_product_dialog import CreateProductDialog
+from gui.tasks import TaskRunner
+from gui.progress import run_with_progress
 from services.etsy_import import import_etsy_products
 
 
@@ -13,6 +14,7 @@ class ProductsTab(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.products = []
+        self.tasks = TaskRunner(self, on_busy=self._show_loading)
         
         # Configure grid expansion
         self.columnconfigure(1, weight=1) # List area expands
@@ -61,21 +63,20 @@ class ProductsTab(tk.Frame):
         
         try:
             data = self.form.get_data() # Gets validated data
-            
-            # API Update
-            APIClient.update_product(p_id, data)
-            messagebox.showinfo("Success", "Product Updated")
-            self.refresh_product_list()
-            
-            # Verify if image was updated, we might need to refresh local state?
-            # get_data encodes the image.
-            # If successful, we can reload? Or just assume form state is fine.
-            # actually we should probably reload to be safe, but form state is what we just sent.
-            
         except ValueError as ve:
              messagebox.showerror("Validation Error", str(ve))
-        except Exception as e:
-             messagebox.showerror("Error", f"Failed to update product: {e}")
+             return
+
+        def on_updated(_):
+            messagebox.showinfo("Success", "Product Updated")
+            self.refresh_product_list()
+
+        # API Update
+        self.tasks.submit(
+            APIClient.update_product, p_id, data,
+            on_success=on_updated,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to update product: {e}")
+        )
 
     def create_list_frame(self):
         # Treeview for products
@@ -87,6 +88,8 @@ class ProductsTab(tk.Frame):
         self.entry_search.pack(side="left", padx=5)
         self.entry_search.bind("<Return>", self.search_by_id)
         tk.Button(self.search_frame, text="Find", command=self.search_by_id).pack(side="left")
+        self.lbl_loading = tk.Label(self.search_frame, text="", fg="gray")
+        self.lbl_loading.pack(side="right")
 
         # Treeview
         self.tree = ttk.Treeview(self.right_panel, columns=("ID", "Title", "SKU", "Stock", "Cost", "Price"), show="headings")
@@ -110,12 +113,22 @@ class ProductsTab(tk.Frame):
         tk.Button(self.right_panel, text="Delete Selected", command=self.delete_product_gui).pack(pady=5)
         tk.Button(self.right_panel, text="Refresh List", command=self.refresh_product_list).pack(pady=5)
 
+    def _show_loading(self, busy):
+        self.lbl_loading.config(text="Loading..." if busy else "")
+
     def refresh_product_list(self):
+        self.tasks.submit(
+            APIClient.get_products, fields="summary", key="products",
+            on_success=self._populate_product_list,
+            on_error=lambda e: print(f"Error refreshing list: {e}")
+        )
+
+    def _populate_product_list(self, products):
         for item in self.tree.get_children():
             self.tree.delete(item)
         
         try:
-            self.products = APIClient.get_products()
+            self.products = products
             for product in self.products:
                 total_cost = self.calculate_product_cost_static(product)
                 
@@ -135,11 +148,20 @@ class ProductsTab(tk.Frame):
         if not selected: return
         
         p_id = str(self.tree.item(selected[0])['values'][0])
-        # Find product in self.products
-        product = next((p for p in self.products if str(p['id']) == p_id), None)
-        
-        if product:
-             self.form.load_product(product)
+
+        def on_loaded(product):
+            if not product:
+                product = next((p for p in self.products if str(p['id']) == p_id), None)
+            if product:
+                 self.form.load_product(product)
+
+        # The list only holds summary columns; load the full record for the form.
+        # Clicking through rows quickly only loads the last one.
+        self.tasks.submit(
+            APIClient.get_product, p_id, key="product_detail",
+            on_success=on_loaded,
+            on_error=lambda e: on_loaded(None)
+        )
 
     def delete_product_gui(self):
         selected = self.tree.selection()
@@ -155,23 +177,25 @@ class ProductsTab(tk.Frame):
         if not messagebox.askyesno("Confirm Delete", f"Delete {count} {item_text}?"):
             return
         
-        try:
+        p_ids = [self.tree.item(item)['values'][0] for item in selected]
+
+        def delete_all():
             # Delete all selected products
-            for item in selected:
-                p_id = self.tree.item(item)['values'][0]
+            for p_id in p_ids:
                 APIClient.delete_product(p_id)
-            
+
+        def on_deleted(_):
             # Show success message
             messagebox.showinfo("Success", f"Deleted {count} {item_text}")
-            
-            # Refresh list in background
-            self.after(100, self.refresh_product_list)
-            
+            self.refresh_product_list()
             # Clear form
             self.form.clear()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete products: {e}")
+
+        self.tasks.submit(
+            delete_all,
+            on_success=on_deleted,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to delete products: {e}")
+        )
 
 
     def search_by_id(self, event=None):
@@ -216,72 +240,36 @@ class ProductsTab(tk.Frame):
         if not csv_path:
             return  # User cancelled
         
-        # Create progress dialog
-        progress_window = tk.Toplevel(self)
-        progress_window.title("Importing Products")
-        progress_window.geometry("400x150")
-        progress_window.transient(self)
-        progress_window.grab_set()
-        
-        # Center the window
-        progress_window.update_idletasks()
-        x = (progress_window.winfo_screenwidth() // 2) - (progress_window.winfo_width() // 2)
-        y = (progress_window.winfo_screenheight() // 2) - (progress_window.winfo_height() // 2)
-        progress_window.geometry(f"+{x}+{y}")
-        
-        # Progress label
-        status_label = tk.Label(progress_window, text="Starting import...", wraplength=380)
-        status_label.pack(pady=20)
-        
-        # Progress bar
-        progress_bar = ttk.Progressbar(progress_window, mode='determinate', length=350)
-        progress_bar.pack(pady=10)
-        
-        # Result container
-        result = {'stats': None, 'error': None}
-        
-        def progress_callback(current, total, message):
-            """Update progress bar and status label."""
-            progress_bar['value'] = (current / total) * 100
-            status_label.config(text=message)
-            progress_window.update()
-        
-        def do_import():
-            """Run import in background thread."""
+        def do_import(progress):
             try:
-                stats = import_etsy_products(csv_path, progress_callback)
-                result['stats'] = stats
-            except Exception as e:
-                result['error'] = str(e)
-        
-        # Run import in thread
-        import_thread = threading.Thread(target=do_import, daemon=True)
-        import_thread.start()
-        
-        # Wait for thread to complete
-        while import_thread.is_alive():
-            progress_window.update()
-            self.after(100)
-        
-        # Close progress window
-        progress_window.destroy()
-        
-        # Show results
-        if result['error']:
-            messagebox.showerror("Import Error", f"Failed to import products:\n{result['error']}")
-        elif result['stats']:
-            stats = result['stats']
+                # Cancel stops after the current product; rows already read are kept
+                return import_etsy_products(csv_path, progress, cancel_event=progress.cancel_event)
+            finally:
+                # The import writes to the database directly, bypassing the
+                # server's change counters, so cached lists can't be trusted
+                APIClient.clear_list_cache()
+
+        def on_done(stats):
             message = (
-                f"Import Complete!\n\n"
+                f"Import {'Cancelled' if stats.get('skipped_cancelled') else 'Complete'}!\n\n"
                 f"✓ Imported: {stats['imported']} products\n"
                 f"⊘ Skipped (duplicates): {stats['skipped_duplicates']}\n"
                 f"✗ Skipped (errors): {stats['skipped_errors']}"
             )
+            if stats.get('skipped_cancelled'):
+                message += f"\n– Not processed: {stats['skipped_cancelled']}"
             messagebox.showinfo("Import Results", message)
             
             # Refresh product list
             self.refresh_product_list()
 
+        run_with_progress(
+            self, "Importing Products", do_import,
+            on_success=on_done,
+            on_error=lambda e: messagebox.showerror("Import Error", f"Failed to import products:\n{e}"),
+            on_cancel=self.refresh_product_list
+        )
+
     @staticmethod
     def calculate_product_cost_static(data):
         """Calculate total COGS from a product dictionary"""
@@ -9,6 +9,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from client.api_client import APIClient
+from gui.tasks import TaskRunner
 from services.shipping_service import (
     get_all_shipping_estimates,
     get_cheapest_by_destination,
@@ -22,6 +23,7 @@ class ShippingTab(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.products = []
+        self.tasks = TaskRunner(self)
 
         self.columnconfigure(0, weight=1)
         self.rowconfigure(1, weight=1)
@@ -153,13 +155,20 @@ class ShippingTab(tk.Frame):
     # ──────────────────────────────────────────────────────────────────
 
     def refresh(self):
-        try:
-            self.products = APIClient.get_products()
-        except Exception as e:
-            self.products = []
-            messagebox.showwarning("Shipping Tab", f"Could not load products: {e}")
+        self.tasks.submit(
+            APIClient.get_products, fields="summary", key="products",
+            on_success=self._on_products_loaded,
+            on_error=self._on_products_failed
+        )
+
+    def _on_products_loaded(self, products):
+        self.products = products
         self._populate_product_list(self.products)
 
+    def _on_products_failed(self, e):
+        messagebox.showwarning("Shipping Tab", f"Could not load products: {e}")
+        self._on_products_loaded([])
+
     def _populate_product_list(self, products):
         for row in self.product_tree.get_children():
             self.product_tree.delete(row)
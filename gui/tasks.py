@@ -0,0 +1,154 @@
+"""
+Background execution for API calls made from the Tk GUI.
+
+Tk widgets may only be touched from the thread running mainloop. TaskRunner
+runs blocking work (HTTP calls, image decoding) on a shared thread pool and
+hands results back to the Tk thread by draining a queue from after(), so
+on_success / on_error callbacks can update widgets directly.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 4
+# How often the Tk thread checks for finished tasks while any are pending
+POLL_MS = 30
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="gui-task")
+        return _executor
+
+
+class Task:
+    """Handle for a submitted call; cancel() drops its result."""
+
+    def __init__(self, key, on_success, on_error):
+        self.key = key
+        self.on_success = on_success
+        self.on_error = on_error
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TaskRunner:
+    """
+    Runs callables off the Tk thread and dispatches results back onto it.
+
+    Tasks submitted with the same `key` supersede each other: when a newer
+    one is submitted the older one is cancelled, so e.g. only the last
+    clicked product's details get loaded into the form. `on_busy(bool)` is
+    called when the runner goes from idle to busy and back, for loading
+    indicators.
+    """
+
+    # Run tasks synchronously on the calling thread; GUI tests that drive
+    # widgets without a mainloop switch this on
+    inline = False
+
+    def __init__(self, widget, on_busy=None):
+        self.widget = widget
+        self.on_busy = on_busy
+        self._results = queue.Queue()
+        self._latest = {}
+        self._pending = 0
+        self._polling = False
+
+    @property
+    def busy(self):
+        return self._pending > 0
+
+    def submit(self, fn, *args, on_success=None, on_error=None, key=None, **kwargs):
+        task = Task(key, on_success, on_error)
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous:
+                previous.cancel()
+            self._latest[key] = task
+
+        self._set_pending(1)
+        if self.inline:
+            self._dispatch(task, *self._call(task, fn, args, kwargs))
+            return task
+
+        _get_executor().submit(self._run, task, fn, args, kwargs)
+        self._ensure_polling()
+        return task
+
+    def cancel(self, key):
+        task = self._latest.get(key)
+        if task:
+            task.cancel()
+
+    # --- Worker side ---
+
+    @staticmethod
+    def _call(task, fn, args, kwargs):
+        if task.cancelled:
+            return None, None
+        try:
+            return fn(*args, **kwargs), None
+        except Exception as e:
+            return None, e
+
+    def _run(self, task, fn, args, kwargs):
+        self._results.put((task, *self._call(task, fn, args, kwargs)))
+
+    # --- Tk side ---
+
+    def _ensure_polling(self):
+        if self._polling:
+            return
+        try:
+            self.widget.after(POLL_MS, self._poll)
+            self._polling = True
+        except Exception as e:
+            # Widget destroyed; nothing left to update
+            print(f"Task dispatch stopped: {e}")
+
+    def _poll(self):
+        self._polling = False
+        while True:
+            try:
+                task, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._dispatch(task, result, error)
+        if self._pending:
+            self._ensure_polling()
+
+    def _dispatch(self, task, result, error):
+        if task.key is not None and self._latest.get(task.key) is task:
+            del self._latest[task.key]
+        try:
+            if task.cancelled:
+                return
+            if error is not None:
+                if task.on_error:
+                    task.on_error(error)
+                else:
+                    print(f"Background task failed: {error}")
+            elif task.on_success:
+                task.on_success(result)
+        except Exception as e:
+            print(f"Error in task callback: {e}")
+        finally:
+            self._set_pending(-1)
+
+    def _set_pending(self, delta):
+        was_busy = self._pending > 0
+        self._pending += delta
+        if self.on_busy and was_busy != (self._pending > 0):
+            try:
+                self.on_busy(self._pending > 0)
+            except Exception as e:
+                print(f"Error updating loading indicator: {e}")
@@ -25,3 +25,15 @@ def mock_messagebox(monkeypatch):
     monkeypatch.setattr(messagebox, "askokcancel", lambda *args, **kwargs: True)
     monkeypatch.setattr(messagebox, "askretrycancel", lambda *args, **kwargs: False)
 
+
+@pytest.fixture(autouse=True)
+def inline_tasks(monkeypatch):
+    """Run TaskRunner work synchronously so widget tests see results immediately."""
+    from gui.tasks import TaskRunner
+    monkeypatch.setattr(TaskRunner, "inline", True)
+
+
+@pytest.fixture(autouse=True)
+def no_change_listener(monkeypatch):
+    """Controllers built in tests must not open a WebSocket to a real server."""
+    monkeypatch.setattr("client.change_listener.ws_connect", None)
@@ -85,3 +85,37 @@ def test_autosize_columns(tk_root, mock_callbacks):
         # Value "2024-01-01" (10 chars) -> 100 + 20 = 120
         # Expected max: 120
         assert frame.tree.column("date", "width") == 120
+
+
+def test_sample_rows_bounds_work_and_keeps_longest():
+    from gui.views import sample_rows
+    rows = [("2024-01-01", f"Item {i}", "1.0") for i in range(5000)]
+    rows[3333] = ("2024-01-01", "The single longest description in the set", "1.0")
+
+    sample = sample_rows(rows, limit=100)
+
+    assert len(sample) <= 100 + 3
+    assert rows[3333] in sample
+    assert sample_rows(rows[:10], limit=100) == rows[:10]
+
+
+def test_autosize_reuses_one_font(tk_root, mock_callbacks):
+    """Widths are measured with a single cached Font and memoized per text"""
+    frame = TreeFrame(
+        tk_root, ["date", "description"],
+        mock_callbacks['on_delete'], mock_callbacks['on_edit'],
+        mock_callbacks['on_search'], mock_callbacks['on_export'],
+        lambda: None, lambda: None, lambda x: None,
+        features={}
+    )
+    for _ in range(50):
+        frame.insert(("2024-01-01", "Same"))
+
+    with patch("tkinter.font.Font") as mock_font_cls:
+        mock_font_cls.return_value.measure.side_effect = lambda text: len(str(text)) * 10
+        frame.autosize_columns()
+        frame.autosize_columns()
+
+        assert mock_font_cls.call_count == 1
+        # Two headers + two distinct values, each measured once
+        assert mock_font_cls.return_value.measure.call_count == 4
@@ -0,0 +1,52 @@
+import pytest
+from unittest.mock import MagicMock
+from gui.views import TreeFrame
+
+
+@pytest.fixture
+def virtual_frame(tk_root):
+    frame = TreeFrame(
+        tk_root, ["date", "description", "price"],
+        MagicMock(), MagicMock(), MagicMock(), MagicMock(),
+        lambda: None, lambda: None, lambda x: None,
+        features={"virtual_grid": True}
+    )
+    frame._page_size = 10
+    yield frame
+    frame.destroy()
+
+
+def test_only_visible_rows_are_materialized(virtual_frame):
+    for i in range(5000):
+        virtual_frame.insert((f"2024-01-{i % 28 + 1:02d}", f"Item {i}", "1.0"), iid=str(i))
+    virtual_frame._render_window()
+
+    items = virtual_frame.tree.get_children()
+    assert len(items) == 10 + TreeFrame.OVERSCAN_ROWS
+    assert virtual_frame.tree.item(items[0], "values")[1] == "Item 0"
+
+
+def test_scrolling_recycles_items(virtual_frame):
+    for i in range(100):
+        virtual_frame.insert(("2024-01-01", f"Item {i}", "1.0"), iid=str(i))
+    virtual_frame._render_window()
+    slots_before = virtual_frame.tree.get_children()
+
+    virtual_frame._on_scrollbar("moveto", "0.5")
+
+    slots_after = virtual_frame.tree.get_children()
+    assert slots_after == slots_before
+    assert virtual_frame.tree.item(slots_after[0], "values")[1] == "Item 50"
+
+
+def test_row_api_in_virtual_mode(virtual_frame):
+    virtual_frame.insert(("2024-01-01", "A", "1.0"), iid="1")
+    virtual_frame.insert(("2024-01-02", "B", "2.0"), iid="2")
+    virtual_frame.insert(("2024-01-03", "C", "3.0"), iid="3", index=0)
+    virtual_frame.update_row("1", ("2024-01-01", "A2", "1.0"), index=2)
+    virtual_frame.delete_row("2")
+    virtual_frame._render_window()
+
+    assert virtual_frame.has_row("1") and not virtual_frame.has_row("2")
+    values = [virtual_frame.tree.item(i, "values")[1] for i in virtual_frame.tree.get_children()]
+    assert values == ["C", "A2"]
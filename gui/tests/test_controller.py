@@ -1,5 +1,6 @@
+import time
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, patch, ANY
 from gui.controller import TransactionController
 
 @pytest.fixture
@@ -43,6 +44,8 @@ def mock_materials_tab():
 def mock_model():
     with patch('gui.controller.TransactionModel') as mock_class:
         mock_instance = mock_class.return_value
+        # Not synced yet: refresh_ui does a full load
+        mock_instance.get_transaction_changes.return_value = (None, None)
         yield mock_instance
 
 def test_controller_initialization(mock_view, mock_model):
@@ -53,10 +56,25 @@ def test_controller_initialization(mock_view, mock_model):
     mock_view['input'].assert_called()
     mock_view['tree'].assert_called()
     mock_view['summary'].assert_called()
-    mock_view['analytics'].assert_called()
+    # Charts (matplotlib) wait until the Analytics tab is opened
+    mock_view['analytics'].assert_not_called()
+
+def test_analytics_frame_built_when_tab_first_shown(mock_view, mock_model):
+    mock_model.get_all_transactions.return_value = []
+    controller = TransactionController("test_table")
+    window = mock_view['window']
+
+    window.notebook.select.return_value = str(window.tab_analytics)
+    controller._on_tab_changed()
+    controller.invalidate_views("analytics")
+    controller._on_tab_changed()
+
+    mock_view['analytics'].assert_called_once_with(window.tab_analytics)
+    assert mock_view['analytics'].return_value.refresh_charts.call_count == 2
 
 def test_add_transaction_success(mock_view, mock_model):
     controller = TransactionController("test_table")
+    controller.tree_frame.has_row.return_value = False
     
     data = {
         "date": "2025-01-01",
@@ -73,9 +91,11 @@ def test_add_transaction_success(mock_view, mock_model):
     mock_model.add_transaction.assert_called_with(
         "2025-01-01", "Test Item", 5, 10.0, "income", "Test Supplier", None
     )
-    # Check UI refresh
+    # Check UI refresh: the new row is placed locally without a refetch
     controller.input_frame.clear_fields.assert_called()
-    assert mock_model.get_all_transactions.call_count == 2 # Init + Refresh
+    assert mock_model.get_all_transactions.call_count == 1 # Init only
+    controller.tree_frame.insert.assert_called()
+    assert controller.store.all()[-1]['total'] == 50.0
 
 def test_add_transaction_invalid_input(mock_view, mock_model):
     controller = TransactionController("test_table")
@@ -107,8 +127,6 @@ def test_update_transaction(mock_view, mock_model):
     mock_view['mb'].showinfo.assert_called_with("Success", "Transaction Updated")
 
 def test_prep_edit_transaction_found(mock_view, mock_model):
-    controller = TransactionController("test_table")
-    
     # Mock data in model
     mock_t = {
         'id': 99,
@@ -121,6 +139,7 @@ def test_prep_edit_transaction_found(mock_view, mock_model):
         'supplier': 'S'
     }
     mock_model.get_all_transactions.return_value = [mock_t]
+    controller = TransactionController("test_table")
     
     # Tree item values (strings mostly)
     tree_item = {
@@ -143,12 +162,12 @@ def test_prep_edit_transaction_not_found(mock_view, mock_model):
     mock_view['mb'].showerror.assert_called()
 
 def test_filter_transactions(mock_view, mock_model):
-    controller = TransactionController("test_table")
-    
     # Mock data
     t1 = {'id': 1, 'description': 'Apple', 'supplier': 'Farm A', 'transaction_date': '2025', 'quantity': 1, 'price': 1, 'transaction_type': 'income', 'total': 1}
     t2 = {'id': 2, 'description': 'Banana', 'supplier': 'Farm B', 'transaction_date': '2025', 'quantity': 1, 'price': 1, 'transaction_type': 'income', 'total': 1}
     mock_model.get_all_transactions.return_value = [t1, t2]
+    controller = TransactionController("test_table")
+    controller.tree_frame.insert.reset_mock()
     
     # 1. Filter "Apple"
     controller.filter_transactions("Apple")
@@ -165,6 +184,43 @@ def test_filter_transactions(mock_view, mock_model):
     controller.filter_transactions("Zucchini")
     assert controller.tree_frame.insert.call_count == 0
 
+    # Searching filters loaded rows; nothing is refetched
+    assert mock_model.get_all_transactions.call_count == 1
+
+def test_update_transaction_patches_row_in_place(mock_view, mock_model):
+    t1 = {'id': 7, 'description': 'Wax', 'supplier': 'S', 'transaction_date': '2025-01-01', 'quantity': 1, 'price': 5.0, 'transaction_type': 'expense', 'total': 5.0}
+    mock_model.get_all_transactions.return_value = [t1]
+    controller = TransactionController("test_table")
+    controller.tree_frame.has_row.return_value = True
+
+    data = {"date": "2025-01-01", "desc": "Wax", "qty": "2", "price": "5.0", "type": "expense", "supplier": "S"}
+    controller.update_transaction(7, data)
+
+    controller.tree_frame.update_row.assert_called_once()
+    assert controller.tree_frame.update_row.call_args[0][0] == "7"
+    assert controller.store.get(7)['total'] == 10.0
+    assert mock_model.get_all_transactions.call_count == 1
+
+def test_sale_marks_inventory_tabs_stale(mock_view, mock_model, mock_products_tab, mock_materials_tab):
+    controller = TransactionController("test_table")
+    controller._stale_views.clear()
+    mock_view['window'].notebook.select.return_value = "hidden"
+    products_tab = mock_products_tab.return_value
+    products_tab.refresh_product_list.reset_mock()
+
+    data = {"date": "2025-01-01", "desc": "Candle", "qty": "1", "price": "20", "type": "income", "supplier": "", "product_id": 3}
+    controller.add_transaction(data)
+
+    # Nothing reloads while hidden...
+    products_tab.refresh_product_list.assert_not_called()
+    assert "products" in controller._stale_views
+
+    # ...until the products tab is shown
+    mock_view['window'].notebook.select.return_value = str(mock_view['window'].tab_products)
+    controller._on_tab_changed()
+    products_tab.refresh_product_list.assert_called_once()
+    assert "products" not in controller._stale_views
+
 def test_export_csv_cancel(mock_view, mock_model):
     controller = TransactionController("test_table")
     
@@ -184,5 +240,108 @@ def test_export_csv_success(mock_view, mock_model):
     
     with patch('services.data_service.DataService.export_to_csv') as mock_export:
         controller.export_csv()
-        mock_export.assert_called_with("C:/test.csv", [{'id':1}])
+        mock_export.assert_called_with("C:/test.csv", [{'id':1}], progress_callback=ANY)
         mock_view['mb'].showinfo.assert_called()
+
+def test_import_csv_posts_new_rows_in_one_request(mock_view, mock_model):
+    controller = TransactionController("test_table")
+    mock_view['fd'].askopenfilename.return_value = "C:/in.csv"
+    mock_model.add_transactions_bulk.return_value = 1
+    new_items = [{'date': '2025-01-01', 'description': 'Wax', 'quantity': 1, 'price': 5.0, 'type': 'expense', 'supplier': ''}]
+
+    with patch('services.data_service.DataService.import_data', return_value=new_items) as mock_import:
+        controller.import_csv()
+
+    assert mock_import.call_args.kwargs['progress_callback'] is not None
+    mock_model.add_transactions_bulk.assert_called_once_with(new_items)
+    mock_view['mb'].showinfo.assert_called_with("Success", "Imported 1 new transactions.")
+
+
+def test_refresh_applies_delta_after_first_load(mock_view, mock_model):
+    mock_model.get_all_transactions.return_value = [
+        {'id': 1, 'transaction_date': '2025-01-01', 'description': 'Wax', 'quantity': 1,
+         'price': 5.0, 'transaction_type': 'expense', 'total': 5.0, 'supplier': ''},
+        {'id': 2, 'transaction_date': '2025-01-02', 'description': 'Wick', 'quantity': 1,
+         'price': 1.0, 'transaction_type': 'expense', 'total': 1.0, 'supplier': ''}
+    ]
+    controller = TransactionController("test_table")
+    mock_model.begin_sync.assert_called_once()
+
+    mock_model.get_transaction_changes.return_value = ({
+        "upserts": [{'id': 1, 'transaction_date': '2025-01-01', 'description': 'Soy Wax', 'quantity': 2,
+                     'price': 5.0, 'transaction_type': 'expense', 'total': 10.0, 'supplier': ''}],
+        "deleted": [2]
+    }, "t2")
+    controller.refresh_ui()
+
+    # Merged in place; no second full load
+    assert mock_model.get_all_transactions.call_count == 1
+    assert [(t['id'], t['description']) for t in controller.store.all()] == [(1, 'Soy Wax')]
+
+def test_remote_changes_use_the_delta_path(mock_view, mock_model):
+    mock_model.get_all_transactions.return_value = [
+        {'id': 1, 'transaction_date': '2025-01-01', 'description': 'Wax', 'quantity': 1,
+         'price': 5.0, 'transaction_type': 'Expense', 'total': 5.0, 'supplier': ''}
+    ]
+    controller = TransactionController("test_table")
+    mock_model.get_all_transactions.reset_mock()
+    mock_model.get_transaction_changes.return_value = ({"upserts": [], "deleted": [1]}, "t2")
+
+    controller.apply_remote_changes([{"table": "transactions", "id": 1, "op": "delete"}])
+
+    mock_model.get_all_transactions.assert_not_called()
+    assert len(controller.store) == 0
+
+def test_remote_product_change_marks_views_stale(mock_view, mock_model):
+    controller = TransactionController("test_table")
+    mock_model.get_transaction_changes.reset_mock()
+
+    controller.apply_remote_changes([{"table": "products", "id": 3, "op": "update"}])
+
+    mock_model.get_transaction_changes.assert_not_called()
+    assert "products" in controller._stale_views
+
+def test_remote_resync_refreshes_everything(mock_view, mock_model):
+    controller = TransactionController("test_table")
+    with patch.object(controller, "refresh_ui") as refresh:
+        controller.apply_remote_changes([{"op": "resync"}, {"table": "materials", "id": 1, "op": "update"}])
+        controller.apply_remote_changes([])
+    refresh.assert_called_once()
+
+def wait_for_results(tasks, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while tasks._results.qsize() < count:
+        assert time.monotonic() < deadline, "background tasks did not finish"
+        time.sleep(0.01)
+
+def test_superseded_delta_does_not_advance_sync_token(mock_view, monkeypatch):
+    from gui.tasks import TaskRunner
+    row = {'id': 1, 'transaction_date': '2025-01-01', 'description': 'Wax', 'quantity': 1,
+           'price': 5.0, 'transaction_type': 'expense', 'total': 5.0, 'supplier': ''}
+    edited = dict(row, description='Soy Wax')
+    with patch('gui.models.APIClient') as api:
+        api.get_changes.return_value = {"token": "t1", "full": True}
+        api.get_all_transactions.return_value = [row]
+        controller = TransactionController("test_table")
+        assert controller.model.sync_token == "t1"
+
+        tokens = iter(["t2", "t3"])
+        api.get_changes.side_effect = lambda since, tables: {
+            "token": next(tokens), "full": False, "transactions": {"upserts": [edited], "deleted": []}
+        }
+        # Real worker threads; results are dispatched when we poll
+        monkeypatch.setattr(TaskRunner, "inline", False)
+        controller.tasks.widget = MagicMock()
+        controller.apply_remote_changes([{"table": "transactions", "id": 1, "op": "update"}])
+        first = controller.tasks._latest["transactions"]
+        # Let the first fetch finish before superseding it
+        wait_for_results(controller.tasks, 1)
+        controller.refresh_ui()  # second fetch + product choices
+        wait_for_results(controller.tasks, 3)
+        controller.tasks._poll()
+
+    assert first.cancelled
+    # Both fetches read from t1; only the applied one moved the token
+    assert [c.kwargs["since"] for c in api.get_changes.call_args_list[-2:]] == ["t1", "t1"]
+    assert controller.model.sync_token == "t3"
+    assert controller.store.all()[0]['description'] == 'Soy Wax'
@@ -0,0 +1,49 @@
+import sys
+import types
+
+from gui.lazy import LazyClass
+
+
+def _fake_module(monkeypatch, imports):
+    module = types.ModuleType("fake_tab_module")
+
+    class FakeTab:
+        def __init__(self, parent):
+            self.parent = parent
+
+        @staticmethod
+        def helper():
+            return "static"
+
+    module.FakeTab = FakeTab
+    imports.append(module)
+    monkeypatch.setitem(sys.modules, "fake_tab_module", module)
+    return FakeTab
+
+
+def test_module_not_imported_until_used(monkeypatch):
+    monkeypatch.delitem(sys.modules, "fake_tab_module", raising=False)
+    lazy = LazyClass("fake_tab_module", "FakeTab")
+
+    assert not lazy.loaded
+    imports = []
+    fake_cls = _fake_module(monkeypatch, imports)
+
+    tab = lazy("parent")
+    assert isinstance(tab, fake_cls)
+    assert tab.parent == "parent"
+    assert lazy.loaded
+
+
+def test_attribute_access_loads_class(monkeypatch):
+    _fake_module(monkeypatch, [])
+    lazy = LazyClass("fake_tab_module", "FakeTab")
+
+    assert lazy.helper() == "static"
+    assert lazy.load() is sys.modules["fake_tab_module"].FakeTab
+
+
+def test_controller_does_not_import_charts():
+    import gui.controller
+    assert isinstance(gui.controller.AnalyticsFrame, LazyClass)
+    assert gui.controller.AnalyticsFrame._module == "gui.charts"
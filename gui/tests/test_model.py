@@ -45,3 +45,109 @@ def test_model_delete(mock_api):
     model.delete_transaction(t_id)
     
     mock_api.delete_transaction.assert_called_with(t_id)
+
+
+from gui.models import TransactionStore
+
+
+def make_rows():
+    return [
+        {'id': 1, 'transaction_date': '2025-01-03', 'description': 'Soy Wax', 'supplier': 'Candle Co', 'price': '12.50'},
+        {'id': 2, 'transaction_date': '2025-01-01', 'description': 'Rose Candle', 'supplier': None, 'price': '35.00'},
+        {'id': 3, 'transaction_date': '2025-01-02', 'description': 'Wicks', 'supplier': 'WickWorld', 'price': '4.00'},
+    ]
+
+
+def test_store_sorts_from_index():
+    store = TransactionStore(make_rows())
+
+    assert [r['id'] for r in store.query(sort_key='transaction_date')] == [2, 3, 1]
+    assert [r['id'] for r in store.query(sort_key='transaction_date', reverse=True)] == [1, 3, 2]
+    # DECIMAL values arrive as strings but still sort numerically
+    assert [r['id'] for r in store.query(sort_key='price')] == [3, 1, 2]
+    # None sorts first
+    assert [r['id'] for r in store.query(sort_key='supplier')] == [2, 1, 3]
+
+
+def test_store_search_matches_description_or_supplier():
+    store = TransactionStore(make_rows())
+
+    assert [r['id'] for r in store.query('candle', sort_key='transaction_date')] == [2, 1]
+    # Narrowing the previous search keeps the order
+    assert [r['id'] for r in store.query('candle c', sort_key='transaction_date')] == [1]
+    assert store.query('zucchini') == []
+
+
+def test_store_narrowing_search_reuses_previous_candidates():
+    store = TransactionStore(make_rows())
+    store.query('candle', sort_key='transaction_date')
+
+    with patch.object(store, '_ordered', wraps=store._ordered) as ordered:
+        assert [r['id'] for r in store.query('candle c', sort_key='transaction_date')] == [1]
+        ordered.assert_not_called()
+
+        # A different search or sort starts again from the full index
+        store.query('wicks', sort_key='transaction_date')
+        store.query('wicks', sort_key='price')
+        assert ordered.call_count == 2
+
+
+def test_store_keeps_indexes_current_on_mutation():
+    store = TransactionStore(make_rows())
+    store.query(sort_key='price')  # build the index
+
+    new = store.add({'id': 4, 'transaction_date': '2025-01-04', 'description': 'Jar', 'supplier': 'Glass', 'price': '8.00'})
+    assert [r['id'] for r in store.query(sort_key='price')] == [3, 4, 1, 2]
+    assert store.index_of(new, sort_key='price') == 1
+    assert store.index_of(new, 'wax', sort_key='price') is None
+
+    store.update(3, {'price': '99.00', 'description': 'Premium Wicks'})
+    assert [r['id'] for r in store.query(sort_key='price')] == [4, 1, 2, 3]
+    assert [r['id'] for r in store.query('premium')] == [3]
+
+    store.remove(1)
+    assert [r['id'] for r in store.query(sort_key='price', reverse=True)] == [3, 2, 4]
+    assert len(store) == 3
+
+
+def test_store_apply_changes_merges_by_id():
+    store = TransactionStore(make_rows())
+    store.query(sort_key='price')  # build the index
+
+    applied = store.apply_changes(
+        upserts=[
+            {'id': 3, 'transaction_date': '2025-01-02', 'description': 'Cotton Wicks', 'supplier': 'WickWorld', 'price': '50.00'},
+            {'id': 5, 'transaction_date': '2025-01-05', 'description': 'Tin', 'supplier': None, 'price': '2.00'},
+        ],
+        deleted=[1, 42]
+    )
+
+    assert applied
+    assert [r['id'] for r in store.query(sort_key='price')] == [5, 2, 3]
+    assert [r['id'] for r in store.query('cotton')] == [3]
+    # Replaying the same delta changes nothing
+    store.apply_changes(upserts=[{'id': 5, 'transaction_date': '2025-01-05', 'description': 'Tin', 'supplier': None, 'price': '2.00'}], deleted=[1])
+    assert len(store) == 3
+    assert not store.apply_changes()
+
+
+def test_model_sync_token_lifecycle(mock_api):
+    model = TransactionModel(TEST_TABLE)
+    assert model.get_transaction_changes() == (None, None)
+    mock_api.get_changes.assert_not_called()
+
+    mock_api.get_changes.return_value = {"token": "t1", "full": True}
+    assert model.begin_sync() == "t1"
+    # The caller stores the token once the load is applied
+    assert model.sync_token is None
+    model.sync_token = "t1"
+
+    delta = {"upserts": [{'id': 1}], "deleted": []}
+    mock_api.get_changes.return_value = {"token": "t2", "full": False, "transactions": delta}
+    assert model.get_transaction_changes() == (delta, "t2")
+    mock_api.get_changes.assert_called_with(since="t1", tables=["transactions"])
+    assert model.sync_token == "t1"
+
+    # Expired token: the caller must reload
+    mock_api.get_changes.return_value = {"token": "t3", "full": True}
+    assert model.get_transaction_changes() == (None, None)
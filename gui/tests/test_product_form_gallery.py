@@ -0,0 +1,47 @@
+from unittest.mock import MagicMock, patch
+
+from gui.forms.product_form import ProductForm
+from gui.tasks import TaskRunner
+
+
+def make_form(product_id):
+    """ProductForm without widgets: only the state the gallery actions use."""
+    form = ProductForm.__new__(ProductForm)
+    form.tasks = TaskRunner(MagicMock())
+    form.display_main_image = MagicMock()
+    form.current_product_id = product_id
+    form.image_data = None
+    return form
+
+
+def test_set_main_from_saved_gallery_image_uploads_the_original():
+    form = make_form(3)
+    with patch("gui.forms.product_form.APIClient") as api:
+        api.get_image.return_value = b"full-size"
+
+        form.set_main_image_from_gallery(b"thumbnail", image_id=8)
+
+    # No size: the original, not the gallery thumbnail the tile shows
+    api.get_image.assert_called_once_with(8)
+    api.update_product.assert_called_once_with(3, {"image": b"full-size"})
+    assert form.image_data == b"full-size"
+
+
+def test_failed_original_fetch_keeps_the_main_image():
+    form = make_form(3)
+    with patch("gui.forms.product_form.APIClient") as api:
+        api.get_image.return_value = None
+
+        form.set_main_image_from_gallery(b"thumbnail", image_id=8)
+
+    api.update_product.assert_not_called()
+    assert form.image_data is None
+
+
+def test_pending_gallery_image_uses_its_own_bytes():
+    form = make_form(None)
+    with patch("gui.forms.product_form.APIClient") as api:
+        form.set_main_image_from_gallery(b"picked-file", image_id="temp_1")
+
+    api.get_image.assert_not_called()
+    assert form.image_data == b"picked-file"
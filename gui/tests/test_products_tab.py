@@ -75,6 +75,7 @@ def mock_api():
         for m in [mock_1, mock_2, mock_3]:
             m.get_products.return_value = []
             m.get_product_images.return_value = []
+            m.list_product_images.return_value = []
             m.add_product.return_value = {'id': 999}
             
         yield mock_1 
@@ -120,8 +121,8 @@ def test_update_product_logic(products_tab, mock_api):
         mock_api.update_product.assert_called_with(123, {"id": 123, "title": "Updated Product"})
         mock_info.assert_called_with("Success", "Product Updated")
 
-def test_on_select_populates_form(products_tab):
-    """Test that selecting a product calls load_product on form"""
+def test_on_select_populates_form(products_tab, mock_api):
+    """Test that selecting a product loads the full record into the form"""
     # Mock selection
     mock_tree = products_tab.tree
     mock_tree.selection.return_value = ["item1"]
@@ -129,15 +130,30 @@ def test_on_select_populates_form(products_tab):
     
     # Mock product list
     mock_product = {'id': 101, 'title': 'Test Pro'}
-    products_tab.products = [mock_product]
+    products_tab.products = [{'id': 101, 'title': 'Test Pro'}]
+    mock_api.get_product.return_value = mock_product
     
     # Mock form.load_product
     products_tab.form.load_product = MagicMock()
     
     products_tab.on_product_select(None)
     
+    mock_api.get_product.assert_called_with('101')
     products_tab.form.load_product.assert_called_with(mock_product)
 
+def test_on_select_falls_back_to_list_row(products_tab, mock_api):
+    """If the detail fetch fails the summary row is still shown"""
+    products_tab.tree.selection.return_value = ["item1"]
+    products_tab.tree.item.return_value = {'values': [101]}
+    row = {'id': 101, 'title': 'Test Pro'}
+    products_tab.products = [row]
+    mock_api.get_product.return_value = None
+    products_tab.form.load_product = MagicMock()
+
+    products_tab.on_product_select(None)
+
+    products_tab.form.load_product.assert_called_with(row)
+
 def test_form_calculate_cogs(products_tab):
     """Test the calculation logic inside the embedded form"""
     form = products_tab.form
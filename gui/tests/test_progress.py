@@ -0,0 +1,51 @@
+import pytest
+from gui.progress import ProgressChannel, JobCancelled, run_with_progress
+
+
+def test_channel_throttles_but_keeps_final_update():
+    channel = ProgressChannel(min_interval=60)
+    for i in range(1, 101):
+        channel(i, 100, f"row {i}")
+
+    # Only the first and the final update are queued; drain returns the newest
+    assert channel._updates.qsize() == 2
+    assert channel.drain() == (100, 100, "row 100")
+    assert channel.drain() is None
+
+
+def test_channel_raises_after_cancel():
+    channel = ProgressChannel(min_interval=0)
+    channel(1, 10, "working")
+    channel.cancel()
+
+    assert channel.cancelled
+    assert channel.cancel_event.is_set()
+    with pytest.raises(JobCancelled):
+        channel(2, 10, "working")
+
+
+def test_run_with_progress_dispatches_result():
+    results = []
+    channel = run_with_progress(None, "Job", lambda progress: progress(1, 1, "done") or 42,
+                                on_success=results.append)
+
+    assert results == [42]
+    assert channel.drain() == (1, 1, "done")
+
+
+def test_run_with_progress_routes_errors_and_cancel():
+    errors, cancelled = [], []
+
+    def failing(progress):
+        raise ValueError("bad file")
+
+    def cancelling(progress):
+        progress.cancel()
+        progress(1, 2, "next row")
+
+    run_with_progress(None, "Job", failing, on_success=pytest.fail, on_error=errors.append)
+    run_with_progress(None, "Job", cancelling, on_success=pytest.fail,
+                      on_error=pytest.fail, on_cancel=lambda: cancelled.append(True))
+
+    assert [str(e) for e in errors] == ["bad file"]
+    assert cancelled == [True]
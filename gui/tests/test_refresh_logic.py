@@ -23,14 +23,22 @@ def mock_controller(mocker):
     ctrl = TransactionController("transactions_test")
     return ctrl
 
-def test_refresh_ui_calls_tabs(mock_controller):
+def test_refresh_ui_refreshes_tabs_when_shown(mock_controller):
     # Setup mocks
-    mock_controller.products_tab = MagicMock()
-    mock_controller.materials_tab = MagicMock()
+    products_tab = MagicMock()
+    materials_tab = MagicMock()
+    mock_controller._lazy_views["products"] = ("products_page", products_tab.refresh_product_list)
+    mock_controller._lazy_views["materials"] = ("materials_page", materials_tab.refresh)
+    mock_controller.view.notebook.select.return_value = "transactions_page"
     
-    # Call refresh_ui
+    # Call refresh_ui: hidden tabs are only marked stale
     mock_controller.refresh_ui()
+    products_tab.refresh_product_list.assert_not_called()
+    materials_tab.refresh.assert_not_called()
     
-    # Verify calls
-    mock_controller.products_tab.refresh_product_list.assert_called_once()
-    mock_controller.materials_tab.refresh.assert_called_once()
+    # Showing a tab refreshes it once
+    mock_controller.view.notebook.select.return_value = "products_page"
+    mock_controller._on_tab_changed()
+    mock_controller._on_tab_changed()
+    products_tab.refresh_product_list.assert_called_once()
+    materials_tab.refresh.assert_not_called()
@@ -0,0 +1,117 @@
+import threading
+import pytest
+from gui.tasks import TaskRunner
+
+
+class FakeWidget:
+    """Records after() callbacks so tests can pump them like a mainloop."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def pump(self, timeout=2.0):
+        import time
+        deadline = time.time() + timeout
+        while self.callbacks and time.time() < deadline:
+            callback = self.callbacks.pop(0)
+            callback()
+            if self.callbacks:
+                time.sleep(0.005)
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    monkeypatch.setattr(TaskRunner, "inline", False)
+    return TaskRunner(FakeWidget())
+
+
+def test_result_dispatched_through_after(runner):
+    results = []
+    caller = threading.current_thread()
+    runner.submit(lambda x: x * 2, 21, on_success=lambda r: results.append((r, threading.current_thread())))
+
+    # Nothing is delivered until the Tk side polls
+    assert results == []
+    runner.widget.pump()
+
+    assert results == [(42, caller)]
+    assert not runner.busy
+
+
+def test_error_goes_to_on_error(runner):
+    errors = []
+
+    def boom():
+        raise ValueError("bad")
+
+    runner.submit(boom, on_success=lambda r: pytest.fail("unexpected success"), on_error=errors.append)
+    runner.widget.pump()
+
+    assert len(errors) == 1
+    assert str(errors[0]) == "bad"
+
+
+def test_newer_task_with_same_key_supersedes(runner):
+    gate = threading.Event()
+    results = []
+
+    runner.submit(lambda: gate.wait(2) and "old", key="detail", on_success=results.append)
+    runner.submit(lambda: "new", key="detail", on_success=results.append)
+    gate.set()
+    runner.widget.pump()
+
+    assert results == ["new"]
+    assert not runner.busy
+
+
+def test_cancel_drops_result(runner):
+    gate = threading.Event()
+    results = []
+
+    runner.submit(lambda: gate.wait(2), key="products", on_success=results.append)
+    runner.cancel("products")
+    gate.set()
+    runner.widget.pump()
+
+    assert results == []
+
+
+def test_on_busy_transitions(monkeypatch):
+    monkeypatch.setattr(TaskRunner, "inline", False)
+    states = []
+    runner = TaskRunner(FakeWidget(), on_busy=states.append)
+
+    runner.submit(lambda: 1)
+    runner.submit(lambda: 2)
+    assert runner.busy
+    runner.widget.pump()
+
+    # One transition each way, not one per task
+    assert states == [True, False]
+
+
+def test_callback_exception_does_not_stop_dispatch(runner):
+    results = []
+
+    def bad_callback(_):
+        raise RuntimeError("callback failed")
+
+    runner.submit(lambda: 1, on_success=bad_callback)
+    runner.submit(lambda: 2, on_success=results.append)
+    runner.widget.pump()
+
+    assert results == [2]
+    assert not runner.busy
+
+
+def test_inline_mode_runs_synchronously():
+    # conftest switches inline on for widget tests
+    results = []
+    runner = TaskRunner(FakeWidget())
+    runner.submit(lambda: "now", on_success=results.append)
+
+    assert results == ["now"]
+    assert runner.widget.callbacks == []
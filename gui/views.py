@@ -5,11 +5,11 @@ import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from datetime import datetime
 from config.config import TREE_COLUMNS, TRANSACTION_TYPES, BUTTON_ADD, BUTTON_CLEAR, UI_LABELS, UI_BUTTONS
-from gui.charts import AnalyticsFrame
-from gui.tabs.products_tab import ProductsTab
-from gui.tabs.materials_tab import MaterialsTab
-from gui.tabs.marketplace_tab import MarketplaceTab
-from gui.tabs.shipping_tab import ShippingTab
+from gui.lazy import LazyClass
+
+# Imported when MainWindow builds the tab, i.e. only if its feature is on
+MarketplaceTab = LazyClass("gui.tabs.marketplace_tab", "MarketplaceTab")
+ShippingTab = LazyClass("gui.tabs.shipping_tab", "ShippingTab")
 
 class InputFrame(tb.Frame):
     def __init__(self, parent, transaction_types, on_add, on_clear, on_update):
@@ -183,7 +183,41 @@ class InputFrame(tb.Frame):
         self.btn_add.configure(text=UI_BUTTONS.get("update", "Update Transaction"), bootstyle="warning")
 
 
+# Autosize measures at most this many rows per column (plus each column's
+# longest value), so resizing cost does not grow with the dataset
+AUTOSIZE_SAMPLE_ROWS = 200
+# Memoized text widths are dropped past this many entries
+WIDTH_CACHE_MAX = 10000
+
+
+def sample_rows(rows, limit=AUTOSIZE_SAMPLE_ROWS):
+    """
+    Evenly spaced sample of `rows` (sequences of cell values) for measuring,
+    always including the row with the longest text in each column.
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows
+    step = len(rows) / limit
+    picked = {int(i * step) for i in range(limit)}
+    for col in range(len(rows[0])):
+        picked.add(max(range(len(rows)), key=lambda r: len(str(rows[r][col]))))
+    return [rows[i] for i in sorted(picked)]
+
+
 class TreeFrame(tb.Frame):
+    """
+    Transactions grid.
+
+    With the "virtual_grid" feature on, rows live in a Python list and the
+    Treeview only holds enough items to fill the visible area; scrolling
+    reuses those items with the next slice of rows. The public row methods
+    (insert/update_row/delete_row/clear) behave the same in both modes.
+    """
+
+    # Extra items kept beyond the visible rows so partial rows still render
+    OVERSCAN_ROWS = 2
+
     def __init__(self, parent, columns, on_delete, on_edit, on_search, on_export, on_import, on_refresh, on_sort, features=None):
         super().__init__(parent, padding=10)
         self.features = features or {}
@@ -194,6 +228,11 @@ class TreeFrame(tb.Frame):
         self.on_import = on_import
         self.on_refresh = on_refresh
         self.on_sort = on_sort
+        self.virtual = self.features.get("virtual_grid", False)
+
+        # Autosize state: one Font object and memoized text widths
+        self._font = None
+        self._width_cache = {}
 
         # -- Toolbar --
         toolbar = tb.Frame(self)
@@ -219,11 +258,15 @@ class TreeFrame(tb.Frame):
 
         # -- Treeview --
         self.tree = tb.Treeview(self, columns=columns, show='headings', bootstyle="primary")
-        scrollbar = tb.Scrollbar(self, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
+        if self.virtual:
+            self.scrollbar = tb.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+            self._init_virtual()
+        else:
+            self.scrollbar = tb.Scrollbar(self, orient="vertical", command=self.tree.yview)
+            self.tree.configure(yscroll=self.scrollbar.set)
         
         self.tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
+        self.scrollbar.pack(side='right', fill='y')
 
         for col in columns:
             self.tree.heading(col, text=col.capitalize(), command=lambda c=col: self.on_sort(c))
@@ -255,26 +298,209 @@ class TreeFrame(tb.Frame):
         if selected:
             self.on_delete(self.tree.item(selected[0]))
 
+    # --- Row API ---
+
     def clear(self):
+        if self.virtual:
+            self._rows = []
+            self._row_ids = set()
+            self._offset = 0
+            self._selected_row = None
+            self._schedule_render()
+            return
         for item in self.tree.get_children():
             self.tree.delete(item)
 
-    def insert(self, values):
-        self.tree.insert('', 'end', values=values)
+    def insert(self, values, iid=None, index='end'):
+        if self.virtual:
+            if iid is None:
+                iid = f"row{self._next_row_id}"
+                self._next_row_id += 1
+            if index == 'end':
+                self._rows.append((iid, values))
+            else:
+                self._rows.insert(index, (iid, values))
+            self._row_ids.add(iid)
+            self._schedule_render()
+            return
+        self.tree.insert('', index, iid=iid, values=values)
+
+    def has_row(self, iid):
+        if self.virtual:
+            return iid in self._row_ids
+        return self.tree.exists(iid)
+
+    def update_row(self, iid, values, index=None):
+        """Replace one row's values, optionally moving it to a new position."""
+        if self.virtual:
+            pos = self._row_position(iid)
+            if pos is None:
+                return
+            del self._rows[pos]
+            self._rows.insert(pos if index is None else index, (iid, values))
+            self._schedule_render()
+            return
+        self.tree.item(iid, values=values)
+        if index is not None:
+            self.tree.move(iid, '', index)
+
+    def delete_row(self, iid):
+        if self.virtual:
+            pos = self._row_position(iid)
+            if pos is not None:
+                del self._rows[pos]
+                self._row_ids.discard(iid)
+                self._schedule_render()
+            return
+        if self.tree.exists(iid):
+            self.tree.delete(iid)
+
+    # --- Virtual mode ---
+
+    def _init_virtual(self):
+        self._rows = []          # [(row id, values)] in display order
+        self._row_ids = set()
+        self._next_row_id = 0
+        self._offset = 0         # index of the first visible row
+        self._page_size = 30     # recomputed from the widget height
+        self._slots = []         # recycled Treeview item ids
+        self._selected_row = None
+        self._render_pending = False
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self._scroll_rows(-1 if e.delta > 0 else 1, 3))
+        self.tree.bind("<Button-4>", lambda e: self._scroll_rows(-1, 3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_rows(1, 3))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._scroll_rows(-1, self._page_size))
+        self.tree.bind("<Next>", lambda e: self._scroll_rows(1, self._page_size))
+
+    def _row_position(self, iid):
+        if iid not in self._row_ids:
+            return None
+        return next((i for i, (row_id, _) in enumerate(self._rows) if row_id == iid), None)
+
+    def _row_height(self):
+        try:
+            return int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        except (tk.TclError, ValueError):
+            return 20
+
+    def _on_resize(self, event):
+        page_size = max(1, event.height // self._row_height())
+        if page_size != self._page_size:
+            self._page_size = page_size
+            self._render_window()
+
+    def _max_offset(self):
+        return max(0, len(self._rows) - self._page_size)
+
+    def _scroll_rows(self, direction, count):
+        self._set_offset(self._offset + direction * count)
+        return "break"
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self._set_offset(int(float(args[0]) * len(self._rows)))
+        elif action == "scroll":
+            amount, what = int(args[0]), args[1]
+            self._scroll_rows(amount, self._page_size if what == "pages" else 1)
+
+    def _set_offset(self, offset):
+        offset = min(max(0, offset), self._max_offset())
+        if offset != self._offset:
+            self._offset = offset
+            self._render_window()
+
+    def _schedule_render(self):
+        # Coalesce bursts of row changes (e.g. a full reload) into one render
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render_window)
+
+    def _render_window(self):
+        self._render_pending = False
+        self._offset = min(self._offset, self._max_offset())
+        wanted = min(len(self._rows), self._page_size + self.OVERSCAN_ROWS)
+
+        while len(self._slots) < wanted:
+            self._slots.append(self.tree.insert('', 'end', values=()))
+
+        selected_slot = None
+        for i, slot in enumerate(self._slots):
+            pos = self._offset + i
+            if i < wanted:
+                row_id, values = self._rows[pos]
+                self.tree.item(slot, values=values)
+                self.tree.move(slot, '', i)
+                if row_id == self._selected_row:
+                    selected_slot = slot
+            else:
+                self.tree.detach(slot)
+
+        # Selection follows the row, not the recycled item
+        if selected_slot:
+            self.tree.selection_set(selected_slot)
+        else:
+            self.tree.selection_set(())
+
+        total = len(self._rows)
+        if total:
+            self.scrollbar.set(self._offset / total, min(1.0, (self._offset + self._page_size) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_select(self, event=None):
+        selected = self.tree.selection()
+        if not selected or selected[0] not in self._slots:
+            return
+        pos = self._offset + self._slots.index(selected[0])
+        if pos < len(self._rows):
+            self._selected_row = self._rows[pos][0]
+
+    def _move_selection(self, step):
+        pos = self._row_position(self._selected_row)
+        pos = 0 if pos is None else min(max(0, pos + step), len(self._rows) - 1)
+        if not self._rows:
+            return "break"
+        self._selected_row = self._rows[pos][0]
+        if pos < self._offset:
+            self._offset = pos
+        elif pos >= self._offset + self._page_size:
+            self._offset = pos - self._page_size + 1
+        self._render_window()
+        return "break"
+
+    # --- Column sizing ---
+
+    def _text_width(self, text):
+        width = self._width_cache.get(text)
+        if width is None:
+            if len(self._width_cache) >= WIDTH_CACHE_MAX:
+                self._width_cache.clear()
+            if self._font is None:
+                self._font = tk.font.Font()
+            width = self._font.measure(text)
+            self._width_cache[text] = width
+        return width
 
     def autosize_columns(self):
-        """Automatically adjust column widths based on content"""
+        """Automatically adjust column widths based on a sample of the content"""
+        columns = self.tree['columns']
+        if self.virtual:
+            rows = [values for _, values in self._rows]
+        else:
+            rows = [self.tree.item(item, 'values') for item in self.tree.get_children()]
+
         # Dictionary to store max width for each column (start with header width)
-        col_widths = {}
-        for col in self.tree['columns']:
-            col_widths[col] = tk.font.Font().measure(col.title()) + 20
+        col_widths = {col: self._text_width(col.title()) + 20 for col in columns}
 
-        # Iterate through all items to find max width
-        for item in self.tree.get_children():
-            values = self.tree.item(item, 'values')
-            for i, col in enumerate(self.tree['columns']):
+        for values in sample_rows(rows):
+            for i, col in enumerate(columns):
                 # Measure text width
-                val_width = tk.font.Font().measure(str(values[i])) + 20
+                val_width = self._text_width(str(values[i])) + 20
                 if val_width > col_widths[col]:
                     col_widths[col] = val_width
 
@@ -1,12 +1,26 @@
 import sys
+
+# Installed before anything heavy is imported so the breakdown covers it all
+if "--profile-startup" in sys.argv:
+    from startup_profile import ImportProfiler
+    profiler = ImportProfiler().install()
+else:
+    profiler = None
+
 import subprocess
 import time
 import os
 import multiprocessing
-import uvicorn
-from gui.controller import TransactionController
-from config.config import TABLE_NAME, SERVER_HOST, SERVER_PORT, TRANSACTIONS_SCHEMA, PRODUCTS_TABLE_NAME, PRODUCTS_SCHEMA, MATERIALS_TABLE, MATERIALS_SCHEMA
-from db.init_db import init_db
+import socket
+from config.config import TABLE_NAME, SERVER_HOST, SERVER_PORT, SERVER_READY_TIMEOUT, SERVER_MODE, PRODUCTS_TABLE_NAME, MATERIALS_TABLE
+
+# The GUI (Tk, ttkbootstrap, tabs) and the server (uvicorn, FastAPI, routes)
+# are imported inside the functions below, so each run mode only loads
+# what it uses.
+
+def report_startup(label):
+    if profiler:
+        profiler.report(label)
 
 def start_server():
     """Start the FastAPI server as a subprocess"""
@@ -15,6 +29,8 @@ def start_server():
     
     server_args = [sys.executable, __file__] if not getattr(sys, 'frozen', False) else [sys.executable]
     server_args.append("--server")
+    if profiler:
+        server_args.append("--profile-startup")
     
     process = subprocess.Popen(
         server_args
@@ -22,7 +38,11 @@ def start_server():
     print(f"Server started with PID: {process.pid}")
     return process
 
-from server.main import app as server_app
+def start_embedded_server():
+    """Run the FastAPI server on a background thread of this process"""
+    from server.main import app as server_app
+    from server.embedded import EmbeddedServer
+    return EmbeddedServer(server_app, SERVER_HOST, SERVER_PORT).start()
 
 def run_server_process():
     """Function to run the uvicorn server directly"""
@@ -32,10 +52,26 @@ def run_server_process():
     if sys.stderr is None:
         sys.stderr = open(os.devnull, 'w')
 
+    import uvicorn
+    from server.main import app as server_app
+    report_startup("server")
+
     # Pass the app object directly instead of a string to avoid import errors in frozen exe
     uvicorn.run(server_app, host=SERVER_HOST, port=SERVER_PORT, log_level="info", use_colors=False)
 
-import socket
+def run_gui():
+    from gui.controller import TransactionController
+    app = TransactionController(TABLE_NAME)
+    report_startup("gui")
+    app.run()
+
+def prepare_database():
+    """Apply pending schema migrations; a no-op single query when up to date."""
+    try:
+        from db.migrate import migrate
+        migrate()
+    except Exception as e:
+        print(f"Database initialization failed: {e}")
 
 def is_port_in_use(port):
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -51,39 +87,44 @@ if __name__ == "__main__":
     elif "--client" in sys.argv:
         # 2. Run Client Only (Expects server running elsewhere)
         print("Starting GUI (Client Only)...")
-        init_db(TABLE_NAME, TRANSACTIONS_SCHEMA)
-        init_db(PRODUCTS_TABLE_NAME, PRODUCTS_SCHEMA) 
-        init_db(MATERIALS_TABLE, MATERIALS_SCHEMA) 
+        prepare_database()
         try:
-            app = TransactionController(TABLE_NAME)
-            app.run()
+            run_gui()
         except Exception as e:
             print(f"Application error: {e}")
 
     else:
         # 3. Default: Run Both (Server + Client)
-        init_db(TABLE_NAME, TRANSACTIONS_SCHEMA)
-        init_db(PRODUCTS_TABLE_NAME, PRODUCTS_SCHEMA)
-        init_db(MATERIALS_TABLE, MATERIALS_SCHEMA)
-        
         # DEBUG: Print environment info
         is_frozen_state = getattr(sys, 'frozen', False)
         print(f"DEBUG: sys.frozen={is_frozen_state}")
         print(f"DEBUG: Using Tables -> Transactions: '{TABLE_NAME}', Products: '{PRODUCTS_TABLE_NAME}', Materials: '{MATERIALS_TABLE}'")
 
         server_process = None
+        embedded_server = None
         if is_port_in_use(SERVER_PORT):
             print(f"Port {SERVER_PORT} is already in use. Assuming Server is running.")
+        elif SERVER_MODE == "embedded":
+            print("Starting AurumCandles Server (embedded)...")
+            embedded_server = start_embedded_server()
         else:
             print("Starting AurumCandles Server...")
             server_process = start_server()
-            # Wait for server to be ready
-            time.sleep(3)
+
+        # Migrate while the server boots; /health/ready stays 503 until this is done
+        prepare_database()
+
+        # Wait for server to be ready
+        from client.api_client import APIClient
+        start = time.monotonic()
+        if APIClient.wait_until_ready(timeout=SERVER_READY_TIMEOUT):
+            print(f"Server ready after {time.monotonic() - start:.2f}s")
+        else:
+            print(f"Server not ready after {SERVER_READY_TIMEOUT:.0f}s. Starting GUI anyway...")
         
         try:
             print("Starting GUI...")
-            app = TransactionController(TABLE_NAME)
-            app.run()
+            run_gui()
         except Exception as e:
             print(f"Application error: {e}")
         finally:
@@ -91,3 +132,6 @@ if __name__ == "__main__":
                 print("Shutting down server...")
                 server_process.terminate()
                 server_process.wait()
+            if embedded_server:
+                print("Shutting down server...")
+                embedded_server.stop()
@@ -6,7 +6,18 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('config/local.env', 'config'), ('config/config.json', 'config'), ('config/features.json', 'config')],
-    hiddenimports=['services.etsy_import'],
+    hiddenimports=[
+        'services.etsy_import',
+        # Loaded through gui.lazy.LazyClass
+        'gui.charts',
+        'gui.tabs.products_tab',
+        'gui.tabs.materials_tab',
+        'gui.tabs.shipping_tab',
+        'gui.tabs.marketplace_tab',
+        # uvicorn picks its WebSocket protocol by name at runtime (/ws/changes)
+        'uvicorn.protocols.websockets.auto',
+        'uvicorn.protocols.websockets.websockets_impl',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,146 @@
+"""
+Compare API throughput with sync and async database access.
+
+Starts the API once per mode (app.server.db_access = "sync" / "async",
+selected through the SERVER_DB_ACCESS environment variable) as its own
+uvicorn process on a spare port, then keeps N clients busy against the
+hot read routes for a fixed time and reports requests/s and latency
+percentiles. Needs the configured MySQL database; the numbers are only
+meaningful with realistic data in it.
+
+    python scripts/benchmark_db_access.py
+    python scripts/benchmark_db_access.py --clients 50 200 --duration 20 --modes async
+
+Load comes from threads in this process, one keep-alive session each, so
+on small machines the client side can saturate first; compare modes
+against each other rather than reading the absolute numbers.
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+
+DEFAULT_PATHS = ["/transactions?limit=100", "/summary", "/products?fields=summary"]
+READY_TIMEOUT_S = 30
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode, port):
+    env = dict(os.environ, SERVER_DB_ACCESS=mode)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + READY_TIMEOUT_S
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{mode} server exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/health/ready", timeout=1).status_code == 200:
+                return process, base_url
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{mode} server not ready after {READY_TIMEOUT_S}s")
+
+
+def run_load(base_url, paths, clients, duration):
+    """Keep `clients` threads requesting `paths` round-robin for `duration` seconds."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    start_gate = threading.Barrier(clients + 1)
+    stop_at = [0.0]
+
+    def client(offset):
+        session = requests.Session()
+        mine, failed = [], 0
+        i = offset
+        start_gate.wait()
+        while time.monotonic() < stop_at[0]:
+            url = base_url + paths[i % len(paths)]
+            i += 1
+            began = time.perf_counter()
+            try:
+                ok = session.get(url, timeout=30).status_code == 200
+            except requests.exceptions.RequestException:
+                ok = False
+            if ok:
+                mine.append(time.perf_counter() - began)
+            else:
+                failed += 1
+        session.close()
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(n,), daemon=True) for n in range(clients)]
+    for t in threads:
+        t.start()
+    stop_at[0] = time.monotonic() + duration
+    start_gate.wait()
+    for t in threads:
+        t.join()
+    return latencies, errors[0]
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    parser.add_argument("--clients", nargs="+", type=int, default=[50, 200])
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per run")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of load before each mode is measured")
+    parser.add_argument("--path", action="append", dest="paths",
+                        help=f"route to request (repeatable; default {' '.join(DEFAULT_PATHS)})")
+    args = parser.parse_args()
+    paths = args.paths or DEFAULT_PATHS
+
+    results = []
+    for mode in args.modes:
+        process, base_url = start_server(mode, free_port())
+        try:
+            run_load(base_url, paths, min(args.clients), args.warmup)
+            for clients in args.clients:
+                latencies, errors = run_load(base_url, paths, clients, args.duration)
+                results.append((mode, clients, len(latencies) / args.duration, errors, latencies))
+                print(f"{mode:>5} x {clients:<4} done")
+        finally:
+            process.terminate()
+            process.wait(10)
+
+    print()
+    print(f"{'mode':>5} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode, clients, rps, errors, latencies in results:
+        p50 = statistics.median(latencies) * 1000 if latencies else float("nan")
+        print(f"{mode:>5} {clients:>7} {rps:>9.1f} {p50:>8.1f} "
+              f"{percentile(latencies, 95) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Async handlers for the hot read routes.
+
+Included ahead of server.routes when app.server.db_access is "async"
+(see server.main), so these take over the same paths while every other
+route stays on the sync handlers. Their queries run on the asyncio MySQL
+pool (db.async_connection): a request waiting on the database suspends on
+the event loop instead of holding one of the threadpool's workers.
+Thumbnail resizing and the disk cache stay on the threadpool.
+
+Parameters, ETags and error mapping match the sync routes exactly.
+"""
+
+from fastapi import APIRouter, HTTPException, Query, Response, Header
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+
+from db import async_reads
+from db.products import PRODUCT_LIST_COLUMNS
+from services import image_service
+from services.utils import TransactionUtils
+from server.routes import logger, thumbnails, _list_etag, _decode_product, _binary_image_response
+from config.config import TABLE_NAME, PRODUCTS_TABLE_NAME
+
+router = APIRouter()
+
+
+@router.get("/transactions")
+async def get_transactions(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after: Optional[str] = None,
+    q: Optional[str] = None,
+    transaction_type: Optional[str] = Query(None, alias="type"),
+    supplier: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    sort: str = "-date",
+    if_none_match: Optional[str] = Header(None)
+):
+    """Async GET /transactions; see server.routes.get_transactions."""
+    try:
+        filters = (limit, after, q, transaction_type, supplier, date_from, date_to)
+        versions = await async_reads.table_versions([TABLE_NAME])
+        not_modified = _list_etag(response, if_none_match, versions, repr(filters + (sort,)))
+        if not_modified:
+            return not_modified
+        if all(f is None for f in filters) and sort == "-date":
+            return await async_reads.read_transactions(table=TABLE_NAME)
+
+        data, next_cursor = await async_reads.read_transactions_page(
+            table=TABLE_NAME,
+            limit=limit,
+            after=after,
+            q=q,
+            transaction_type=transaction_type,
+            supplier=supplier,
+            date_from=date_from,
+            date_to=date_to,
+            sort=sort
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return data
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Error getting transactions: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/summary")
+async def get_summary(
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    year: Optional[int] = None,
+    month: Optional[int] = Query(None, ge=1, le=12),
+    quarter: Optional[int] = Query(None, ge=1, le=4)
+):
+    """Async GET /summary; see server.routes.get_summary."""
+    try:
+        rows = await async_reads.summarize_transactions(
+            table=TABLE_NAME,
+            date_from=date_from,
+            date_to=date_to,
+            year=year,
+            month=month,
+            quarter=quarter
+        )
+        return TransactionUtils.summary_from_aggregates(rows)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Error getting summary: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/products")
+async def get_products(
+    response: Response,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
+):
+    """Async GET /products; see server.routes.get_products."""
+    try:
+        versions = await async_reads.table_versions([PRODUCTS_TABLE_NAME])
+        not_modified = _list_etag(response, if_none_match, versions, fields or "")
+        if not_modified:
+            return not_modified
+
+        columns = None
+        if fields == "summary":
+            columns = PRODUCT_LIST_COLUMNS
+        elif fields:
+            columns = [f.strip() for f in fields.split(",") if f.strip()]
+
+        products = await async_reads.get_products(table=PRODUCTS_TABLE_NAME, columns=columns)
+        for p in products:
+            _decode_product(p)
+        return products
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Error getting products: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# --- Images ---
+
+async def _thumbnail(key, size, load_original):
+    """ThumbnailCache.get_or_create with the database read awaited."""
+    cached = await run_in_threadpool(thumbnails.get, key, size)
+    if cached is not None:
+        return cached
+    original = await load_original()
+    if not original:
+        return None
+    thumb = await run_in_threadpool(image_service.make_thumbnail, original, size)
+    await run_in_threadpool(thumbnails.put, key, size, thumb)
+    return thumb
+
+
+async def _gallery_image_bytes(img_id):
+    row = await async_reads.get_product_image(img_id)
+    return row.get('image_data') if row else None
+
+
+@router.get("/images/{img_id}")
+async def get_image(
+    img_id: int,
+    size: Optional[int] = Query(None, ge=16, le=1024),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Async GET /images/{id}; see server.routes.get_image."""
+    try:
+        if size:
+            data = await _thumbnail(f"image-{img_id}", size, lambda: _gallery_image_bytes(img_id))
+        else:
+            data = await _gallery_image_bytes(img_id)
+        if not data:
+            raise HTTPException(status_code=404, detail="Image not found")
+        return _binary_image_response(data, if_none_match, "private, max-age=86400")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error serving image {img_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/products/{p_id}/image")
+async def get_product_main_image(
+    p_id: int,
+    size: Optional[int] = Query(None, ge=16, le=1024),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Async GET /products/{id}/image; see server.routes.get_product_main_image."""
+    try:
+        def load():
+            return async_reads.get_product_main_image(p_id, table=PRODUCTS_TABLE_NAME)
+
+        data = await _thumbnail(f"product-{p_id}", size, load) if size else await load()
+        if not data:
+            raise HTTPException(status_code=404, detail="Image not found")
+        return _binary_image_response(data, if_none_match, "private, no-cache")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error serving main image for product {p_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,47 @@
+"""
+In-process server for single-user installs.
+
+Runs uvicorn on a daemon thread of the GUI process instead of spawning a
+second copy of the executable, so the app, its imports and the DB pool are
+loaded once. APIClient still talks to it over loopback HTTP, which keeps
+the API the only way into the service layer. Selected with
+app.server.mode = "embedded" in config.json.
+"""
+
+import threading
+
+import uvicorn
+
+# How long stop() waits for in-flight requests before giving up
+SHUTDOWN_TIMEOUT_S = 5.0
+
+
+class EmbeddedServer:
+    """uvicorn.Server running on a background thread."""
+
+    def __init__(self, app, host, port, log_level="warning"):
+        config = uvicorn.Config(app, host=host, port=port, log_level=log_level, use_colors=False)
+        self.server = uvicorn.Server(config)
+        self.thread = None
+
+    @property
+    def started(self):
+        """True once uvicorn is accepting connections."""
+        return self.server.started
+
+    def start(self):
+        # uvicorn only installs signal handlers on the main thread, so Ctrl+C
+        # and window close stay with the GUI
+        self.thread = threading.Thread(target=self.server.run, name="embedded-server", daemon=True)
+        self.thread.start()
+        print(f"Embedded server started on thread '{self.thread.name}'")
+        return self
+
+    def stop(self, timeout=SHUTDOWN_TIMEOUT_S):
+        if not self.thread:
+            return
+        self.server.should_exit = True
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            print("Embedded server did not stop in time")
+        self.thread = None
@@ -1,8 +1,45 @@
-from fastapi import FastAPI
+import logging
+import threading
+from contextlib import asynccontextmanager
+
+import anyio
+from fastapi import FastAPI, Response, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from server.routes import router
+from fastapi.middleware.gzip import GZipMiddleware
+from server.routes import router, feed
+from db import migrate as migrate_db
+from db import async_connection
+from config.config import HTTP_GZIP, HTTP_GZIP_MIN_SIZE, SERVER_DB_ACCESS
+
+logger = logging.getLogger(__name__)
+
+USE_ASYNC_DB = SERVER_DB_ACCESS == "async" and async_connection.async_db_available()
+if SERVER_DB_ACCESS == "async" and not USE_ASYNC_DB:
+    logger.warning("db_access is 'async' but mysql-connector-python has no asyncio driver; using sync routes")
 
-app = FastAPI(title="AurumCandles API")
+def migrate_on_startup():
+    """
+    Apply pending migrations for this server. A standalone server (--server,
+    uvicorn server.main:app) has no GUI process to migrate for it, and
+    /health/ready stays 503 until this is done. Concurrent runs from the GUI
+    process are serialized by migrate()'s lock.
+    """
+    try:
+        ran = migrate_db.migrate()
+        if ran:
+            logger.info(f"Applied migrations: {', '.join(ran)}")
+    except Exception as e:
+        logger.error(f"Database migration failed: {e}", exc_info=True)
+
+@asynccontextmanager
+async def lifespan(app):
+    # On a thread, so the server answers /health/ready (503) while it migrates
+    app.state.migration = threading.Thread(target=migrate_on_startup, name="startup-migration", daemon=True)
+    app.state.migration.start()
+    yield
+    await async_connection.close_async_pool()
+
+app = FastAPI(title="AurumCandles API", lifespan=lifespan)
 
 # Configure CORS (Open access for local development/mobile)
 app.add_middleware(
@@ -13,8 +50,58 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Off by default: on loopback compressing costs more than it saves
+if HTTP_GZIP:
+    app.add_middleware(GZipMiddleware, minimum_size=HTTP_GZIP_MIN_SIZE)
+
+# Registered first, so its handlers win for the paths both routers define
+if USE_ASYNC_DB:
+    from server.async_routes import router as async_router
+    app.include_router(async_router)
 app.include_router(router)
 
 @app.get("/")
 def read_root():
     return {"status": "ok", "message": "AurumCandles API is running"}
+
+@app.get("/health/ready")
+def health_ready(response: Response):
+    """Ready once the database answers and every migration is applied; 503 until then."""
+    try:
+        migrations = migrate_db.migration_status()
+    except Exception as e:
+        response.status_code = 503
+        return {"status": "unavailable", "database": "error", "detail": str(e)}
+
+    if not migrations["up_to_date"]:
+        response.status_code = 503
+        return {"status": "migrating", "database": "ok", "migrations": migrations}
+    return {"status": "ready", "database": "ok", "migrations": migrations}
+
+
+async def _forward_changes(websocket: WebSocket, subscription, cancel_scope):
+    try:
+        while True:
+            await websocket.send_json(await subscription.get())
+    except Exception:
+        # Connection gone; stop waiting for its disconnect message
+        cancel_scope.cancel()
+
+@app.websocket("/ws/changes")
+async def ws_changes(websocket: WebSocket):
+    """
+    Push change events as JSON lists of {"table", "id", "op"} after each
+    write. Nothing is replayed on connect: sync through GET /changes first.
+    """
+    # Subscribed before the handshake completes, so no write after it is missed
+    subscription = feed.subscribe()
+    try:
+        await websocket.accept()
+        async with anyio.create_task_group() as tasks:
+            tasks.start_soon(_forward_changes, websocket, subscription, tasks.cancel_scope)
+            # Clients only listen; anything they send is ignored
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+            tasks.cancel_scope.cancel()
+    finally:
+        feed.unsubscribe(subscription)
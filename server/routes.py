@@ -1,10 +1,18 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response, Header
 from pydantic import BaseModel
 from typing import Optional, List
 from db import transactions as db_ops
+from db import inventory as inventory_ops
+from db import changes as change_ops
 from services.utils import TransactionUtils
-from config.config import TABLE_NAME
+from services import image_service
+from services.change_tracker import list_etag
+from services.change_feed import ChangeFeed
+from config.config import (
+    TABLE_NAME, PRODUCTS_TABLE_NAME, MATERIALS_TABLE, THUMBNAIL_CACHE_DIR, GALLERY_THUMBNAIL_SIZE
+)
 
+import json
 import logging
 
 # Configure Logging
@@ -13,6 +21,31 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Events for /ws/changes subscribers, named like the GET /changes feeds
+feed = ChangeFeed()
+FEED_NAMES = {TABLE_NAME: "transactions", PRODUCTS_TABLE_NAME: "products", MATERIALS_TABLE: "materials"}
+# Lists can change at any time, so clients always revalidate
+LIST_CACHE_CONTROL = "private, no-cache"
+# Resized images on disk, keyed "product-{id}" (main image) and "image-{id}" (gallery)
+thumbnails = image_service.ThumbnailCache(THUMBNAIL_CACHE_DIR)
+
+def _changed(table, op, *ids):
+    """Record a committed write: a push to /ws/changes."""
+    feed.publish(FEED_NAMES[table], op, ids)
+
+def _list_etag(response: Response, if_none_match, versions, variant=""):
+    """
+    Set ETag headers for a list built from the tables in `versions`
+    (change_ops.table_versions). Returns a 304 Response when the client's
+    copy is current (callers return it without reading the list), otherwise None.
+    """
+    etag = list_etag(versions, variant)
+    headers = {"ETag": etag, "Cache-Control": LIST_CACHE_CONTROL}
+    if image_service.etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
 # Pydantic Models for Validation
 class TransactionCreate(BaseModel):
     date: str
@@ -32,69 +65,126 @@ class TransactionUpdate(BaseModel):
     supplier: Optional[str] = ""
 
 @router.get("/transactions")
-def get_transactions():
-    """Get all transactions"""
+def get_transactions(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after: Optional[str] = None,
+    q: Optional[str] = None,
+    transaction_type: Optional[str] = Query(None, alias="type"),
+    supplier: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    sort: str = "-date",
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get transactions. Without parameters returns the whole table; with
+    `limit` returns one keyset page and puts the next cursor in X-Next-Cursor.
+    Answers 304 when If-None-Match carries the current ETag.
+    """
     try:
-        data = db_ops.read_transactions(table=TABLE_NAME)
+        filters = (limit, after, q, transaction_type, supplier, date_from, date_to)
+        versions = change_ops.table_versions([TABLE_NAME])
+        not_modified = _list_etag(response, if_none_match, versions, repr(filters + (sort,)))
+        if not_modified:
+            return not_modified
+        if all(f is None for f in filters) and sort == "-date":
+            return db_ops.read_transactions(table=TABLE_NAME)
+
+        data, next_cursor = db_ops.read_transactions_page(
+            table=TABLE_NAME,
+            limit=limit,
+            after=after,
+            q=q,
+            transaction_type=transaction_type,
+            supplier=supplier,
+            date_from=date_from,
+            date_to=date_to,
+            sort=sort
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return data
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"Error getting transactions: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _posted_changes(posted):
+    """Record what a post_transactions call changed."""
+    _changed(TABLE_NAME, "insert", *posted["ids"])
+    if posted["products"]:
+        _changed(PRODUCTS_TABLE_NAME, "update", *(p["id"] for p in posted["products"]))
+    if posted["materials"]:
+        _changed(MATERIALS_TABLE, "update", *(m["id"] for m in posted["materials"]))
+
+def _transaction_record(item: TransactionCreate):
+    """Map the request model to the db layer's transaction dict."""
+    return {
+        "transaction_date": item.date,
+        "description": item.description,
+        "quantity": item.quantity,
+        "price": item.price,
+        "transaction_type": item.type,
+        "supplier": item.supplier,
+        "product_id": item.product_id
+    }
+
+
 @router.post("/transactions")
 def add_transaction(item: TransactionCreate):
     """Add a new transaction"""
     try:
-        # Map Pydantic model to DB function args
-        new_id = db_ops.write_transaction(
-            transaction_date=item.date,
-            description=item.description,
-            quantity=item.quantity,
-            price=item.price,
-            transaction_type=item.type,
-            supplier=item.supplier,
-            product_id=item.product_id,
-            table=TABLE_NAME
+        # Link to Inventory: an income (sale) with a product deducts product
+        # stock and its materials in the same DB transaction as the insert
+        posted = inventory_ops.post_transactions(
+            [_transaction_record(item)],
+            table=TABLE_NAME,
+            products_table=PRODUCTS_TABLE_NAME,
+            materials_table=MATERIALS_TABLE
         )
-        
-        # Link to Inventory: Deduct Stock
-        if item.product_id:
-             # If income (sale), deduct stock. 
-             # logic: quantity sold = deduction
-             # If expense (restock?), maybe add? Default assumption: Income = Sale.
-             # User Request: "When adding a 'Income' transaction... Deduct Stock"
-             if item.type.lower() == 'income':
-                 product_ops.update_stock(item.product_id, -item.quantity, table=PRODUCTS_TABLE_NAME)
-                 
-                 # FEATURE: Material Deduction
-                 # Fetch product details to know what to deduct
-                 product = product_ops.get_product(item.product_id, table=PRODUCTS_TABLE_NAME)
-                 if product:
-                     # 1. Wax
-                     if product.get('wax_type') and product.get('wax_weight_g'):
-                         total_wax = float(product['wax_weight_g']) * item.quantity
-                         material_ops.deduct_stock_by_name(product['wax_type'], total_wax, table=MATERIALS_TABLE)
-                         
-                     # 2. Wick
-                     if product.get('wick_type'):
-                         total_wick = 1.0 * item.quantity # Assuming 1 wick per unit
-                         material_ops.deduct_stock_by_name(product['wick_type'], total_wick, table=MATERIALS_TABLE)
-                         
-                     # 3. Container
-                     if product.get('container_type'):
-                         total_container = 1.0 * item.quantity 
-                         material_ops.deduct_stock_by_name(product['container_type'], total_container, table=MATERIALS_TABLE)
-                         
-                     # 4. Fragrance (Optional, if we had connection. Schema implies fragrance_weight_g exists but no Type field yet)
-                     pass
-
-        return {"id": new_id, "message": "Transaction added"}
+        _posted_changes(posted)
+        return {
+            "id": posted["ids"][0],
+            "message": "Transaction added",
+            "stock": {"products": posted["products"], "materials": posted["materials"]}
+        }
     except ValueError as ve:
          raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"Error adding transaction: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/transactions/bulk")
+def add_transactions_bulk(items: List[TransactionCreate]):
+    """Add many transactions in one request and one DB commit"""
+    try:
+        records = [_transaction_record(item) for item in items]
+        if inventory_ops.affects_stock(records):
+            posted = inventory_ops.post_transactions(
+                records,
+                table=TABLE_NAME,
+                products_table=PRODUCTS_TABLE_NAME,
+                materials_table=MATERIALS_TABLE
+            )
+        else:
+            # Plain bookkeeping rows (e.g. a CSV import): nothing to deduct
+            ids = db_ops.write_transactions_bulk(records, table=TABLE_NAME)
+            posted = {"ids": ids, "products": [], "materials": []}
+        _posted_changes(posted)
+        count = len(posted["ids"])
+        return {
+            "count": count,
+            "message": f"{count} transactions added",
+            "stock": {"products": posted["products"], "materials": posted["materials"]}
+        }
+    except ValueError as ve:
+         raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Error adding transactions in bulk: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.put("/transactions/{t_id}")
 def update_transaction(t_id: int, item: TransactionUpdate):
     """Update an existing transaction"""
@@ -109,6 +199,7 @@ def update_transaction(t_id: int, item: TransactionUpdate):
             supplier=item.supplier,
             table=TABLE_NAME
         )
+        _changed(TABLE_NAME, "update", t_id)
         return {"message": "Transaction updated"}
     except Exception as e:
         logger.error(f"Error updating transaction: {e}", exc_info=True)
@@ -119,20 +210,33 @@ def delete_transaction(t_id: int):
     """Delete a transaction"""
     try:
         db_ops.delete_transaction(transaction_id=t_id, table=TABLE_NAME)
+        _changed(TABLE_NAME, "delete", t_id)
         return {"message": "Transaction deleted"}
     except Exception as e:
         logger.error(f"Error deleting transaction: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/summary")
-def get_summary():
-    """Get calculated summary stats"""
+def get_summary(
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    year: Optional[int] = None,
+    month: Optional[int] = Query(None, ge=1, le=12),
+    quarter: Optional[int] = Query(None, ge=1, le=4)
+):
+    """Get summary stats, aggregated in SQL and optionally limited to a period"""
     try:
-        # Reuse existing logic: Read all -> Calculate in Python
-        # In a larger app, this calculation should move to SQL aggregation
-        data = db_ops.read_transactions(table=TABLE_NAME)
-        summary = TransactionUtils.calculate_summary(data)
-        return summary
+        rows = db_ops.summarize_transactions(
+            table=TABLE_NAME,
+            date_from=date_from,
+            date_to=date_to,
+            year=year,
+            month=month,
+            quarter=quarter
+        )
+        return TransactionUtils.summary_from_aggregates(rows)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"Error getting summary: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -156,8 +260,12 @@ class MaterialUpdate(BaseModel):
     unit_type: Optional[str] = None
 
 @router.get("/materials")
-def get_materials():
+def get_materials(response: Response, if_none_match: Optional[str] = Header(None)):
     try:
+        versions = change_ops.table_versions([MATERIALS_TABLE])
+        not_modified = _list_etag(response, if_none_match, versions)
+        if not_modified:
+            return not_modified
         return material_ops.get_materials(table=MATERIALS_TABLE)
     except Exception as e:
         logger.error(f"Error getting materials: {e}", exc_info=True)
@@ -174,6 +282,7 @@ def add_material(item: MaterialCreate):
             unit_type=item.unit_type,
             table=MATERIALS_TABLE
         )
+        _changed(MATERIALS_TABLE, "insert", new_id)
         return {"id": new_id, "message": "Material added"}
     except Exception as e:
         logger.error(f"Error adding material: {e}", exc_info=True)
@@ -191,6 +300,7 @@ def update_material(m_id: int, item: MaterialUpdate):
             unit_type=item.unit_type,
             table=MATERIALS_TABLE
         )
+        _changed(MATERIALS_TABLE, "update", m_id)
         return {"message": "Material updated"}
     except Exception as e:
         logger.error(f"Error updating material: {e}", exc_info=True)
@@ -200,6 +310,7 @@ def update_material(m_id: int, item: MaterialUpdate):
 def delete_material(m_id: int):
     try:
         material_ops.delete_material(m_id, table=MATERIALS_TABLE)
+        _changed(MATERIALS_TABLE, "delete", m_id)
         return {"message": "Material deleted"}
     except Exception as e:
         logger.error(f"Error deleting material: {e}", exc_info=True)
@@ -283,25 +394,50 @@ class ProductUpdate(BaseModel):
     common_data: Optional[dict] = None
     image: Optional[str] = None
 
+def _decode_product(p):
+    """Make a product row JSON-ready: image bytes to Base64, JSON columns parsed."""
+    # Convert BLOB bytes to Base64 string for JSON response
+    if p.get('image'):
+        if isinstance(p['image'], bytes):
+            p['image'] = base64.b64encode(p['image']).decode('utf-8')
+    # JSON fields are likely returned as strings/dicts depending on DB driver
+    # MySQL connector might return string or dict if using JSON column
+    # Ensure they are proper JSON
+    for key in ['amazon_data', 'etsy_data', 'common_data']:
+        if p.get(key) and isinstance(p[key], str):
+            try:
+                p[key] = json.loads(p[key])
+            except: pass
+    return p
+
 @router.get("/products")
-def get_products():
+def get_products(
+    response: Response,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    List products. `fields` is a comma-separated projection, or "summary" for
+    the lightweight list-view columns; blob columns are never included.
+    """
     try:
-        products = product_ops.get_products(table=PRODUCTS_TABLE_NAME)
-        # Convert BLOB bytes to Base64 string for JSON response
+        versions = change_ops.table_versions([PRODUCTS_TABLE_NAME])
+        not_modified = _list_etag(response, if_none_match, versions, fields or "")
+        if not_modified:
+            return not_modified
+
+        columns = None
+        if fields == "summary":
+            columns = product_ops.PRODUCT_LIST_COLUMNS
+        elif fields:
+            columns = [f.strip() for f in fields.split(",") if f.strip()]
+
+        products = product_ops.get_products(table=PRODUCTS_TABLE_NAME, columns=columns)
         for p in products:
-            if p.get('image'):
-                if isinstance(p['image'], bytes):
-                    p['image'] = base64.b64encode(p['image']).decode('utf-8')
-            # JSON fields are likely returned as strings/dicts depending on DB driver
-            # MySQL connector might return string or dict if using JSON column
-            # Ensure they are proper JSON
-            import json
-            for key in ['amazon_data', 'etsy_data', 'common_data']:
-                if p.get(key) and isinstance(p[key], str):
-                    try:
-                        p[key] = json.loads(p[key])
-                    except: pass
+            _decode_product(p)
         return products
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"Error getting products: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -345,6 +481,7 @@ def add_product(item: ProductCreate):
                 data['image'] = None # Handle bad base64
         
         new_id = product_ops.create_product(data, table=PRODUCTS_TABLE_NAME)
+        _changed(PRODUCTS_TABLE_NAME, "insert", new_id)
         return {"id": new_id, "message": "Product added"}
     except Exception as e:
         logger.error(f"Error adding product: {e}", exc_info=True)
@@ -365,6 +502,9 @@ def update_product(p_id: int, item: ProductUpdate):
                  data['image'] = None
 
         product_ops.update_product(p_id, data, table=PRODUCTS_TABLE_NAME)
+        _changed(PRODUCTS_TABLE_NAME, "update", p_id)
+        if 'image' in data:
+            thumbnails.invalidate(f"product-{p_id}")
         return {"message": "Product updated"}
     except Exception as e:
         logger.error(f"Error updating product: {e}", exc_info=True)
@@ -373,12 +513,41 @@ def update_product(p_id: int, item: ProductUpdate):
 @router.delete("/products/{p_id}")
 def delete_product(p_id: int):
     try:
+        # Listed first: the gallery rows go with the product
+        image_ids = [img["id"] for img in product_ops.list_product_images(p_id)]
         product_ops.delete_product(p_id, table=PRODUCTS_TABLE_NAME)
+        _changed(PRODUCTS_TABLE_NAME, "delete", p_id)
+        thumbnails.invalidate(f"product-{p_id}")
+        for img_id in image_ids:
+            thumbnails.invalidate(f"image-{img_id}")
         return {"message": "Product deleted"}
     except Exception as e:
         logger.error(f"Error deleting product: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+# --- Delta Sync ---
+@router.get("/changes")
+def get_changes(since: Optional[str] = None, tables: Optional[str] = None):
+    """
+    Rows inserted, updated or deleted since `since`, a token from an earlier
+    call: {"token", "full", <table>: {"upserts": [...], "deleted": [ids]}}.
+    `tables` is a comma-separated subset of transactions, products, materials.
+
+    Without `since`, or when the token has expired, only a new token comes
+    back with full=true: reload the lists, then sync from that token.
+    """
+    try:
+        names = [t.strip() for t in tables.split(",") if t.strip()] if tables else None
+        result = change_ops.read_changes(since=since, names=names)
+        for p in result.get("products", {}).get("upserts", []):
+            _decode_product(p)
+        return result
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Error reading changes: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 # --- Product Images Routes ---
 class ImageCreate(BaseModel):
     product_id: int
@@ -386,8 +555,14 @@ class ImageCreate(BaseModel):
     display_order: Optional[int] = 0
 
 @router.get("/products/{p_id}/images")
-def get_product_images(p_id: int):
+def get_product_images(p_id: int, include_data: bool = True):
+    """
+    List a product's gallery. With include_data=false only metadata is
+    returned; fetch the bytes from /images/{id}.
+    """
     try:
+        if not include_data:
+            return product_ops.list_product_images(p_id)
         images = product_ops.get_product_images(p_id)
         # Convert BLOB to Base64
         for img in images:
@@ -403,15 +578,75 @@ def add_product_image(p_id: int, item: ImageCreate):
     try:
         data = base64.b64decode(item.image_data)
         new_id = product_ops.add_product_image(p_id, data, item.display_order)
+        # Pre-render the gallery tile so the first view is already cached
+        thumbnails.put(f"image-{new_id}", GALLERY_THUMBNAIL_SIZE, image_service.make_thumbnail(data, GALLERY_THUMBNAIL_SIZE))
         return {"id": new_id, "message": "Image added"}
     except Exception as e:
         logger.error(f"Error adding image: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _binary_image_response(data, if_none_match, cache_control):
+    """Raw image response with ETag, honouring If-None-Match with a 304."""
+    etag = image_service.compute_etag(data)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if image_service.etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type=image_service.detect_content_type(data), headers=headers)
+
+def _gallery_image_bytes(img_id):
+    row = product_ops.get_product_image(img_id)
+    return row.get('image_data') if row else None
+
+@router.get("/images/{img_id}")
+def get_image(
+    img_id: int,
+    size: Optional[int] = Query(None, ge=16, le=1024),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Serve a gallery image as raw bytes, or a cached thumbnail with ?size=N.
+    Gallery rows are never edited in place.
+    """
+    try:
+        if size:
+            data = thumbnails.get_or_create(f"image-{img_id}", size, lambda: _gallery_image_bytes(img_id))
+        else:
+            data = _gallery_image_bytes(img_id)
+        if not data:
+            raise HTTPException(status_code=404, detail="Image not found")
+        return _binary_image_response(data, if_none_match, "private, max-age=86400")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error serving image {img_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/products/{p_id}/image")
+def get_product_main_image(
+    p_id: int,
+    size: Optional[int] = Query(None, ge=16, le=1024),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Serve a product's main image (or a ?size=N thumbnail). It can change, so always revalidate."""
+    try:
+        def load():
+            return product_ops.get_product_main_image(p_id, table=PRODUCTS_TABLE_NAME)
+
+        data = thumbnails.get_or_create(f"product-{p_id}", size, load) if size else load()
+        if not data:
+            raise HTTPException(status_code=404, detail="Image not found")
+        return _binary_image_response(data, if_none_match, "private, no-cache")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error serving main image for product {p_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.delete("/products/images/{img_id}")
 def delete_product_image(img_id: int):
     try:
          product_ops.delete_product_image(img_id)
+         thumbnails.invalidate(f"image-{img_id}")
          return {"message": "Image deleted"}
     except Exception as e:
         logger.error(f"Error deleting image: {e}", exc_info=True)
@@ -0,0 +1,17 @@
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture(autouse=True)
+def table_versions():
+    """
+    Database state behind the list ETags (db.changes.table_versions).
+    Tests write to the dict to simulate a committed change.
+    """
+    versions = {}
+
+    def read(tables):
+        return {t: versions.get(t, "0:") for t in tables}
+
+    with patch("db.changes.table_versions", side_effect=read):
+        yield versions
@@ -0,0 +1,72 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from server.async_routes import router as async_router
+from server.routes import router
+
+# Same layout server.main uses with db_access = "async"
+app = FastAPI()
+app.include_router(async_router)
+app.include_router(router)
+client = TestClient(app)
+
+
+@pytest.fixture
+def reads():
+    with patch("server.async_routes.async_reads") as mock:
+        for name in ("read_transactions", "read_transactions_page", "summarize_transactions",
+                     "get_products", "get_product_image", "get_product_main_image"):
+            setattr(mock, name, AsyncMock())
+        mock.table_versions = AsyncMock(side_effect=lambda tables: {t: "0:" for t in tables})
+        yield mock
+
+
+def test_transactions_use_async_reads(reads):
+    reads.read_transactions_page.return_value = ([{"id": 1}], "2025-01-01:1")
+
+    with patch("server.routes.db_ops") as sync_ops:
+        response = client.get("/transactions?limit=1")
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": 1}]
+    assert response.headers["X-Next-Cursor"] == "2025-01-01:1"
+    assert "ETag" in response.headers
+    sync_ops.read_transactions_page.assert_not_called()
+
+
+def test_summary_and_bad_input(reads):
+    reads.summarize_transactions.return_value = [
+        {"transaction_type": "income", "total": 10, "units": 2, "count": 1}
+    ]
+    assert client.get("/summary?year=2025").json()["total_income"] == 10
+
+    reads.summarize_transactions.side_effect = ValueError("year is required")
+    assert client.get("/summary?month=2").status_code == 400
+
+
+def test_products_decoded_and_304(reads):
+    reads.get_products.return_value = [{"id": 1, "etsy_data": '{"a": 1}'}]
+
+    first = client.get("/products?fields=summary")
+    assert first.json() == [{"id": 1, "etsy_data": {"a": 1}}]
+    again = client.get("/products?fields=summary", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert again.status_code == 304
+    assert reads.get_products.await_count == 1
+
+
+def test_images(reads):
+    reads.get_product_image.return_value = {"id": 4, "image_data": b"\x89PNG\r\n\x1a\nrest"}
+    reads.get_product_main_image.return_value = None
+
+    assert client.get("/images/4").content == b"\x89PNG\r\n\x1a\nrest"
+    assert client.get("/products/9/image").status_code == 404
+
+
+def test_writes_stay_on_sync_routes(reads):
+    with patch("server.routes.db_ops") as sync_ops:
+        assert client.delete("/transactions/5").status_code == 200
+    sync_ops.delete_transaction.assert_called_once()
@@ -0,0 +1,48 @@
+import socket
+import time
+
+import pytest
+import requests
+from fastapi import FastAPI
+
+from server.embedded import EmbeddedServer
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+
+    @app.get("/")
+    def root():
+        return {"status": "ok"}
+
+    return app
+
+
+def test_serves_requests_on_a_background_thread(app):
+    port = _free_port()
+    server = EmbeddedServer(app, "127.0.0.1", port).start()
+    try:
+        deadline = time.monotonic() + 5
+        while not server.started and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert server.started
+
+        response = requests.get(f"http://127.0.0.1:{port}/", timeout=2)
+        assert response.json() == {"status": "ok"}
+    finally:
+        server.stop()
+
+    assert server.thread is None
+    with pytest.raises(requests.ConnectionError):
+        requests.get(f"http://127.0.0.1:{port}/", timeout=1)
+
+
+def test_stop_before_start_is_a_noop(app):
+    EmbeddedServer(app, "127.0.0.1", _free_port()).stop()
@@ -14,7 +14,7 @@ def test_get_transactions_error():
         assert "DB Error" in response.json()['detail']
 
 def test_add_transaction_error():
-    with patch('db.transactions.write_transaction') as mock_write:
+    with patch('db.inventory.post_transactions') as mock_write:
         mock_write.side_effect = Exception("DB Write Error")
         
         payload = {"date": "2025-01-01", "description": "T", "quantity": 1, "price": 1, "type": "income"}
@@ -24,7 +24,7 @@ def test_add_transaction_error():
 
 def test_add_transaction_validation_error():
     # Value Error handling (400)
-    with patch('db.transactions.write_transaction') as mock_write:
+    with patch('db.inventory.post_transactions') as mock_write:
         mock_write.side_effect = ValueError("Invalid data")
         
         payload = {"date": "2025-01-01", "description": "T", "quantity": 1, "price": 1, "type": "income"}
@@ -48,8 +48,41 @@ def test_delete_transaction_error():
         assert response.status_code == 500
 
 def test_summary_error():
-    with patch('db.transactions.read_transactions') as mock_read:
+    with patch('db.transactions.summarize_transactions') as mock_read:
         mock_read.side_effect = Exception("Summary Error")
         
         response = client.get("/summary")
         assert response.status_code == 500
+
+def test_health_ready():
+    status = {"up_to_date": True, "pending": [], "schema_synced": True}
+    with patch('db.migrate.migration_status', return_value=status):
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+def test_health_ready_while_migrating():
+    status = {"up_to_date": False, "pending": ["rename_products_name_to_title"], "schema_synced": False}
+    with patch('db.migrate.migration_status', return_value=status):
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "migrating"
+        assert response.json()["migrations"]["pending"] == ["rename_products_name_to_title"]
+
+def test_health_ready_db_down():
+    with patch('db.migrate.migration_status', side_effect=Exception("Can't connect to MySQL server")):
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["database"] == "error"
+
+def test_startup_applies_migrations():
+    with patch('db.migrate.migrate', return_value=["add_updated_at"]) as mock_migrate:
+        with TestClient(app) as started:
+            started.app.state.migration.join(5)
+        mock_migrate.assert_called_once()
+
+def test_startup_survives_failed_migration():
+    with patch('db.migrate.migrate', side_effect=Exception("Can't connect to MySQL server")):
+        with TestClient(app) as started:
+            started.app.state.migration.join(5)
+            assert started.get("/").status_code == 200
@@ -12,6 +12,7 @@ import sys
 # Ensure imports work if running from root
 from server.main import app
 from server.routes import router
+from config.config import PRODUCTS_TABLE_NAME, MATERIALS_TABLE
 
 client = TestClient(app)
 
@@ -21,7 +22,13 @@ class TestRoutesExtended:
     def mock_db_ops(self):
         with patch("server.routes.db_ops") as mock_trans, \
              patch("server.routes.material_ops") as mock_mats, \
-             patch("server.routes.product_ops") as mock_prods:
+             patch("server.routes.product_ops") as mock_prods, \
+             patch("server.routes.inventory_ops") as mock_inventory, \
+             patch("server.routes.thumbnails"):
+            mock_inventory.post_transactions.side_effect = lambda rows, **kw: {
+                "ids": [mock_trans.write_transaction.return_value], "products": [], "materials": []
+            }
+            self.inventory = mock_inventory
             yield mock_trans, mock_mats, mock_prods
 
     # --- Transactions Routes (12 Tests) ---
@@ -45,6 +52,32 @@ class TestRoutesExtended:
         response = client.get("/transactions")
         assert response.status_code == 500
 
+    def test_get_transactions_page(self, mock_db_ops):
+        t, m, p = mock_db_ops
+        t.read_transactions_page.return_value = ([{"id": 5, "description": "T5"}], "2025-01-01:5")
+        response = client.get("/transactions?limit=1&type=income&q=wax")
+        assert response.status_code == 200
+        assert response.json()[0]["id"] == 5
+        assert response.headers["X-Next-Cursor"] == "2025-01-01:5"
+        kwargs = t.read_transactions_page.call_args.kwargs
+        assert kwargs["limit"] == 1
+        assert kwargs["transaction_type"] == "income"
+        assert kwargs["q"] == "wax"
+        t.read_transactions.assert_not_called()
+
+    def test_get_transactions_page_last(self, mock_db_ops):
+        t, m, p = mock_db_ops
+        t.read_transactions_page.return_value = ([], None)
+        response = client.get("/transactions?limit=10&after=2025-01-01:5")
+        assert response.status_code == 200
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_get_transactions_bad_cursor(self, mock_db_ops):
+        t, m, p = mock_db_ops
+        t.read_transactions_page.side_effect = ValueError("Invalid cursor")
+        response = client.get("/transactions?limit=10&after=oops")
+        assert response.status_code == 400
+
     def test_add_transaction_success(self, mock_db_ops):
         t, m, p = mock_db_ops
         t.write_transaction.return_value = 10
@@ -55,16 +88,28 @@ class TestRoutesExtended:
 
     def test_add_transaction_deduct_stock(self, mock_db_ops):
         t, m, p = mock_db_ops
-        t.write_transaction.return_value = 11
-        # Mock product logic for stock deduction
-        p.get_product.return_value = {"wax_type": "Soy", "wax_weight_g": 100}
+        # Stock deduction is posted with the insert and the new levels come back
+        self.inventory.post_transactions.side_effect = None
+        self.inventory.post_transactions.return_value = {
+            "ids": [11],
+            "products": [{"id": 1, "stock_quantity": 8}],
+            "materials": [{"id": 3, "name": "Soy", "stock_quantity": 800}]
+        }
         
         payload = {"date": "2023-01-01", "description": "Sale", "quantity": 2, "price": 20, "type": "INCOME", "product_id": 1}
         response = client.post("/transactions", json=payload)
         
-        assert p.update_stock.called # Deduct product stock
-        assert m.deduct_stock_by_name.called # Deduct wax
         assert response.status_code == 200
+        assert response.json()["id"] == 11
+        assert response.json()["stock"]["products"] == [{"id": 1, "stock_quantity": 8}]
+        rows = self.inventory.post_transactions.call_args[0][0]
+        assert rows == [{
+            "transaction_date": "2023-01-01", "description": "Sale", "quantity": 2, "price": 20.0,
+            "transaction_type": "INCOME", "supplier": "", "product_id": 1
+        }]
+        # No separate per-item stock calls
+        p.update_stock.assert_not_called()
+        m.deduct_stock_by_name.assert_not_called()
 
     def test_add_transaction_invalid_body(self, mock_db_ops):
         response = client.post("/transactions", json={"date": "Only Date"}) # Missing required
@@ -72,11 +117,54 @@ class TestRoutesExtended:
 
     def test_add_transaction_db_fail(self, mock_db_ops):
         t, m, p = mock_db_ops
-        t.write_transaction.side_effect = Exception("Fail")
+        self.inventory.post_transactions.side_effect = Exception("Fail")
         payload = {"date": "2023-01-01", "description": "Sale", "quantity": 1, "price": 10, "type": "INCOME"}
         response = client.post("/transactions", json=payload)
         assert response.status_code == 500
 
+    def test_add_transactions_bulk(self, mock_db_ops):
+        t, m, p = mock_db_ops
+        self.inventory.post_transactions.side_effect = None
+        self.inventory.post_transactions.return_value = {
+            "ids": [5, 6], "products": [{"id": 4, "stock_quantity": 7}], "materials": []
+        }
+        payload = [
+            {"date": "2023-01-01", "description": "A", "quantity": 1, "price": 10, "type": "expense"},
+            {"date": "2023-01-02", "description": "B", "quantity": 3, "price": 10, "type": "income", "product_id": 4},
+        ]
+        response = client.post("/transactions/bulk", json=payload)
+        assert response.status_code == 200
+        assert response.json()["count"] == 2
+        # One call posts every row and its stock effects together
+        self.inventory.post_transactions.assert_called_once()
+        rows = self.inventory.post_transactions.call_args[0][0]
+        assert rows[1]["transaction_type"] == "income"
+        assert rows[1]["product_id"] == 4
+        t.write_transaction.assert_not_called()
+        p.update_stock.assert_not_called()
+
+    def test_add_transactions_bulk_without_sales_uses_bulk_write(self, mock_db_ops):
+        t, m, p = mock_db_ops
+        self.inventory.affects_stock.return_value = False
+        t.write_transactions_bulk.return_value = [8, 9]
+        payload = [
+            {"date": "2023-01-01", "description": "A", "quantity": 1, "price": 10, "type": "expense"},
+            {"date": "2023-01-02", "description": "B", "quantity": 1, "price": 10, "type": "income"},
+        ]
+        response = client.post("/transactions/bulk", json=payload)
+        assert response.status_code == 200
+        assert response.json()["count"] == 2
+        rows = t.write_transactions_bulk.call_args[0][0]
+        assert [r["description"] for r in rows] == ["A", "B"]
+        self.inventory.post_transactions.assert_not_called()
+
+    def test_add_transactions_bulk_db_fail(self, mock_db_ops):
+        t, m, p = mock_db_ops
+        self.inventory.post_transactions.side_effect = Exception("Fail")
+        payload = [{"date": "2023-01-01", "description": "A", "quantity": 1, "price": 10, "type": "expense"}]
+        response = client.post("/transactions/bulk", json=payload)
+        assert response.status_code == 500
+
     def test_update_transaction_success(self, mock_db_ops):
         t, m, p = mock_db_ops
         payload = {"date": "2023-01-02", "description": "Upd", "quantity": 2, "price": 20, "type": "EXPENSE"}
@@ -105,11 +193,34 @@ class TestRoutesExtended:
 
     def test_get_summary(self, mock_db_ops):
         t, m, p = mock_db_ops
-        t.read_transactions.return_value = []
-        with patch("services.utils.TransactionUtils.calculate_summary", return_value={"total": 0}):
-            response = client.get("/summary")
-            assert response.status_code == 200
-            assert "total" in response.json()
+        t.summarize_transactions.return_value = [
+            {"transaction_type": "income", "total": 100, "units": 4, "count": 2},
+            {"transaction_type": "expense", "total": 30, "units": 3, "count": 1}
+        ]
+        response = client.get("/summary")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_income"] == 100
+        assert data["total_expense"] == 30
+        assert data["balance"] == 70
+        assert data["total_sold_units"] == 4
+        assert data["avg_price_per_unit"] == 25
+
+    def test_get_summary_period_filters(self, mock_db_ops):
+        t, m, p = mock_db_ops
+        t.summarize_transactions.return_value = []
+        response = client.get("/summary?year=2025&quarter=2")
+        assert response.status_code == 200
+        kwargs = t.summarize_transactions.call_args.kwargs
+        assert kwargs["year"] == 2025
+        assert kwargs["quarter"] == 2
+        assert response.json()["total_income"] == 0
+
+    def test_get_summary_invalid_period(self, mock_db_ops):
+        t, m, p = mock_db_ops
+        t.summarize_transactions.side_effect = ValueError("year is required")
+        response = client.get("/summary?month=3")
+        assert response.status_code == 400
 
     # --- Materials Routes (10 Tests) ---
     def test_get_materials(self, mock_db_ops):
@@ -191,6 +302,26 @@ class TestRoutesExtended:
         response = client.get("/products")
         assert response.json()[0]["amazon_data"]["asin"] == "123"
 
+    def test_get_products_summary_projection(self, mock_db_ops):
+        t, m, p = mock_db_ops
+        p.PRODUCT_LIST_COLUMNS = ["id", "title"]
+        p.get_products.return_value = [{"id": 1, "title": "P1"}]
+        response = client.get("/products?fields=summary")
+        assert response.status_code == 200
+        assert p.get_products.call_args.kwargs["columns"] == ["id", "title"]
+
+    def test_get_products_field_list(self, mock_db_ops):
+        t, m, p = mock_db_ops
+        p.get_products.return_value = []
+        client.get("/products?fields=title, sku")
+        assert p.get_products.call_args.kwargs["columns"] == ["title", "sku"]
+
+    def test_get_products_invalid_fields(self, mock_db_ops):
+        t, m, p = mock_db_ops
+        p.get_products.side_effect = ValueError("Invalid product fields: image")
+        response = client.get("/products?fields=image")
+        assert response.status_code == 400
+
     def test_get_products_error(self, mock_db_ops):
         t, m, p = mock_db_ops
         p.get_products.side_effect = Exception("Fail")
@@ -278,3 +409,192 @@ class TestRoutesExtended:
     def test_method_not_allowed(self):
         response = client.put("/transactions") # POST allowed, PUT not on collection
         assert response.status_code == 405
+
+
+class TestImageRoutes:
+
+    PNG = b"\x89PNG\r\n\x1a\n" + b"0" * 32
+
+    @pytest.fixture
+    def mock_products(self, tmp_path):
+        from services.image_service import ThumbnailCache
+        with patch("server.routes.product_ops") as mock_prods, \
+             patch("server.routes.thumbnails", ThumbnailCache(str(tmp_path))):
+            yield mock_prods
+
+    @staticmethod
+    def make_png(size=(400, 300)):
+        from io import BytesIO
+        from PIL import Image
+        buf = BytesIO()
+        Image.new("RGB", size, "red").save(buf, format="PNG")
+        return buf.getvalue()
+
+    def test_get_image_raw_bytes(self, mock_products):
+        mock_products.get_product_image.return_value = {"id": 1, "image_data": self.PNG}
+        response = client.get("/images/1")
+        assert response.status_code == 200
+        assert response.content == self.PNG
+        assert response.headers["content-type"] == "image/png"
+        assert response.headers["ETag"].startswith('"')
+        assert "max-age" in response.headers["Cache-Control"]
+
+    def test_get_image_not_modified(self, mock_products):
+        mock_products.get_product_image.return_value = {"id": 1, "image_data": self.PNG}
+        etag = client.get("/images/1").headers["ETag"]
+        response = client.get("/images/1", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_get_image_missing(self, mock_products):
+        mock_products.get_product_image.return_value = None
+        assert client.get("/images/5").status_code == 404
+
+    def test_get_product_main_image(self, mock_products):
+        mock_products.get_product_main_image.return_value = b"\xff\xd8\xff\xe0data"
+        response = client.get("/products/3/image")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/jpeg"
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+    def test_get_product_main_image_none(self, mock_products):
+        mock_products.get_product_main_image.return_value = None
+        assert client.get("/products/3/image").status_code == 404
+
+    def test_list_images_without_data(self, mock_products):
+        mock_products.list_product_images.return_value = [{"id": 1, "display_order": 0}]
+        response = client.get("/products/3/images?include_data=false")
+        assert response.json() == [{"id": 1, "display_order": 0}]
+        mock_products.get_product_images.assert_not_called()
+
+    def test_get_image_thumbnail_cached(self, mock_products):
+        original = self.make_png()
+        mock_products.get_product_image.return_value = {"id": 1, "image_data": original}
+
+        response = client.get("/images/1?size=100")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/jpeg"
+        assert len(response.content) < len(original)
+
+        # Second request is served from the disk cache without touching the DB
+        mock_products.get_product_image.reset_mock()
+        again = client.get("/images/1?size=100")
+        assert again.content == response.content
+        mock_products.get_product_image.assert_not_called()
+
+    def test_thumbnail_size_bounds(self, mock_products):
+        assert client.get("/images/1?size=5").status_code == 422
+
+    def test_upload_pregenerates_thumbnail(self, mock_products):
+        import base64
+        from server import routes
+        mock_products.add_product_image.return_value = 42
+        payload = {"product_id": 1, "image_data": base64.b64encode(self.make_png()).decode()}
+        assert client.post("/products/1/images", json=payload).status_code == 200
+        assert routes.thumbnails.get("image-42", routes.GALLERY_THUMBNAIL_SIZE) is not None
+
+    def test_product_update_invalidates_main_thumbnail(self, mock_products):
+        from server import routes
+        routes.thumbnails.put("product-3", 100, b"old")
+        client.put("/products/3", json={"image": None, "title": "x"})
+        assert routes.thumbnails.get("product-3", 100) is None
+
+    def test_product_delete_invalidates_gallery_thumbnails(self, mock_products):
+        from server import routes
+        mock_products.list_product_images.return_value = [{"id": 11}, {"id": 12}]
+        routes.thumbnails.put("product-3", 100, b"main")
+        routes.thumbnails.put("image-11", 100, b"a")
+        routes.thumbnails.put("image-12", 100, b"b")
+        routes.thumbnails.put("image-99", 100, b"other product")
+
+        assert client.delete("/products/3").status_code == 200
+
+        mock_products.list_product_images.assert_called_once_with(3)
+        assert routes.thumbnails.get("product-3", 100) is None
+        assert routes.thumbnails.get("image-11", 100) is None
+        assert routes.thumbnails.get("image-12", 100) is None
+        assert routes.thumbnails.get("image-99", 100) == b"other product"
+
+
+class TestListETags:
+
+    @pytest.fixture
+    def mock_ops(self):
+        with patch("server.routes.db_ops") as mock_trans, \
+             patch("server.routes.material_ops") as mock_mats, \
+             patch("server.routes.product_ops") as mock_prods, \
+             patch("server.routes.inventory_ops") as mock_inventory:
+            mock_mats.get_materials.return_value = [{"id": 1, "name": "Soy Wax"}]
+            mock_prods.get_products.return_value = [{"id": 1, "title": "Candle"}]
+            mock_inventory.post_transactions.return_value = {
+                "ids": [7], "products": [{"id": 1, "stock_quantity": 4}], "materials": []
+            }
+            yield mock_trans, mock_mats, mock_prods
+
+    def test_matching_etag_returns_304_without_querying(self, mock_ops):
+        t, m, p = mock_ops
+        first = client.get("/materials")
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "private, no-cache"
+
+        second = client.get("/materials", headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert m.get_materials.call_count == 1
+
+    def test_database_change_changes_the_etag(self, mock_ops, table_versions):
+        """A write by anyone, not only this server, invalidates cached lists"""
+        etag = client.get("/materials").headers["ETag"]
+
+        table_versions[MATERIALS_TABLE] = "2:2025-01-01 10:00:00.000001"
+        response = client.get("/materials", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_etag_only_depends_on_the_tables_read(self, mock_ops, table_versions):
+        products_etag = client.get("/products").headers["ETag"]
+        materials_etag = client.get("/materials").headers["ETag"]
+
+        table_versions[PRODUCTS_TABLE_NAME] = "1:2025-01-01 10:00:00.000001"
+
+        assert client.get("/products", headers={"If-None-Match": products_etag}).status_code == 200
+        assert client.get("/materials", headers={"If-None-Match": materials_etag}).status_code == 304
+
+    def test_projection_has_its_own_etag(self, mock_ops):
+        full = client.get("/products").headers["ETag"]
+        summary = client.get("/products?fields=summary", headers={"If-None-Match": full})
+        assert summary.status_code == 200
+        assert summary.headers["ETag"] != full
+
+    def test_transactions_etag_varies_with_filters(self, mock_ops):
+        t, m, p = mock_ops
+        t.read_transactions.return_value = []
+        t.read_transactions_page.return_value = ([], None)
+        etag = client.get("/transactions").headers["ETag"]
+
+        assert client.get("/transactions", headers={"If-None-Match": etag}).status_code == 304
+        assert client.get("/transactions?limit=5", headers={"If-None-Match": etag}).status_code == 200
+
+
+class TestChangesRoute:
+
+    def test_changes_passes_token_and_tables(self):
+        with patch("server.routes.change_ops") as ops:
+            ops.read_changes.return_value = {
+                "token": "t2", "full": False,
+                "products": {"upserts": [{"id": 1, "etsy_data": '{"listing": 5}'}], "deleted": [2]}
+            }
+            response = client.get("/changes?since=t1&tables=products")
+
+        assert response.status_code == 200
+        ops.read_changes.assert_called_once_with(since="t1", names=["products"])
+        # JSON columns are decoded like /products
+        assert response.json()["products"]["upserts"][0]["etsy_data"] == {"listing": 5}
+
+    def test_invalid_token_is_400(self):
+        with patch("server.routes.change_ops") as ops:
+            ops.read_changes.side_effect = ValueError("Invalid sync token: 'x'")
+            response = client.get("/changes?since=x")
+        assert response.status_code == 400
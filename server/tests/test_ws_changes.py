@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from server.main import app
+from server.routes import feed
+
+client = TestClient(app)
+
+
+def test_write_routes_push_events_to_subscribers():
+    with patch("server.routes.db_ops"), patch("server.routes.inventory_ops") as inventory:
+        inventory.post_transactions.return_value = {
+            "ids": [10, 11], "products": [{"id": 3, "stock_quantity": 7}], "materials": []
+        }
+        with client.websocket_connect("/ws/changes") as ws:
+            assert client.delete("/transactions/5").status_code == 200
+            assert ws.receive_json() == [{"table": "transactions", "id": 5, "op": "delete"}]
+
+            item = {"date": "2025-01-01", "description": "Sale", "quantity": 1,
+                    "price": 9.5, "type": "Income", "product_id": 3}
+            assert client.post("/transactions/bulk", json=[item, item]).status_code == 200
+            assert ws.receive_json() == [
+                {"table": "transactions", "id": 10, "op": "insert"},
+                {"table": "transactions", "id": 11, "op": "insert"},
+            ]
+            assert ws.receive_json() == [{"table": "products", "id": 3, "op": "update"}]
+
+
+def test_failed_write_pushes_nothing():
+    with patch("server.routes.material_ops") as materials, \
+         patch("server.routes.feed.publish") as publish:
+        materials.delete_material.side_effect = Exception("DB down")
+        assert client.delete("/materials/2").status_code == 500
+    publish.assert_not_called()
+
+
+def test_disconnect_unsubscribes():
+    with client.websocket_connect("/ws/changes"):
+        assert len(feed) == 1
+    assert len(feed) == 0
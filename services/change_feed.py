@@ -0,0 +1,79 @@
+"""
+Push side of the change feed: subscribers of /ws/changes.
+
+Write routes publish compact events {"table", "id", "op"} once their
+commit has succeeded; "table" uses the same names as GET /changes
+(transactions, products, materials). Routes are sync handlers running on
+the threadpool, so publish() hands each batch to every subscriber's event
+loop with call_soon_threadsafe.
+
+Events only say what changed; clients fetch the rows through GET /changes.
+A subscriber that falls MAX_PENDING batches behind has its backlog
+replaced by a single {"op": "resync"}, after which it should sync as if
+it had just reconnected.
+"""
+
+import asyncio
+import threading
+
+# Batches queued per subscriber before it is told to resync instead
+MAX_PENDING = 256
+RESYNC = [{"op": "resync"}]
+
+
+class Subscription:
+    """One connected client's queue of event batches."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(MAX_PENDING)
+
+    def _offer(self, events):
+        # Runs on self.loop
+        try:
+            self.queue.put_nowait(events)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self):
+        """Next batch of events (a list of dicts)."""
+        return await self.queue.get()
+
+
+class ChangeFeed:
+    """Thread-safe fan-out of change events to async subscribers."""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._subscriptions)
+
+    def subscribe(self) -> Subscription:
+        """Register a subscriber; call from the event loop that will read it."""
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, table, op, ids) -> None:
+        """Queue one event per id for every subscriber. Safe from any thread."""
+        events = [{"table": table, "id": row_id, "op": op} for row_id in ids]
+        if not events:
+            return
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._offer, events)
+            except RuntimeError:
+                # Its loop has shut down without unsubscribing
+                self.unsubscribe(subscription)
@@ -0,0 +1,24 @@
+"""
+List ETags derived from the database's own state.
+
+List endpoints read the version of each table they serve
+(db.changes.table_versions: row count plus newest updated_at) and hash it
+with their query, so If-None-Match can be answered with a 304 before the
+list itself is read. The versions come from MySQL rather than from this
+process, so writes that bypass the API (the GUI's Etsy import, a second
+server on the same database, ad-hoc scripts) invalidate cached lists too.
+"""
+
+import hashlib
+from typing import Dict
+
+
+def list_etag(versions: Dict[str, str], variant: str = "") -> str:
+    """
+    Strong ETag for a response built from the tables in `versions`
+    (table -> version); `variant` should encode the query (filters,
+    projection) so different views of the same table never share a tag.
+    """
+    state = ";".join(f"{t}={versions[t]}" for t in sorted(versions))
+    key = f"{state}|{variant}"
+    return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
@@ -2,9 +2,10 @@ import csv
 
 class DataService:
     @staticmethod
-    def export_to_csv(filename, transactions):
+    def export_to_csv(filename, transactions, progress_callback=None):
         """
         Export transactions list to a CSV file.
+        progress_callback(current, total, message) is called once per row.
         """
         if not transactions:
             return
@@ -17,17 +18,21 @@ class DataService:
             writer.writerow(keys)
             
             # Write Data
-            for t in transactions:
+            total = len(transactions)
+            for i, t in enumerate(transactions, start=1):
                 # Ensure we only write known keys in order
                 row = [t.get(k, "") for k in keys]
                 writer.writerow(row)
+                if progress_callback:
+                    progress_callback(i, total, f"Exporting {i} of {total}...")
 
 
 
     @staticmethod
-    def import_data(filename, existing_transactions):
+    def import_data(filename, existing_transactions, progress_callback=None):
         """
         Import data from CSV or Excel.
+        progress_callback(current, total, message) is called once per row.
         """
         import os
         ext = os.path.splitext(filename)[1].lower()
@@ -64,7 +69,10 @@ class DataService:
         # if existing_signatures:
         #    print(f"DEBUG Example: {list(existing_signatures)[0]}")
 
-        for row in raw_rows:
+        total = len(raw_rows)
+        for i, row in enumerate(raw_rows, start=1):
+            if progress_callback:
+                progress_callback(i, total, f"Checking row {i} of {total}...")
             try:
                 # Keys are guaranteed lowercase 
                 r_date = DataService._normalize_date(row.get('transaction_date', '') or row.get('date', ''))
@@ -10,11 +10,28 @@ import json
 import requests
 import os
 import sys
+import threading
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
 from io import BytesIO
 from typing import List, Dict, Optional, Callable
 from datetime import datetime
-from db.products import create_product, get_products, add_product_image, product_exists
+from urllib.parse import urlparse
+from db.products import (
+    create_product, get_products, add_product_image, get_existing_product_keys,
+    create_products_bulk, add_product_images_bulk, normalize_title
+)
+
+# Image prefetching defaults
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_HOST_LIMIT = 4
+# How many upcoming products may have downloads in flight; bounds memory use
+PREFETCH_LOOKAHEAD = 16
+# Products written per bulk insert, also flushed early once the buffered
+# image bytes pass IMPORT_BATCH_MAX_BYTES
+IMPORT_BATCH_SIZE = 50
+IMPORT_BATCH_MAX_BYTES = 32 * 1024 * 1024
 
 class EtsyImportLogger:
     """Handles logging for Etsy import process."""
@@ -146,16 +163,82 @@ def download_image_from_url(url: str, product_title: str, session: Optional[requ
         return None
 
 
+class ImagePrefetcher:
+    """
+    Downloads image URLs on a bounded thread pool.
+
+    Each host gets its own semaphore so a single CDN is never hit with more
+    than `per_host_limit` concurrent requests. Every worker thread keeps its
+    own requests.Session for connection reuse.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, per_host_limit: int = DEFAULT_PER_HOST_LIMIT):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="etsy-img")
+        self._per_host_limit = per_host_limit
+        self._host_slots = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sessions = []
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self._per_host_limit)
+            return self._host_slots[host]
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _fetch(self, url: str, product_title: str) -> Optional[bytes]:
+        with self._host_slot(url):
+            return download_image_from_url(url, product_title, self._session())
+
+    def submit(self, url: str, product_title: str) -> Future:
+        return self._executor.submit(self._fetch, url, product_title)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for session in self._sessions:
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 def import_etsy_products(
     csv_path: str,
-    progress_callback: Optional[Callable[[int, int, str], None]] = None
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    cancel_event: Optional[threading.Event] = None
 ) -> Dict[str, int]:
     """
     Import products from Etsy CSV file.
+
+    Images for the next PREFETCH_LOOKAHEAD products download in parallel
+    while earlier products are written, so network latency overlaps instead
+    of adding up. Products are still created in CSV order and images keep
+    their IMAGEn display_order. Rows are written in batches through
+    create_products_bulk / add_product_images_bulk; if a batch fails it is
+    retried row by row so one bad row only skips itself.
     
     Args:
         csv_path: Path to Etsy CSV file
         progress_callback: Optional callback(current, total, status_message)
+        max_workers: Size of the image download thread pool
+        per_host_limit: Max concurrent downloads against a single host
+        cancel_event: When set, stops before the next product; products
+            already accepted are still written
         
     Returns:
         Dictionary with import statistics
@@ -163,11 +246,11 @@ def import_etsy_products(
     stats = {
         'imported': 0,
         'skipped_duplicates': 0,
-        'skipped_errors': 0
+        'skipped_errors': 0,
+        'skipped_cancelled': 0
     }
     
     logger = EtsyImportLogger()
-    session = requests.Session()
     
     # Parse CSV
     try:
@@ -179,65 +262,163 @@ def import_etsy_products(
         return stats
     
     total = len(products)
-    
-    for idx, product_data in enumerate(products, 1):
-        title = product_data['title']
+
+    # Load existing keys once; duplicate checks are then in-memory set lookups.
+    # Rows accepted from this CSV are added too, so repeats within the file
+    # are caught before they reach the database.
+    try:
+        existing_titles, existing_skus = get_existing_product_keys()
+    except Exception as e:
+        msg = f"Error loading existing products: {e}"
+        print(msg)
+        logger.error(msg, exc_info=True)
+        return stats
+
+    def is_duplicate(product_data):
         sku = product_data.get('sku')
-        
-        # Update progress
-        if progress_callback:
-            progress_callback(idx, total, f"Processing: {title[:50]}...")
-        
-        # Check for duplicates using improved DB function
-        if product_exists(title, sku):
-            print(f"Skipping duplicate: {title}")
-            stats['skipped_duplicates'] += 1
-            continue
-        
-        try:
-            # Extract image URLs before creating product
-            image_urls = product_data.pop('_image_urls', [])
-            
-            # Download first image for main product image field
-            if image_urls:
-                first_image = download_image_from_url(image_urls[0], title, session)
-                if first_image:
-                    product_data['image'] = first_image
-            
-            # Create product in database
+        title_key = normalize_title(product_data['title'])
+        if (sku and sku in existing_skus) or title_key in existing_titles:
+            return True
+        existing_titles.add(title_key)
+        if sku:
+            existing_skus.add(sku)
+        return False
+
+    with ImagePrefetcher(max_workers, per_host_limit) as prefetcher:
+        # (index, product_data, [futures]) queued ahead of the writer
+        pending = deque()
+        next_idx = 0
+
+        def fill_window():
+            nonlocal next_idx
+            while next_idx < total and len(pending) < PREFETCH_LOOKAHEAD:
+                product_data = products[next_idx]
+                next_idx += 1
+                title = product_data['title']
+
+                # Check for duplicates before spending bandwidth on images
+                if is_duplicate(product_data):
+                    pending.append((next_idx, product_data, None))
+                    continue
+
+                image_urls = product_data.pop('_image_urls', [])
+                futures = [prefetcher.submit(url, title) for url in image_urls]
+                pending.append((next_idx, product_data, futures))
+
+        # (product_data, [(display_order, image bytes)]) awaiting a bulk write
+        batch = []
+        batch_bytes = 0
+
+        def write_batch_row_by_row():
+            """Fallback when a bulk insert fails: isolate the bad rows."""
+            for product_data, extra_images in batch:
+                title = product_data['title']
+                try:
+                    logger.log(f"Attempting to create product: {title}")
+                    product_id = create_product(product_data)
+                    logger.log(f"Successfully created product ID: {product_id}")
+                except Exception as db_error:
+                    logger.error(f"DATABASE ERROR for '{title}': {str(db_error)}", exc_info=True)
+                    print(f"Error importing '{title}': {db_error}")
+                    stats['skipped_errors'] += 1
+                    continue
+
+                for img_idx, image_data in extra_images:
+                    try:
+                        add_product_image(product_id, image_data, display_order=img_idx)
+                    except Exception as img_err:
+                        logger.error(f"ERROR adding image {img_idx}: {str(img_err)}")
+                stats['imported'] += 1
+                print(f"Imported: {title}")
+
+        def flush_batch():
+            nonlocal batch_bytes
+            batch_bytes = 0
+            if not batch:
+                return
             try:
-                logger.log(f"Attempting to create product: {title}")
-                product_id = create_product(product_data)
-                logger.log(f"Successfully created product ID: {product_id}")
+                logger.log(f"Bulk creating {len(batch)} products")
+                product_ids = create_products_bulk([product_data for product_data, _ in batch])
             except Exception as db_error:
-                logger.error(f"DATABASE ERROR for '{title}': {str(db_error)}", exc_info=True)
-                raise  # Re-raise to be caught by outer try-catch
-            
-            # Download and add remaining images
-            if len(image_urls) > 1:
-                logger.log(f"Processing {len(image_urls) - 1} additional images for product {product_id}")
-                for img_idx, image_url in enumerate(image_urls[1:], start=1):
-                    logger.log(f"Downloading image {img_idx}: {image_url[:80]}...")
-                    image_data = download_image_from_url(image_url, title, session)
-                    
+                logger.error(f"BULK DATABASE ERROR, retrying row by row: {str(db_error)}", exc_info=True)
+                write_batch_row_by_row()
+                batch.clear()
+                return
+
+            images = [
+                (product_id, image_data, img_idx)
+                for product_id, (_, extra_images) in zip(product_ids, batch)
+                for img_idx, image_data in extra_images
+            ]
+            try:
+                add_product_images_bulk(images)
+                logger.log(f"Added {len(images)} additional images")
+            except Exception as img_err:
+                logger.error(f"ERROR adding images in bulk: {str(img_err)}", exc_info=True)
+
+            for product_data, _ in batch:
+                stats['imported'] += 1
+                print(f"Imported: {product_data['title']}")
+            batch.clear()
+
+        def cancelled(next_idx):
+            if cancel_event is None or not cancel_event.is_set():
+                return False
+            stats['skipped_cancelled'] = total - next_idx + 1
+            logger.log(f"Import cancelled, {stats['skipped_cancelled']} products not processed")
+            return True
+
+        fill_window()
+        while pending:
+            if cancelled(pending[0][0]):
+                break
+            idx, product_data, futures = pending.popleft()
+            fill_window()
+            title = product_data['title']
+
+            # Update progress
+            if progress_callback:
+                try:
+                    progress_callback(idx, total, f"Processing: {title[:50]}...")
+                except Exception:
+                    # Callbacks may raise once cancelled (gui ProgressChannel);
+                    # stop like the check above so the batch still gets written
+                    if cancelled(idx):
+                        break
+                    raise
+
+            if futures is None:
+                print(f"Skipping duplicate: {title}")
+                stats['skipped_duplicates'] += 1
+                continue
+
+            try:
+                # First image becomes the main product image field
+                if futures:
+                    first_image = futures[0].result()
+                    if first_image:
+                        product_data['image'] = first_image
+
+                # Remaining images keep their IMAGEn position as display_order
+                extra_images = []
+                for img_idx, future in enumerate(futures[1:], start=1):
+                    image_data = future.result()
                     if image_data:
-                        try:
-                            add_product_image(product_id, image_data, display_order=img_idx)
-                            logger.log(f"Added image {img_idx} ({len(image_data)} bytes)")
-                        except Exception as img_err:
-                            logger.error(f"ERROR adding image {img_idx}: {str(img_err)}")
+                        extra_images.append((img_idx, image_data))
                     else:
                         logger.log(f"Failed to download image {img_idx}")
                         print(f"Skipped image {img_idx + 1} for '{title}'")
-            
-            stats['imported'] += 1
-            print(f"Imported: {title}")
-            
-        except Exception as e:
-            logger.error(f"IMPORT ERROR for '{title}': {str(e)}", exc_info=True)
-            print(f"Error importing '{title}': {e}")
-            stats['skipped_errors'] += 1
-            continue
-            
-    session.close()
+            except Exception as e:
+                logger.error(f"IMPORT ERROR for '{title}': {str(e)}", exc_info=True)
+                print(f"Error importing '{title}': {e}")
+                stats['skipped_errors'] += 1
+                continue
+
+            batch.append((product_data, extra_images))
+            batch_bytes += len(product_data.get('image') or b'') + sum(len(data) for _, data in extra_images)
+            if len(batch) >= IMPORT_BATCH_SIZE or batch_bytes >= IMPORT_BATCH_MAX_BYTES:
+                flush_batch()
+
+        flush_batch()
+
     return stats
@@ -0,0 +1,139 @@
+"""
+Image helpers shared by the image-serving routes.
+
+Sniffs content types from magic bytes, builds/validates strong ETags so
+clients can revalidate cached image bytes with If-None-Match, and keeps an
+on-disk cache of downscaled thumbnails.
+"""
+
+import glob
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+from typing import Callable, Optional
+
+# PIL is optional on the server; without it thumbnails fall back to originals
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+# (magic prefix, content type)
+_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+]
+
+
+def detect_content_type(data: bytes) -> str:
+    """Return the MIME type of an image blob, falling back to octet-stream."""
+    if not data:
+        return "application/octet-stream"
+    for magic, content_type in _SIGNATURES:
+        if data.startswith(magic):
+            return content_type
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+def compute_etag(data: bytes) -> str:
+    """Strong ETag derived from the content hash."""
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    True if an If-None-Match header value matches `etag`.
+    Handles lists ("a", "b"), the * wildcard and weak W/ prefixes.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def make_thumbnail(data: bytes, size: int) -> bytes:
+    """
+    Downscale an image so it fits in a size x size box.
+    Transparent images stay PNG, everything else becomes JPEG. Returns the
+    original bytes if PIL is missing or the data is not a readable image.
+    """
+    if not HAS_PIL or not data:
+        return data
+    try:
+        with Image.open(BytesIO(data)) as img:
+            img.thumbnail((size, size))
+            out = BytesIO()
+            if img.mode in ("RGBA", "LA", "P"):
+                img.save(out, format="PNG", optimize=True)
+            else:
+                img.convert("RGB").save(out, format="JPEG", quality=85, optimize=True)
+            return out.getvalue()
+    except Exception as e:
+        print(f"Thumbnail generation failed: {e}")
+        return data
+
+
+class ThumbnailCache:
+    """
+    Thumbnails stored on disk as <key>_<size>.bin.
+
+    Keys identify the source image (e.g. "image-12", "product-5"); callers
+    invalidate a key whenever its source bytes change.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str, size: int) -> str:
+        return os.path.join(self.directory, f"{key}_{size}.bin")
+
+    def get(self, key: str, size: int) -> Optional[bytes]:
+        try:
+            with open(self._path(key, size), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, size: int, data: bytes):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write-then-rename so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key, size))
+        except OSError as e:
+            print(f"Could not write thumbnail {key}@{size}: {e}")
+
+    def invalidate(self, key: str):
+        for path in glob.glob(os.path.join(glob.escape(self.directory), f"{glob.escape(key)}_*.bin")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get_or_create(self, key: str, size: int, load_original: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        """Return the cached thumbnail, generating it from load_original() on a miss."""
+        cached = self.get(key, size)
+        if cached is not None:
+            return cached
+        original = load_original()
+        if not original:
+            return None
+        thumb = make_thumbnail(original, size)
+        self.put(key, size, thumb)
+        return thumb
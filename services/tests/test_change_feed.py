@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+from services.change_feed import ChangeFeed, MAX_PENDING, RESYNC
+
+
+def test_publish_from_another_thread_reaches_subscriber():
+    feed = ChangeFeed()
+
+    async def scenario():
+        subscription = feed.subscribe()
+        writer = threading.Thread(target=feed.publish, args=("transactions", "delete", [4, 5]))
+        writer.start()
+        writer.join()
+        return await asyncio.wait_for(subscription.get(), 1)
+
+    assert asyncio.run(scenario()) == [
+        {"table": "transactions", "id": 4, "op": "delete"},
+        {"table": "transactions", "id": 5, "op": "delete"},
+    ]
+
+
+def test_slow_subscriber_gets_resync_instead_of_backlog():
+    feed = ChangeFeed()
+
+    async def scenario():
+        subscription = feed.subscribe()
+        for i in range(MAX_PENDING + 1):
+            feed.publish("products", "update", [i])
+        await asyncio.sleep(0)  # let the queued callbacks run
+        return await subscription.get(), subscription.queue.qsize()
+
+    first, left = asyncio.run(scenario())
+    assert first == RESYNC
+    assert left == 0
+
+
+def test_unsubscribe_and_empty_publish():
+    feed = ChangeFeed()
+
+    async def scenario():
+        subscription = feed.subscribe()
+        assert len(feed) == 1
+        feed.publish("materials", "insert", [])
+        feed.unsubscribe(subscription)
+        feed.publish("materials", "insert", [1])
+        await asyncio.sleep(0)
+        return subscription.queue.qsize()
+
+    assert asyncio.run(scenario()) == 0
+    assert len(feed) == 0
+
+
+def test_subscriber_on_closed_loop_is_dropped():
+    feed = ChangeFeed()
+
+    async def subscribe():
+        return feed.subscribe()
+
+    asyncio.run(subscribe())  # loop closes with the subscription still registered
+    feed.publish("transactions", "update", [1])
+    assert len(feed) == 0
@@ -0,0 +1,20 @@
+from services.change_tracker import list_etag
+
+
+def test_etag_changes_only_with_the_table_versions():
+    etag = list_etag({"products": "3:2025-01-01 10:00:00.000001"})
+    assert list_etag({"products": "3:2025-01-01 10:00:00.000001"}) == etag
+
+    # An update moves updated_at, a delete moves the count
+    assert list_etag({"products": "3:2025-01-01 10:00:00.000002"}) != etag
+    assert list_etag({"products": "2:2025-01-01 10:00:00.000001"}) != etag
+
+
+def test_variant_is_part_of_the_tag():
+    versions = {"products": "1:2025-01-01 10:00:00"}
+    assert list_etag(versions, "summary") != list_etag(versions)
+
+
+def test_etag_is_a_quoted_strong_tag():
+    etag = list_etag({"transactions": "0:"})
+    assert etag.startswith('"') and etag.endswith('"')
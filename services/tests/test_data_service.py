@@ -78,3 +78,19 @@ def test_import_data_excel(tmp_path):
     assert len(items) == 1
     assert items[0]['description'] == "Excel Item"
     assert items[0]['quantity'] == 3
+
+def test_export_and_import_report_progress(tmp_path):
+    transactions = [
+        {"id": i, "transaction_date": "2025-01-0%d" % i, "description": "Item %d" % i, "quantity": 1, "price": 2.0, "total": 2.0, "transaction_type": "income", "supplier": ""}
+        for i in range(1, 4)
+    ]
+    output_file = str(tmp_path / "progress.csv")
+
+    exported = []
+    DataService.export_to_csv(output_file, transactions, progress_callback=lambda c, t, m: exported.append((c, t)))
+    assert exported == [(1, 3), (2, 3), (3, 3)]
+
+    imported = []
+    items = DataService.import_data(output_file, [], progress_callback=lambda c, t, m: imported.append((c, t)))
+    assert len(items) == 3
+    assert imported == [(1, 3), (2, 3), (3, 3)]
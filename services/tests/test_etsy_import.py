@@ -113,20 +113,20 @@ def test_download_image_no_session(mock_get):
     mock_get.assert_called_once_with('https://example.com/image.jpg', timeout=10)
 
 
-@patch('services.etsy_import.create_product')
-@patch('services.etsy_import.add_product_image')
+@patch('services.etsy_import.create_products_bulk')
+@patch('services.etsy_import.add_product_images_bulk')
 @patch('services.etsy_import.download_image_from_url')
-@patch('services.etsy_import.product_exists')
+@patch('services.etsy_import.get_existing_product_keys')
 def test_import_etsy_products_success(
-    mock_product_exists,
+    mock_existing_keys,
     mock_download,
-    mock_add_image,
+    mock_add_images,
     mock_create,
     sample_csv_file
 ):
     """Test successful product import."""
-    mock_product_exists.return_value = False  # No duplicates
-    mock_create.return_value = 123  # Product ID
+    mock_existing_keys.return_value = (set(), set())  # No duplicates
+    mock_create.return_value = [123]  # Product IDs
     mock_download.return_value = b'fake_image'
     
     stats = import_etsy_products(sample_csv_file)
@@ -135,18 +135,19 @@ def test_import_etsy_products_success(
     assert stats['skipped_duplicates'] == 0
     assert stats['skipped_errors'] == 0
     
-    # Verify create_product was called
+    # Verify products were written in one batch
     mock_create.assert_called_once()
+    mock_add_images.assert_called_once_with([(123, b'fake_image', 1)])
     
     # Verify images were downloaded (2 images)
     # Called once for main image, once for additional
     assert mock_download.call_count == 2
 
 
-@patch('services.etsy_import.product_exists')
-def test_import_etsy_products_skip_duplicates(mock_product_exists, sample_csv_file):
+@patch('services.etsy_import.get_existing_product_keys')
+def test_import_etsy_products_skip_duplicates(mock_existing_keys, sample_csv_file):
     """Test that duplicates are skipped."""
-    mock_product_exists.return_value = True  # All are duplicates
+    mock_existing_keys.return_value = ({'test rose candle'}, set())  # Title already exists
     
     stats = import_etsy_products(sample_csv_file)
     
@@ -156,11 +157,13 @@ def test_import_etsy_products_skip_duplicates(mock_product_exists, sample_csv_fi
 
 
 @patch('services.etsy_import.create_product')
-@patch('services.etsy_import.product_exists')
+@patch('services.etsy_import.create_products_bulk')
+@patch('services.etsy_import.get_existing_product_keys')
 @patch('services.etsy_import.EtsyImportLogger')
-def test_import_etsy_products_error_handling(mock_logger_cls, mock_product_exists, mock_create, sample_csv_file):
+def test_import_etsy_products_error_handling(mock_logger_cls, mock_existing_keys, mock_bulk, mock_create, sample_csv_file):
     """Test error handling during import."""
-    mock_product_exists.return_value = False
+    mock_existing_keys.return_value = (set(), set())
+    mock_bulk.side_effect = Exception("Database error")
     mock_create.side_effect = Exception("Database error")
     
     stats = import_etsy_products(sample_csv_file)
@@ -188,3 +191,224 @@ def test_logger_path_resolution():
         with patch('sys.executable', r'C:\dist\main.exe'):
             logger = EtsyImportLogger()
             assert logger.log_file == r'C:\dist\etsy_import_errors.log'
+
+
+def write_etsy_csv(csv_path, rows):
+    """Write a minimal Etsy CSV with (title, sku, [image urls]) rows."""
+    header = ['TITLE', 'PRICE', 'QUANTITY', 'SKU'] + [f'IMAGE{i}' for i in range(1, 11)]
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for title, sku, urls in rows:
+            writer.writerow([title, '10', '1', sku] + urls + [''] * (10 - len(urls)))
+    return str(csv_path)
+
+
+@patch('services.etsy_import.create_products_bulk')
+@patch('services.etsy_import.add_product_images_bulk')
+@patch('services.etsy_import.download_image_from_url')
+@patch('services.etsy_import.get_existing_product_keys')
+def test_import_keeps_image_order_when_downloads_finish_out_of_order(
+    mock_existing_keys, mock_download, mock_add_images, mock_create, tmp_path
+):
+    """display_order follows IMAGEn even if later images download first."""
+    import time
+    mock_existing_keys.return_value = (set(), set())
+    mock_create.return_value = [1, 2]
+
+    def slow_first(url, title, session=None):
+        # Earlier images are slower so completion order is reversed
+        time.sleep(0.05 if url.endswith('a.jpg') else 0)
+        return url.encode()
+
+    mock_download.side_effect = slow_first
+    urls = ['https://cdn.test/a.jpg', 'https://cdn.test/b.jpg', 'https://cdn.test/c.jpg']
+    csv_path = write_etsy_csv(tmp_path / 'order.csv', [
+        ('Candle One', 'C1', urls),
+        ('Candle Two', 'C2', urls[:2]),
+    ])
+
+    progress = []
+    stats = import_etsy_products(csv_path, lambda c, t, m: progress.append((c, t)), max_workers=4)
+
+    assert stats['imported'] == 2
+    # Products are still created in CSV order with the first image as main
+    created = mock_create.call_args.args[0]
+    assert [p['title'] for p in created] == ['Candle One', 'Candle Two']
+    assert created[0]['image'] == b'https://cdn.test/a.jpg'
+    assert mock_add_images.call_args.args[0] == [
+        (1, b'https://cdn.test/b.jpg', 1),
+        (1, b'https://cdn.test/c.jpg', 2),
+        (2, b'https://cdn.test/b.jpg', 1),
+    ]
+    assert progress == [(1, 2), (2, 2)]
+
+
+@patch('services.etsy_import.create_products_bulk')
+@patch('services.etsy_import.add_product_images_bulk')
+@patch('services.etsy_import.get_existing_product_keys')
+def test_import_downloads_concurrently_with_per_host_limit(
+    mock_existing_keys, mock_add_images, mock_create, tmp_path
+):
+    """Images download in parallel against a slow local server, capped per host."""
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    delay = 0.2
+    state = {'active': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    class SlowImageHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(delay)
+            with lock:
+                state['active'] -= 1
+            body = b'\xff\xd8\xff' + b'0' * 64
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowImageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+
+    mock_existing_keys.return_value = (set(), set())
+    mock_create.side_effect = lambda products: list(range(1, len(products) + 1))
+    rows = [(f'Candle {i}', f'C{i}', [f'{base}/{i}/{n}.jpg' for n in range(4)]) for i in range(4)]
+    csv_path = write_etsy_csv(tmp_path / 'slow.csv', rows)
+
+    try:
+        start = time.monotonic()
+        stats = import_etsy_products(csv_path, max_workers=8, per_host_limit=4)
+        elapsed = time.monotonic() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert stats['imported'] == 4
+    assert len(mock_add_images.call_args.args[0]) == 12
+    assert state['peak'] <= 4
+    # 16 images sequentially would take 16 * delay; with 4 slots it is ~4 * delay
+    assert elapsed < 16 * delay / 2
+
+
+@patch('services.etsy_import.create_product')
+@patch('services.etsy_import.add_product_image')
+@patch('services.etsy_import.create_products_bulk')
+@patch('services.etsy_import.download_image_from_url')
+@patch('services.etsy_import.get_existing_product_keys')
+@patch('services.etsy_import.EtsyImportLogger')
+def test_import_falls_back_to_row_by_row_when_batch_fails(
+    mock_logger_cls, mock_existing_keys, mock_download, mock_bulk, mock_add_image, mock_create, tmp_path
+):
+    """A bad row only skips itself; the rest of its batch is still imported."""
+    mock_existing_keys.return_value = (set(), set())
+    mock_download.return_value = b'img'
+    mock_bulk.side_effect = Exception("Duplicate entry")
+    mock_create.side_effect = [1, Exception("Duplicate entry"), 3]
+    csv_path = write_etsy_csv(tmp_path / 'fallback.csv', [
+        ('A', 'A1', ['https://cdn.test/a1.jpg', 'https://cdn.test/a2.jpg']),
+        ('B', 'B1', []),
+        ('C', 'C1', []),
+    ])
+
+    stats = import_etsy_products(csv_path)
+
+    assert stats['imported'] == 2
+    assert stats['skipped_errors'] == 1
+    mock_add_image.assert_called_once_with(1, b'img', display_order=1)
+
+
+@patch('services.etsy_import.create_products_bulk')
+@patch('services.etsy_import.add_product_images_bulk')
+@patch('services.etsy_import.get_existing_product_keys')
+def test_import_duplicate_detection_is_set_based(mock_existing_keys, mock_add_images, mock_create, tmp_path):
+    """Keys load once; SKU, case/whitespace title and in-file repeats are skipped."""
+    mock_existing_keys.return_value = ({'rose candle'}, {'SKU-1'})
+    mock_create.side_effect = lambda products: list(range(1, len(products) + 1))
+    csv_path = write_etsy_csv(tmp_path / 'dupes.csv', [
+        ('  ROSE Candle ', 'NEW-1', []),   # title match
+        ('Other', 'SKU-1', []),            # sku match
+        ('Fresh Linen', 'FL-1', []),       # new
+        ('fresh linen', 'FL-2', []),       # repeat within the file
+        ('Cedar', '', []),                 # new, no sku
+    ])
+
+    stats = import_etsy_products(csv_path)
+
+    assert stats['imported'] == 2
+    assert stats['skipped_duplicates'] == 3
+    mock_existing_keys.assert_called_once()
+    assert [p['title'] for p in mock_create.call_args.args[0]] == ['Fresh Linen', 'Cedar']
+
+
+@patch('services.etsy_import.create_products_bulk')
+@patch('services.etsy_import.add_product_images_bulk')
+@patch('services.etsy_import.get_existing_product_keys')
+def test_import_stops_when_cancelled(mock_existing_keys, mock_add_images, mock_create, tmp_path):
+    """Setting cancel_event stops before the next product; accepted rows are still written."""
+    import threading
+    mock_existing_keys.return_value = (set(), set())
+    mock_create.side_effect = lambda products: list(range(1, len(products) + 1))
+    csv_path = write_etsy_csv(tmp_path / 'cancel.csv', [
+        (f'Candle {i}', f'C{i}', []) for i in range(1, 6)
+    ])
+    cancel = threading.Event()
+
+    def progress(current, total, message):
+        if current == 2:
+            cancel.set()
+
+    stats = import_etsy_products(csv_path, progress, cancel_event=cancel)
+
+    assert stats['imported'] == 2
+    assert stats['skipped_cancelled'] == 3
+    assert [p['title'] for p in mock_create.call_args.args[0]] == ['Candle 1', 'Candle 2']
+
+
+@patch('services.etsy_import.create_products_bulk')
+@patch('services.etsy_import.add_product_images_bulk')
+@patch('services.etsy_import.get_existing_product_keys')
+def test_cancel_raised_by_progress_callback_keeps_the_batch(mock_existing_keys, mock_add_images, mock_create, tmp_path):
+    """ProgressChannel raises JobCancelled after cancel; accepted rows are still written."""
+    from gui.progress import ProgressChannel
+    mock_existing_keys.return_value = (set(), set())
+    mock_create.side_effect = lambda products: list(range(1, len(products) + 1))
+    csv_path = write_etsy_csv(tmp_path / 'cancel_raise.csv', [
+        (f'Candle {i}', f'C{i}', []) for i in range(1, 6)
+    ])
+    channel = ProgressChannel(min_interval=0)
+
+    def progress(current, total, message):
+        if current == 3:
+            # Cancel lands after the loop-top check for this product
+            channel.cancel()
+        channel(current, total, message)
+
+    stats = import_etsy_products(csv_path, progress, cancel_event=channel.cancel_event)
+
+    assert stats['imported'] == 2
+    assert stats['skipped_cancelled'] == 3
+    assert [p['title'] for p in mock_create.call_args.args[0]] == ['Candle 1', 'Candle 2']
+
+
+@patch('services.etsy_import.create_products_bulk')
+@patch('services.etsy_import.get_existing_product_keys')
+def test_progress_callback_errors_still_propagate(mock_existing_keys, mock_create, tmp_path):
+    mock_existing_keys.return_value = (set(), set())
+    csv_path = write_etsy_csv(tmp_path / 'broken.csv', [('Candle', 'C1', [])])
+
+    def progress(current, total, message):
+        raise RuntimeError("widget gone")
+
+    with pytest.raises(RuntimeError):
+        import_etsy_products(csv_path, progress, cancel_event=None)
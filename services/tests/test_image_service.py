@@ -0,0 +1,75 @@
+from services.image_service import detect_content_type, compute_etag, etag_matches
+
+
+def test_detect_content_type():
+    assert detect_content_type(b"\x89PNG\r\n\x1a\nrest") == "image/png"
+    assert detect_content_type(b"\xff\xd8\xff\xe1rest") == "image/jpeg"
+    assert detect_content_type(b"GIF89a...") == "image/gif"
+    assert detect_content_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert detect_content_type(b"plain") == "application/octet-stream"
+    assert detect_content_type(b"") == "application/octet-stream"
+
+
+def test_compute_etag_is_stable_and_quoted():
+    etag = compute_etag(b"data")
+    assert etag == compute_etag(b"data")
+    assert etag != compute_etag(b"other")
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_etag_matches():
+    etag = compute_etag(b"data")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"nope", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"nope"', etag)
+    assert not etag_matches(None, etag)
+
+
+def _png(size=(300, 200), mode="RGB"):
+    from io import BytesIO
+    from PIL import Image
+    buf = BytesIO()
+    Image.new(mode, size).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_make_thumbnail_downscales():
+    from io import BytesIO
+    from PIL import Image
+    from services.image_service import make_thumbnail
+    thumb = make_thumbnail(_png(), 100)
+    with Image.open(BytesIO(thumb)) as img:
+        assert max(img.size) == 100
+        assert img.format == "JPEG"
+    with Image.open(BytesIO(make_thumbnail(_png(mode="RGBA"), 50))) as img:
+        assert img.format == "PNG"
+
+
+def test_make_thumbnail_passthrough_for_non_images():
+    from services.image_service import make_thumbnail
+    assert make_thumbnail(b"not an image", 100) == b"not an image"
+
+
+def test_thumbnail_cache_roundtrip(tmp_path):
+    from services.image_service import ThumbnailCache
+    cache = ThumbnailCache(str(tmp_path / "thumbs"))
+    loads = []
+
+    def load():
+        loads.append(1)
+        return _png()
+
+    first = cache.get_or_create("image-1", 64, load)
+    second = cache.get_or_create("image-1", 64, load)
+    assert first == second
+    assert len(loads) == 1
+
+    cache.put("image-1", 128, b"x")
+    cache.put("image-10", 64, b"y")
+    cache.invalidate("image-1")
+    assert cache.get("image-1", 64) is None
+    assert cache.get("image-1", 128) is None
+    assert cache.get("image-10", 64) == b"y"
+    assert cache.get_or_create("image-2", 64, lambda: None) is None
@@ -33,6 +33,25 @@ class TestServicesExtended:
         summary = TransactionUtils.calculate_summary(transactions)
         assert summary["avg_price_per_unit"] == 0 # Avoid ZeroDivisionError
 
+    def test_summary_from_aggregates(self):
+        """Aggregated rows produce the calculate_summary shape"""
+        rows = [
+            {"transaction_type": "income", "total": 100, "units": 10},
+            {"transaction_type": "expense", "total": 40, "units": 2},
+            {"transaction_type": "refund", "total": 10, "units": 1},
+        ]
+        transactions = [
+            {"transaction_type": "income", "total": 100, "quantity": 10},
+            {"transaction_type": "expense", "total": 40, "quantity": 2},
+            {"transaction_type": "refund", "total": 10, "quantity": 1},
+        ]
+        assert TransactionUtils.summary_from_aggregates(rows) == TransactionUtils.calculate_summary(transactions)
+
+    def test_summary_from_aggregates_empty(self):
+        summary = TransactionUtils.summary_from_aggregates([])
+        assert summary["balance"] == 0
+        assert summary["avg_price_per_unit"] == 0
+
     def test_normalize_text(self):
         """4. Test text normalization"""
         raw = "  Hello   \t\n World  "
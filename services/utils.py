@@ -47,6 +47,40 @@ class TransactionUtils:
             "avg_price_per_unit": avg_price_per_unit
         }
 
+    @staticmethod
+    def summary_from_aggregates(rows):
+        """
+        Build the calculate_summary() result from per-type SQL aggregates.
+
+        Args:
+            rows (list[dict]): Rows with transaction_type, total and units,
+                as returned by db.transactions.summarize_transactions.
+
+        Returns:
+            dict: Same keys as calculate_summary.
+        """
+        total_income = 0
+        total_expense = 0
+        total_sold_units = 0
+
+        for row in rows:
+            if row['transaction_type'] == 'income':
+                total_income += float(row['total'])
+                total_sold_units += int(row['units'])
+            else:
+                total_expense += float(row['total'])
+
+        balance = total_income - total_expense
+        avg_price_per_unit = total_income / total_sold_units if total_sold_units > 0 else 0
+
+        return {
+            "total_income": total_income,
+            "total_expense": total_expense,
+            "balance": balance,
+            "total_sold_units": total_sold_units,
+            "avg_price_per_unit": avg_price_per_unit
+        }
+
     @staticmethod
     def filter_by_month(transactions, year, month):
         """Return only transactions from a specific month"""
@@ -0,0 +1,110 @@
+"""
+Import-time breakdown for `main.py --profile-startup`.
+
+Works like `python -X importtime`, but also inside the frozen executable,
+where interpreter flags can't be passed: a meta path finder wraps each
+module's loader and times its execution.
+"""
+
+import sys
+import time
+
+# Rows shown in each section of the report
+TOP_N = 15
+
+
+class _TimedLoader:
+    """Delegates to the real loader, timing exec_module."""
+
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        self._profiler._enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class ImportProfiler:
+    """
+    Records cumulative and self time per imported module.
+
+    Install it before the imports to measure; report() prints the slowest
+    modules and the total per top-level package.
+    """
+
+    def __init__(self):
+        self.records = {}  # name -> (cumulative_s, self_s)
+        self._stack = []   # [name, start, time spent in nested imports]
+        self._started = None
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        self._started = time.perf_counter()
+        return self
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, fullname, self)
+            return spec
+        return None
+
+    def _enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name):
+        _, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self.records[name] = (elapsed, elapsed - nested)
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def by_package(self):
+        """{top-level package: total self time}, slowest first."""
+        totals = {}
+        for name, (_, self_s) in self.records.items():
+            package = name.split(".", 1)[0]
+            totals[package] = totals.get(package, 0.0) + self_s
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def report(self, label="startup", top=TOP_N, out=None):
+        out = out or sys.stdout
+        if out is None:
+            # PyInstaller noconsole builds have no stdout
+            return
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        importing = sum(self_s for _, self_s in self.records.values())
+
+        print(f"--- Startup profile ({label}) ---", file=out)
+        print(f"{elapsed:.3f}s since launch, {importing:.3f}s importing {len(self.records)} modules", file=out)
+
+        print(f"{'cumulative ms':>14} {'self ms':>9}  module", file=out)
+        slowest = sorted(self.records.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        for name, (cumulative, self_s) in slowest:
+            print(f"{cumulative * 1000:14.1f} {self_s * 1000:9.1f}  {name}", file=out)
+
+        print(f"{'total ms':>14}  package", file=out)
+        for package, total in list(self.by_package().items())[:top]:
+            print(f"{total * 1000:14.1f}  {package}", file=out)
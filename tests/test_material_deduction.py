@@ -77,3 +77,55 @@ def test_material_deduction_on_sale():
     # Test strict name matching (Fail case)
     res_fail, msg = materials.deduct_stock_by_name("NonExistent", 10.0, table=MATERIALS_TABLE)
     assert res_fail is False
+
+def test_post_transactions_deducts_product_and_materials_atomically():
+    from db import inventory
+    wax_id = materials.add_material("Coconut Wax", "Wax", 1000.0, 0.05, "g", table=MATERIALS_TABLE)
+    wick_id = materials.add_material("Cotton Wick", "Wick", 20.0, 0.10, "unit", table=MATERIALS_TABLE)
+    p_id = products.create_product({
+        "title": "Posting Candle",
+        "wax_type": "Coconut Wax",
+        "wax_weight_g": 150.0,
+        "wick_type": "Cotton Wick",
+        "stock_quantity": 10
+    }, table=PRODUCTS_TABLE_NAME)
+
+    result = inventory.post_transactions([
+        {"transaction_date": "2025-02-01", "description": "Sale", "quantity": 2,
+         "price": 25.0, "transaction_type": "income", "product_id": p_id},
+        {"transaction_date": "2025-02-01", "description": "Sale", "quantity": 1,
+         "price": 25.0, "transaction_type": "income", "product_id": p_id},
+    ], table=TABLE_NAME, products_table=PRODUCTS_TABLE_NAME, materials_table=MATERIALS_TABLE)
+
+    assert len(result["ids"]) == 2
+    assert result["products"] == [{"id": p_id, "stock_quantity": 7}]
+    levels = {m["id"]: float(m["stock_quantity"]) for m in result["materials"]}
+    assert levels == {wax_id: 550.0, wick_id: 17.0}
+
+    # Returned levels match what was committed
+    stored = {m["id"]: float(m["stock_quantity"]) for m in materials.get_materials(table=MATERIALS_TABLE)}
+    assert stored[wax_id] == 550.0
+    assert products.get_product(p_id, table=PRODUCTS_TABLE_NAME)["stock_quantity"] == 7
+
+
+def test_post_transactions_deducts_only_first_material_with_name():
+    from db import inventory
+    first_id = materials.add_material("Beeswax", "Wax", 500.0, 0.08, "g", table=MATERIALS_TABLE)
+    second_id = materials.add_material("Beeswax", "Wax", 500.0, 0.08, "g", table=MATERIALS_TABLE)
+    p_id = products.create_product({
+        "title": "Beeswax Candle",
+        "wax_type": "Beeswax",
+        "wax_weight_g": 100.0,
+        "stock_quantity": 5
+    }, table=PRODUCTS_TABLE_NAME)
+
+    result = inventory.post_transactions([
+        {"transaction_date": "2025-02-02", "description": "Sale", "quantity": 2,
+         "price": 30.0, "transaction_type": "income", "product_id": p_id},
+    ], table=TABLE_NAME, products_table=PRODUCTS_TABLE_NAME, materials_table=MATERIALS_TABLE)
+
+    # Same rule as deduct_stock_by_name: a shared name deducts one row only
+    assert [(m["id"], float(m["stock_quantity"])) for m in result["materials"]] == [(first_id, 300.0)]
+    stored = {m["id"]: float(m["stock_quantity"]) for m in materials.get_materials(table=MATERIALS_TABLE)}
+    assert stored[first_id] == 300.0
+    assert stored[second_id] == 500.0
@@ -11,7 +11,8 @@ client = TestClient(app)
 
 def test_get_materials():
     mock_data = [{'id': 1, 'name': 'Wax 464', 'category': 'wax', 'unit_cost': 0.01, 'unit_type': 'g'}]
-    with patch('db.materials.get_materials', return_value=mock_data) as mock_get:
+    with patch('db.materials.get_materials', return_value=mock_data) as mock_get, \
+         patch('db.changes.table_versions', return_value={MATERIALS_TABLE: "1:"}):
         response = client.get("/materials")
         assert response.status_code == 200
         assert response.json() == mock_data
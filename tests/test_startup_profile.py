@@ -0,0 +1,53 @@
+import io
+import sys
+import textwrap
+
+import pytest
+
+from startup_profile import ImportProfiler
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    pkg = tmp_path / "profiled_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from profiled_pkg import child\n")
+    (pkg / "child.py").write_text(textwrap.dedent("""
+        import time
+        time.sleep(0.02)
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "profiled_pkg"
+    for name in ("profiled_pkg", "profiled_pkg.child"):
+        sys.modules.pop(name, None)
+
+
+def test_records_cumulative_and_self_time(package):
+    profiler = ImportProfiler().install()
+    try:
+        __import__(package)
+    finally:
+        profiler.uninstall()
+
+    parent_cumulative, parent_self = profiler.records["profiled_pkg"]
+    child_cumulative, child_self = profiler.records["profiled_pkg.child"]
+    assert child_cumulative >= 0.02
+    assert parent_cumulative >= child_cumulative
+    # The child's sleep is not counted as the parent's own time
+    assert parent_self < child_self
+    assert profiler.by_package()["profiled_pkg"] >= 0.02
+    assert profiler not in sys.meta_path
+
+
+def test_report_lists_slowest_modules(package):
+    profiler = ImportProfiler().install()
+    try:
+        __import__(package)
+    finally:
+        profiler.uninstall()
+
+    out = io.StringIO()
+    profiler.report("test", out=out)
+    text = out.getvalue()
+    assert "Startup profile (test)" in text
+    assert "profiled_pkg.child" in text